@@ -0,0 +1,79 @@
+import streamlit as st
+
+from core.predictor import FEATURE_ORDER
+
+def _score_upload(model, scaler, uploaded):
+    """
+    Parses and scores the uploaded CSV. Returns `(scored, csv_bytes, None)`,
+    or `(None, None, (icon, message))` when the file cannot be scored.
+    """
+    # Pandas is only needed once a file arrives
+    import pandas as pd
+    from utils.batch_score import score_catalog
+
+    try:
+        df = pd.read_csv(uploaded)
+    except Exception as e:
+        return None, None, ("❌", f"Could not read the CSV file: {e}")
+
+    if df.empty:
+        return None, None, ("⚠️", "The uploaded file has no rows.")
+
+    try:
+        with st.spinner(f"Scoring {len(df):,} phones..."):
+            scored = score_catalog(model, scaler, df)
+    except ValueError as e:
+        return None, None, ("❌", str(e))
+    except RuntimeError as e:
+        return None, None, ("🚨", str(e))
+    return scored, scored.to_csv(index=False).encode("utf-8"), None
+
+def batch_scoring_app(model, scaler, version=None):
+    """
+    Renders the batch scoring tab: upload a CSV of phone specifications and
+    download the same file with a predicted price range for every row.
+
+    Behavior
+    --------
+    - Accepts a CSV with the 20 specification columns of `Clean_Mobile_Data.csv`.
+    - Scores the whole file in one vectorized pass via `predict_price_ranges()`.
+    - Keeps the result in `st.session_state`, keyed on the upload and the
+      model `version`, so reruns triggered by other widgets do not score the
+      file again.
+    - Shows a preview and the class distribution, and offers the scored CSV for download.
+
+    """
+    st.markdown("Upload a CSV shaped like `Clean_Mobile_Data.csv` to score a whole catalog at once.")
+    with st.expander("📋 Required columns"):
+        st.code(", ".join(FEATURE_ORDER))
+
+    uploaded = st.file_uploader("📂 Upload specifications CSV", type=["csv"])
+    if uploaded is None:
+        st.session_state.pop("batch_key", None)
+        st.session_state.pop("batch_result", None)
+        st.info("Waiting for a CSV file.")
+        return
+
+    key = (uploaded.file_id, uploaded.size, version)
+    if st.session_state.get("batch_key") != key:
+        st.session_state["batch_result"] = _score_upload(model, scaler, uploaded)
+        st.session_state["batch_key"] = key
+
+    scored, csv_bytes, error = st.session_state["batch_result"]
+    if error is not None:
+        icon, message = error
+        (st.warning if icon == "⚠️" else st.error)(f"{icon} {message}")
+        return
+
+    st.success(f"✅ Scored {len(scored):,} phones.")
+    st.dataframe(scored.head(100), use_container_width=True)
+
+    st.markdown("#### 📊 Predicted Class Distribution")
+    st.bar_chart(scored["predicted_class"].value_counts())
+
+    st.download_button(
+        "💾 Download Scored CSV",
+        data=csv_bytes,
+        file_name=f"scored_{uploaded.name}",
+        mime="text/csv"
+    )
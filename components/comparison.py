@@ -1,53 +1,27 @@
-import os
-import json
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import altair as alt
-import shutil
 
-from utils.save import generate_pdf_for_session, generate_combined_pdf
-from utils.specs_formatter import format_spec_display
+from core import reports
+from core import sessions as session_store
+from core.specs import format_spec_display
+from components.vis import reusable_figure
 
-PREDICTION_FOLDER = "Predictions"
+def load_session_index():
+    """Load the shared, read-only sessions list and its id -> session dict."""
+    errors = []
+    sessions, by_id = session_store.load_session_index(errors=errors)
+    for session_id, e in errors:
+        st.warning(f"⚠️ Error loading session '{session_id}': {e}")
+    return sessions, by_id
 
 def load_prediction_sessions():
     """Load all valid prediction sessions from disk."""
-    if not os.path.exists(PREDICTION_FOLDER):
-        return []
-
-    sessions = []
-    for folder in sorted(os.listdir(PREDICTION_FOLDER), reverse=True):
-        try:
-            folder_path = os.path.join(PREDICTION_FOLDER, folder)
-            input_file = os.path.join(folder_path, "input.json")
-            prediction_file = os.path.join(folder_path, "prediction.json")
-
-            if os.path.exists(input_file) and os.path.exists(prediction_file):
-                with open(input_file, "r", encoding="utf-8") as f:
-                    input_data = json.load(f)
-                with open(prediction_file, "r", encoding="utf-8") as f:
-                    prediction_data = json.load(f)
-
-                sessions.append({
-                    "timestamp": folder,
-                    "input": input_data,
-                    "prediction": prediction_data
-                })
-        except Exception as e:
-            st.warning(f"⚠️ Error loading session '{folder}': {e}")
-    return sessions
+    return load_session_index()[0]
 
 def delete_selected_sessions(selected_ids):
-    deleted = 0
-    for session_id in selected_ids:
-        try:
-            folder_path = os.path.join(PREDICTION_FOLDER, session_id)
-            if os.path.exists(folder_path):
-                shutil.rmtree(folder_path)
-                deleted += 1
-        except Exception as e:
-            st.error(f"Failed to delete '{session_id}': {e}")
+    errors = []
+    deleted = session_store.delete_sessions(selected_ids, errors=errors)
+    for session_id, e in errors:
+        st.error(f"Failed to delete '{session_id}': {e}")
     return deleted
 
 def display_comparison_table(sessions):
@@ -55,6 +29,8 @@ def display_comparison_table(sessions):
         st.info("📂 No prediction sessions found.")
         return
 
+    import pandas as pd
+
     data_rows = []
     for session in sessions:
         row = {"Timestamp": session["timestamp"]}
@@ -74,42 +50,32 @@ def plot_probability_bar(session):
         st.warning("⚠️ Probability data missing or malformed.")
         return
 
-    fig, ax = plt.subplots()
+    fig, ax = reusable_figure("probability_bar")
     ax.barh(labels, probs, color='red')
     ax.set_xlabel("Probability")
     ax.set_title(f"Prediction Probabilities — {session['timestamp']}")
-    st.pyplot(fig)
+    st.pyplot(fig, clear_figure=True)
 
 
-def load_all_sessions_df():
-    sessions = load_prediction_sessions()
-    flat_data = []
+def _rows_frame(sessions, session_key):
+    import pandas as pd
 
-    for session in sessions:
-        try:
-            row = session["input"].copy()
-            row.update(session["prediction"])
-            row["Session"] = session["timestamp"]
-            flat_data.append(row)
-        except Exception as e:
-            st.warning(f"⚠️ Error processing session {session['timestamp']}: {e}")
+    errors = []
+    rows = session_store.flatten_sessions(sessions, session_key, errors=errors)
+    for session_id, e in errors:
+        st.warning(f"⚠️ Error processing session {session_id}: {e}")
+    return pd.DataFrame(rows)
 
-    return pd.DataFrame(flat_data)
+def load_all_sessions_df():
+    return _rows_frame(load_prediction_sessions(), "Session")
 
 def flatten_sessions(sessions):
-    flat_data = []
-    for session in sessions:
-        try:
-            row = session["input"].copy()
-            row.update(session["prediction"])
-            row["session"] = session["timestamp"]
-            flat_data.append(row)
-        except Exception as e:
-            st.warning(f"⚠️ Error processing session {session['timestamp']}: {e}")
-    return pd.DataFrame(flat_data)
+    return _rows_frame(sessions, "session")
 
-def comparison_app():
-    sessions = load_prediction_sessions()
+def comparison_app(sessions=None, by_id=None):
+    # main.py loads the sessions once per rerun and hands them to both tabs
+    if sessions is None or by_id is None:
+        sessions, by_id = load_session_index()
 
     if not sessions:
         st.info("No prediction sessions found.")
@@ -131,16 +97,16 @@ def comparison_app():
         if st.button("💾 Individual PDFs"):
             export_count = 0
             for sid in selected_sessions:
-                session = next((s for s in sessions if s["timestamp"] == sid), None)
+                session = by_id.get(sid)
                 if session:
-                    generate_pdf_for_session(session, folder_type="multi")
+                    reports.generate_pdf_for_session(session, folder_type="multi")
                     export_count += 1
             st.success(f"✅ {export_count} PDF(s) saved to `/download/multi/`") if export_count else st.warning("No sessions were exported.")
 
     with col2:
         if st.button("💾 Combined PDF"):
-            selected_data = [s for s in sessions if s["timestamp"] in selected_sessions]
-            path = generate_combined_pdf(selected_data, filename="comparison_report")
+            selected_data = [by_id[sid] for sid in selected_sessions if sid in by_id]
+            path = reports.generate_combined_pdf(selected_data, filename="comparison_report")
             st.success(f"📁 Combined PDF saved to `{path}`")
 
     with col4:
@@ -158,12 +124,12 @@ def comparison_app():
 
     if len(selected_sessions) >= 2:
         for sid in selected_sessions:
-            session = next((s for s in sessions if s["timestamp"] == sid), None)
+            session = by_id.get(sid)
             if session:
                 with st.expander(f"📊 {sid} — {session['prediction'].get('predicted_class', 'Unknown')}"):
                     plot_probability_bar(session)
 
-        df_sessions = flatten_sessions([s for s in sessions if s["timestamp"] in selected_sessions])
+        df_sessions = flatten_sessions([by_id[sid] for sid in selected_sessions if sid in by_id])
 
         if not df_sessions.empty:
             st.markdown("## 📈 Multi-Session Comparison Summary")
@@ -178,6 +144,8 @@ def comparison_app():
                 st.bar_chart(df_sessions["predicted_class"].value_counts())
 
             if "ram" in df_sessions.columns and "battery_power" in df_sessions.columns:
+                import altair as alt
+
                 st.markdown("#### 🔬 RAM vs Battery vs Predicted Class")
                 st.altair_chart(
                     alt.Chart(df_sessions).mark_circle(size=60).encode(
@@ -193,7 +161,7 @@ def comparison_app():
     else:
         st.info("Select **two or more** sessions to view comparison graphs.")
 
-def parody_comparison():
+def parody_comparison(sessions=None, by_id=None):
     
     st.markdown("---")
     st.subheader("📱 Compare With Predefined Phone")
@@ -203,18 +171,18 @@ def parody_comparison():
         st.warning("⚠️ No phone selected for comparison.")
         st.info("Go to the **📦 Shop Phones** tab to select a model.")
         return
-    try:
-        sessions = load_prediction_sessions()
-    except Exception as e:
-        st.error(f"❌ Failed to load prediction sessions: {e}")
-        return
+    if sessions is None or by_id is None:
+        try:
+            sessions, by_id = load_session_index()
+        except Exception as e:
+            st.error(f"❌ Failed to load prediction sessions: {e}")
+            return
 
+    # Already newest first, and shared with the other tab and sessions: never sort it in place
     if not sessions:
         st.warning("⚠️ No saved prediction sessions found.")
         return
 
-    sessions.sort(key=lambda s: s.get("timestamp", ""), reverse=True)
-
     parody_name = parody.get("name", "Unknown Model")
     parody_price = parody.get("price", "N/A")
     parody_features = parody.get("features", [])
@@ -229,7 +197,7 @@ def parody_comparison():
     {features_md}
     """)
 
-    if "selected_session_id" not in st.session_state:
+    if st.session_state.get("selected_session_id") not in by_id:
         st.session_state.selected_session_id = sessions[0]["timestamp"]
     try:
         session_timestamps = [s["timestamp"] for s in sessions]
@@ -243,7 +211,7 @@ def parody_comparison():
         st.error(f"❌ Failed to list sessions: {e}")
         return
 
-    selected_session = next((s for s in sessions if s["timestamp"] == selected_session_id), None)
+    selected_session = by_id.get(selected_session_id)
     if not selected_session:
         st.warning("⚠️ Could not find the selected session.")
         return
@@ -0,0 +1,44 @@
+import streamlit as st
+
+from core.tracing import TRACING, TRACE_PATH
+
+TRACE_TOGGLE_KEY = "debug_tracing"
+
+def tracing_enabled():
+    """
+    Whether this session traces its predictions: the sidebar toggle is on,
+    or `MOBILE_PRICE_TRACE=1` traces every session.
+    """
+    return TRACING or bool(st.session_state.get(TRACE_TOGGLE_KEY, False))
+
+def remember_trace(trace):
+    """
+    Keeps the spans of the latest traced prediction for `debug_panel()`.
+    """
+    if trace is not None:
+        st.session_state["last_trace"] = trace.records()
+
+def debug_panel():
+    """
+    Renders the opt-in "Timing breakdown" toggle in the sidebar and, when it is
+    on, the stages of the latest traced prediction with their share of the total.
+    """
+    with st.sidebar:
+        st.toggle("🐞 Timing breakdown", key=TRACE_TOGGLE_KEY,
+                  help="Trace each prediction stage and show where the time went.")
+        if not tracing_enabled():
+            return
+
+        spans = st.session_state.get("last_trace")
+        if not spans:
+            st.caption("Submit a prediction to record its stages.")
+            return
+
+        total = spans[0]["duration_ms"] or 1e-9
+        width = max(len(span["name"]) + 2 * span["depth"] for span in spans)
+        lines = [
+            f"{'  ' * span['depth'] + span['name']:<{width}} {span['duration_ms']:9.3f} ms {span['duration_ms'] / total:6.1%}"
+            for span in spans
+        ]
+        st.code("\n".join(lines), language=None)
+        st.caption(f"Trace `{spans[0]['trace_id']}` at {spans[0]['created_at']}, appended to `{TRACE_PATH}`.")
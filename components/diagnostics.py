@@ -0,0 +1,131 @@
+import uuid
+
+import streamlit as st
+
+from utils.memory_monitor import MEMORY_MONITOR, get_memory_monitor
+from utils.rerun_profiler import DIAGNOSTICS, SUSPECTS, RerunProfiler, get_profile_ring
+
+def diagnostics_enabled():
+    """
+    Diagnostics mode is hidden: `MOBILE_PRICE_DIAGNOSTICS=1` turns it on for
+    every session, the `?diagnostics=1` query parameter for one.
+    """
+    return DIAGNOSTICS or st.query_params.get("diagnostics") == "1"
+
+def start_rerun_profile():
+    """
+    Starts profiling this rerun when diagnostics mode is on; returns the
+    profiler to pass to `diagnostics_app()`, or None.
+    """
+    if not diagnostics_enabled():
+        return None
+    if "diagnostics_session" not in st.session_state:
+        st.session_state["diagnostics_session"] = uuid.uuid4().hex[:8]
+    return RerunProfiler("main.py", st.session_state["diagnostics_session"])
+
+def memory_checkpoint():
+    """
+    Records this rerun with the memory monitor if it is running (always with
+    `MOBILE_PRICE_MEMORY_MONITOR=1`, otherwise once started from the
+    Diagnostics tab); returns the checkpoint, or None.
+    """
+    monitor = get_memory_monitor()
+    if MEMORY_MONITOR and not monitor.running:
+        monitor.start()
+    if not monitor.running:
+        return None
+    return monitor.record(st.session_state.get("diagnostics_session"))
+
+def _memory_section():
+    monitor = get_memory_monitor()
+    st.markdown("#### 🧠 Memory")
+    if not monitor.running:
+        st.caption("The tracemalloc monitor is off; it slows allocations down for every session while it runs.")
+        if st.button("▶️ Start memory monitor"):
+            monitor.start()
+            st.rerun()
+        return
+
+    checkpoint = memory_checkpoint()
+    rss = f"{checkpoint['rss_bytes'] / 2**20:,.1f} MiB" if checkpoint["rss_bytes"] else "n/a"
+    st.caption(f"RSS {rss} · traced {checkpoint['traced_bytes'] / 2**20:,.1f} MiB "
+               f"(peak {checkpoint['peak_bytes'] / 2**20:,.1f} MiB) · "
+               f"snapshot took {checkpoint['snapshot_ms']:,.0f} ms · {len(monitor.history)} checkpoint(s)")
+    for suspect in monitor.flagged.values():
+        st.warning(f"⚠️ Possible leak: `{suspect['site']}` grew {suspect['growth_bytes'] / 1024:,.0f} KiB "
+                   f"over {suspect['streak']} reruns in a row")
+
+    st.line_chart([
+        {"RSS (MiB)": (point["rss_bytes"] or 0) / 2**20, "Traced (MiB)": point["traced_bytes"] / 2**20}
+        for point in monitor.history
+    ])
+    growth = st.radio("Growth", ["Since the monitor started", "During the last rerun"],
+                      horizontal=True, key="diagnostics_memory_growth")
+    stats = checkpoint["top_growth"] if growth.startswith("Since") else checkpoint["rerun_growth"]
+    st.dataframe([
+        {"Call site": stat["site"], "Growth (KiB)": round(stat["size_diff_bytes"] / 1024, 1),
+         "Blocks": stat["count_diff"]}
+        for stat in stats
+    ], use_container_width=True, hide_index=True)
+    if st.button("⏹️ Stop memory monitor"):
+        monitor.stop()
+        st.rerun()
+
+def diagnostics_app(profiler):
+    """
+    Stops `profiler` and renders the Diagnostics tab from the ring buffer.
+
+    Behavior
+    --------
+    - Shows the average and worst cost of the usual per-rerun suspects (theme
+      CSS, intro audio, session scan, charts) over the buffered reruns of all
+      sessions.
+    - Lists the buffered reruns; the selected one shows its top cumulative
+      hotspots and offers its raw pstats dump for download.
+    - Starts and stops the memory monitor; while it runs, shows RSS and
+      traced memory over time, the top growing call sites and suspected leaks.
+
+    """
+    entry = profiler.finish()
+    ring = get_profile_ring()
+    entries = ring.entries()
+
+    st.caption(f"This rerun took {entry['seconds'] * 1000:,.0f} ms. "
+               f"{len(entries)} rerun(s) of all sessions are buffered; this session is `{entry['session']}`.")
+
+    st.markdown("#### 🔎 Per-rerun suspects")
+    st.dataframe([
+        {
+            "Work": label,
+            "Mean (ms)": round(sum(e["suspects_ms"][label] for e in entries) / len(entries), 2),
+            "Max (ms)": round(max(e["suspects_ms"][label] for e in entries), 2),
+            "Share of rerun": f"{sum(e['suspects_ms'][label] for e in entries) / max(sum(e['seconds'] for e in entries) * 1000, 1e-9):.1%}",
+        }
+        for label in SUSPECTS
+    ], use_container_width=True, hide_index=True)
+
+    st.markdown("#### 🕒 Recent reruns")
+    by_id = {e["id"]: e for e in entries}
+    selected = st.selectbox(
+        "Rerun", options=list(by_id),
+        format_func=lambda i: f"#{i} · {by_id[i]['started_at']} · session {by_id[i]['session']} · "
+                              f"{by_id[i]['seconds'] * 1000:,.0f} ms",
+        key="diagnostics_rerun",
+    )
+    chosen = by_id[selected]
+    st.dataframe([
+        {"Function": h["function"], "Calls": h["calls"],
+         "Own (ms)": round(h["tottime_ms"], 2), "Cumulative (ms)": round(h["cumtime_ms"], 2)}
+        for h in chosen["hotspots"]
+    ], use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("💾 Download pstats", data=chosen["pstats"],
+                           file_name=f"rerun_{chosen['id']}.pstats", mime="application/octet-stream",
+                           help="Open with `python -m pstats` or snakeviz.")
+    with col2:
+        if st.button("🧹 Clear buffer"):
+            ring.clear()
+
+    _memory_section()
@@ -0,0 +1,60 @@
+import time
+
+import streamlit as st
+
+from utils.prediction_cache import canonical_key, predict_price_range_cached
+from core.predictor import FEATURE_ORDER
+from core.sessions import save_prediction_session
+from utils.shadow_scoring import get_shadow_scorer
+from components.vis import show_prediction_card, chart_prediction_probabilities
+from components.debug import tracing_enabled, remember_trace
+from core.tracing import start_trace
+
+def live_prediction_panel(bundle, class_names):
+    """
+    Shows a prediction that follows the specification widgets on every rerun.
+
+    Behavior
+    --------
+    - Reads the current inputs from `st.session_state`; the widgets must be
+      rendered outside a form so every change triggers a rerun.
+    - Re-scores only when the input vector changed since the last rerun, so
+      unrelated reruns (theme toggle, other tabs) reuse the shown result.
+      Scores go through the shared prediction cache, so revisiting a slider
+      position costs a dictionary lookup.
+    - Redraws a lightweight Altair chart in place instead of a Matplotlib figure.
+    - Writes a `Predictions/` session only when "Save this prediction" is
+      clicked, not for every intermediate slider position.
+
+    """
+    input_data = {feature: st.session_state[feature] for feature in FEATURE_ORDER if feature in st.session_state}
+    if len(input_data) < len(FEATURE_ORDER):
+        return
+
+    key = canonical_key(input_data)
+    if st.session_state.get("live_key") != key:
+        start = time.perf_counter()
+        with start_trace("live_predict", enabled=tracing_enabled()) as trace:
+            price_label, probabilities = predict_price_range_cached(bundle, input_data)
+        latency_ms = (time.perf_counter() - start) * 1000
+        remember_trace(trace)
+        get_shadow_scorer().submit(bundle, input_data, price_label, latency_ms)
+        st.session_state["live_key"] = key
+        st.session_state["live_result"] = (price_label, probabilities, latency_ms)
+
+    price_label, probabilities, latency_ms = st.session_state["live_result"]
+    show_prediction_card(price_label)
+    chart_prediction_probabilities(probabilities, st.empty())
+    st.caption(f"⚡ Scored in {latency_ms:.1f} ms")
+
+    if st.button("💾 Save this prediction", key="live_save"):
+        st.session_state["last_input"] = input_data
+        st.session_state["last_prediction"] = price_label
+        st.session_state["show_result"] = True
+        save_prediction_session(
+            input_data=input_data,
+            predicted_label=class_names.index(price_label),
+            probabilities=probabilities,
+            label_names=class_names
+        )
+        st.success("✅ Saved. View it in the 'Compare Past Predictions' tab.")
@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.parody_data import get_parody_phones
-from utils.specs_formatter import format_spec_display
+from core.specs import format_spec_display
 
 def extract_numeric_price(price_str):
     """
@@ -140,7 +140,7 @@ def parody_shop_interface():
             st.markdown("## 📱 Detailed Phone View")
             col4, col5 = st.columns([1, 2])
             with col4:
-                st.image(phone["image"], use_container_width=True)
+                st.image(phone["image"], use_column_width=True)
             with col5:
                 st.subheader(phone["name"])
                 st.caption(phone["price"])
@@ -152,6 +152,7 @@ def parody_shop_interface():
                     st.info("No specifications available.")
                 if st.button("🔙 Close Details"):
                     st.session_state["show_details_for"] = None
+                    st.rerun()
         return 
 
     for phone in current_phones:
@@ -0,0 +1,100 @@
+import streamlit as st
+
+from core.predictor import FEATURE_ORDER
+
+def keep_spec_inputs():
+    """
+    Re-assigns the current input values so they survive the widgets being
+    re-created elsewhere (e.g. moving between the form and live mode);
+    Streamlit otherwise drops the state of widgets that were not rendered.
+    """
+    for feature in FEATURE_ORDER:
+        if feature in st.session_state:
+            st.session_state[feature] = st.session_state[feature]
+
+def render_spec_inputs():
+    """
+    Renders the 20 specification widgets of the prediction tab.
+
+    Every widget stores its value in `st.session_state` under the feature
+    name, so the same inputs can be placed inside the prediction form or
+    directly on the page for live mode, and `randomize_inputs()` can set them.
+
+    """
+    st.subheader("🔧 Performance Specification")
+    st.slider("RAM (MB)", 128, 4096, step=128, value=1024, key="ram",
+                help="Memory available for running tasks. More Random Access Memory(RAM) can improve multitasking.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.slider("Internal Memory (GB)", 2, 256, step=2, value=64, key="int_memory",
+                help="Built-in storage capacity to store for application and media.")
+    with col2:
+        st.slider("Clock Speed (GHz)", 0.5, 3.0, step=0.1, value=1.5, key="clock_speed",
+                help="Processing speed of the CPU Processor. Faster speeds improve performance.")
+    with col3:
+        st.slider("Processor Cores", 1, 12, step=1, value=4, key="n_cores",
+                help="Number of CPU cores. More cores may help with performance and multi-tasking.")
+
+    st.subheader("🔋 Power Usage")
+    col4, col5 = st.columns([2,1])
+    with col4:
+        st.slider("Battery Power (mAh)", 500, 5000, step=50, value=2500, key="battery_power",
+                help="Total battery capacity. Higher capacity will allow user for longer usage.")
+    with col5:
+        st.slider("Talk Time (hours)", 2, 24, step=1, value=10, key="talk_time",
+                help="Maximum talk time after a full charge.")  
+
+    st.subheader("📡 Connectivity Features")
+    col6, col7, col8, col9, col10, col11 = st.columns(6)
+    with col6:
+        st.selectbox("Bluetooth", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="blue",
+                 help="Whether the device supports Bluetooth connectivity.")
+    with col9:
+        st.selectbox("4G Support", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="four_g",
+                 help="Is 4G Internet supported?")
+    with col7:
+        st.selectbox("Dual SIM", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="dual_sim",
+                 help="Is the phone supporting one or two SIM cards simultaneously")
+    with col10:
+        st.selectbox("WiFi Support", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="wifi",
+                 help="Whether the device supports WiFi connectivity.")
+    with col8:
+        st.selectbox("3G Support", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="three_g",
+                 help="Is 3G Internet Supported?")
+    with col11:
+        st.selectbox("Touch Screen", [1, 0], format_func=lambda x: "Yes" if x == 1 else "No", key="touch_screen",
+                 help="Is the device touch screen?")
+
+    st.subheader("📸 Camera Quality")
+    col12, col13 = st.columns(2)
+    with col12:
+        st.slider("Front Camera (MP)", 0, 20, step=1, value=5, key="fc",
+                  help="Front camera megapixel rating.")
+    with col13:
+        st.slider("Primary/Rear Camera (MP)", 0, 50, step=1, value=12, key="pc",
+                  help="Primary rear camera megapixel rating.")
+
+    st.subheader("📱 Screen Display Visuals")
+    col14, col15= st.columns(2)
+    with col14:
+        st.slider("Display Height (Px)", 100, 2000, step=50, value=1000, key="px_height",
+                  help="Height of the display in pixels.") 
+    with col15:
+        st.slider("Display Width (Px)", 100, 2000, step=50, value=1000, key="px_width",
+                  help="Width of the display in pixels.")
+
+    st.subheader("🖥️ Hardware Screen Specifications")    
+    col16, col17= st.columns(2) 
+    with col16:
+        st.slider("Screen Height (cm)", 5, 20, step=1, value=10, key="sc_h",
+                  help="The Physical screen height.")
+    with col17:
+        st.slider("Screen Width (cm)", 3, 10, step=1, value=5, key="sc_w",
+                  help="The Physical screen width.")
+    col18, col19 = st.columns([1,2])
+    with col18:
+        st.slider("Mobile Depth (cm)", 0.1, 1.0, step=0.01, value=0.5, key="m_dep",
+                help="Thickness of the Device.")
+    with col19:
+        st.slider("Weight (grams)", 80, 250, step=5, value=150, key="mobile_wt",
+                    help="Total weight of the device in grams.")
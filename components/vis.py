@@ -1,7 +1,56 @@
-import matplotlib.pyplot as plt
-import pandas as pd
 import streamlit as st
 
+# Pandas, Matplotlib and Altair are imported inside the functions that draw,
+# so importing this module (and starting the app) does not pay for them
+
+PROBABILITY_LABELS = ["Low (<₹10k)", "Medium (₹10k–₹30k)", "High (₹30k–₹60k)", "Very High (>₹60k)"]
+
+def show_prediction_card(price_label):
+    """
+    Displays the predicted price range as a highlighted result card.
+    """
+    st.markdown(f"""
+        <div style='padding: 1rem; background-color: #D1E7DD; border-radius: 10px; 
+                    border: 2px solid #0F5132; text-align: center;'>
+            <h2 style='color: #0F5132;'>Predicted Price Range</h2>
+            <h1 style='color: #0F5132;'>{price_label}</h1>
+        </div>
+    """, unsafe_allow_html=True)
+
+def reusable_figure(key, figsize=(6.4, 4.8)):
+    """
+    Returns this session's Matplotlib figure for `key`, cleared and ready to draw on.
+
+    The figure is created with `matplotlib.figure.Figure` rather than
+    `pyplot`, so it never enters pyplot's process-wide figure list (which
+    Streamlit empties with `plt.close("all")` after every script run, whichever
+    session is still drawing), and it is kept in `st.session_state` so each
+    rerun redraws the same figure instead of allocating a new one.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the chart within the session.
+    figsize : tuple of float
+        Width and height in inches.
+
+    Returns
+    -------
+    tuple
+        `(fig, ax)`, like `plt.subplots()`.
+
+    """
+    from matplotlib.figure import Figure
+
+    state_key = f"_figure_{key}"
+    fig = st.session_state.get(state_key)
+    if fig is None:
+        fig = Figure()
+        st.session_state[state_key] = fig
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig, fig.add_subplot()
+
 def plot_prediction_probabilities(probabilities):
     """
     Plots a horizontal bar chart showing the model's predicted probabilities for each price range category.
@@ -21,7 +70,9 @@ def plot_prediction_probabilities(probabilities):
     - Handles errors gracefully and displays an error message in Streamlit if plotting fails.
 
     """
-    labels = ["Low (<₹10k)", "Medium (₹10k–₹30k)", "High (₹30k–₹60k)", "Very High (>₹60k)"]
+    import pandas as pd
+
+    labels = PROBABILITY_LABELS
     try:
         prob_df = pd.DataFrame({'Price Range': labels, 'Probability': list(map(float, probabilities))})
     except Exception as e:
@@ -29,7 +80,7 @@ def plot_prediction_probabilities(probabilities):
         return
 
     # --- Plotting ---
-    fig, ax = plt.subplots(figsize=(8, 3))
+    fig, ax = reusable_figure("prediction_probabilities", figsize=(8, 3))
     bars = ax.barh(prob_df['Price Range'], prob_df['Probability'], color='#0d6efd')
     ax.set_xlim(0, 1)
     ax.set_xlabel('Probability')
@@ -38,5 +89,33 @@ def plot_prediction_probabilities(probabilities):
     for i, (prob, label) in enumerate(zip(prob_df['Probability'], prob_df['Price Range'])):
         ax.text(prob + 0.01, i, f'{prob:.2%}', va='center', color='black', fontsize=10)
 
-    plt.tight_layout()
-    st.pyplot(fig)
+    fig.tight_layout()
+    # Drops the bars and labels once rendered; the empty figure is reused next time
+    st.pyplot(fig, clear_figure=True)
+
+
+def chart_prediction_probabilities(probabilities, placeholder=None):
+    """
+    Draws the class probabilities as a lightweight Altair bar chart.
+
+    Unlike `plot_prediction_probabilities()` no Matplotlib figure is rendered,
+    so it is cheap enough to redraw on every input change in live mode.
+
+    Parameters
+    ----------
+    probabilities : iterable of float
+        One probability per price range category (Low, Medium, High, Very High).
+    placeholder : streamlit container, optional
+        E.g. an `st.empty()`; the chart replaces its previous content in place.
+
+    """
+    import altair as alt
+    import pandas as pd
+
+    prob_df = pd.DataFrame({'Price Range': PROBABILITY_LABELS, 'Probability': list(map(float, probabilities))})
+    chart = alt.Chart(prob_df).mark_bar(color='#0d6efd').encode(
+        x=alt.X('Probability:Q', scale=alt.Scale(domain=[0, 1]), axis=alt.Axis(format='%')),
+        y=alt.Y('Price Range:N', sort=PROBABILITY_LABELS, title=None),
+        tooltip=['Price Range', alt.Tooltip('Probability:Q', format='.2%')],
+    ).properties(height=160)
+    (placeholder or st).altair_chart(chart, use_container_width=True)
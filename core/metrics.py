@@ -0,0 +1,360 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from core.tracing import set_span_observer
+
+# The exporter listens on MOBILE_PRICE_METRICS_HOST:MOBILE_PRICE_METRICS_PORT; port 0 disables it
+METRICS_HOST = os.environ.get("MOBILE_PRICE_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("MOBILE_PRICE_METRICS_PORT", "9108"))
+
+# Stage timings are only observed while the endpoint is scraped at least this often
+STAGE_IDLE_SECONDS = float(os.environ.get("MOBILE_PRICE_METRICS_STAGE_IDLE", "300"))
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _sample(name, labels, value):
+    if labels:
+        label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+        return f"{name}{{{label_text}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+class _Metric:
+    """
+    A metric family: one value (or one set of buckets) per combination of label values.
+
+    Every update takes the family's lock, so the metric can be updated from
+    any number of Streamlit session threads while being scraped.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key):
+        return list(zip(self.labelnames, key))
+
+    def samples(self):
+        """
+        Returns `(name, [(label, value), ...], value)` tuples for the exposition format.
+        """
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in sorted(self._values.items())]
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}",
+                 f"# TYPE {self.name} {self.kind}"]
+        lines.extend(_sample(*sample) for sample in self.samples())
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Histogram(_Metric):
+    """
+    Cumulative buckets, `_sum` and `_count` per label combination, as Prometheus expects.
+
+    An observation lands in the first bucket whose upper bound (`le`) is
+    >= the value; every bucket also counts the ones below it.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts plus the +Inf bucket, sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """
+        Context manager that observes the seconds spent in its block.
+        """
+        return _Timer(self, labels)
+
+    def snapshot(self, **labels):
+        """
+        Returns the per-bucket (non-cumulative) counts, sum, count and mean of
+        one label combination, for JSON status pages.
+        """
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            counts, total, count = (list(state[0]), state[1], state[2]) if state else ([0] * (len(self.buckets) + 1), 0.0, 0)
+        names = [f"<={bound:g}" for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(names, counts)),
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else None,
+        }
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in sorted(self._values.items())]
+        samples = []
+        for key, counts, total, count in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", labels + [("le", _format_value(float(bound)))], cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+class _CallbackMetric(_Metric):
+    """
+    A counter or gauge whose values are read from `function` at scrape time,
+    for numbers that are already kept elsewhere (e.g. the prediction cache's
+    counters). `function` returns a number, or `{label values tuple: number}`.
+    """
+
+    def __init__(self, name, documentation, kind, function, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.function = function
+
+    def samples(self):
+        try:
+            values = self.function()
+        except Exception as e:
+            print(f"❌ Failed to collect {self.name}: {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [(self.name, self._labels(tuple(map(str, key))), value)
+                for key, value in sorted(values.items()) if value is not None]
+
+class MetricsRegistry:
+    """
+    The metric families of one process, rendered together in the Prometheus
+    text exposition format. Registering a name twice returns the existing
+    family, so modules can declare their metrics at import time.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def callback(self, name, documentation, kind, function, labelnames=()):
+        """
+        Registers a `"counter"` or `"gauge"` read from `function` on every scrape.
+        """
+        if kind not in ("counter", "gauge"):
+            raise ValueError(f"Unsupported callback metric type: {kind}")
+        return self._register(_CallbackMetric, name, documentation, kind, function, labelnames)
+
+    def expose(self):
+        """
+        Returns every metric in the text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry():
+    """
+    Returns the process-wide registry shared by every session.
+    """
+    return _registry
+
+STAGE_SECONDS = _registry.histogram(
+    "mobile_price_stage_seconds", "Time spent in each traced stage of a prediction.", ["stage"])
+PREDICTIONS = _registry.counter(
+    "mobile_price_predictions_total", "Predictions served by the app, per predicted price range.", ["price_range"])
+SESSION_SCAN_SECONDS = _registry.histogram(
+    "mobile_price_session_scan_seconds", "Time taken to load every saved prediction session.")
+SESSION_STORE_SESSIONS = _registry.gauge(
+    "mobile_price_session_store_sessions", "Saved prediction sessions found by the last scan.")
+PDF_EXPORT_SECONDS = _registry.histogram(
+    "mobile_price_pdf_export_seconds", "Time taken to write a PDF report.", ["report"])
+
+_last_scrape = 0.0
+_stage_lock = threading.Lock()
+
+def _observe_stage(stage, seconds):
+    if time.monotonic() - _last_scrape > STAGE_IDLE_SECONDS:
+        with _stage_lock:
+            # Nobody scrapes any more: spans go back to costing nothing
+            if time.monotonic() - _last_scrape > STAGE_IDLE_SECONDS:
+                set_span_observer(None)
+        return
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+def _scraped():
+    global _last_scrape
+    with _stage_lock:
+        _last_scrape = time.monotonic()
+        set_span_observer(_observe_stage)
+
+class _MetricsServer:
+    def __init__(self, server, thread):
+        self.server = server
+        self.thread = thread
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT, registry=None):
+    """
+    Serves `GET /metrics` on a daemon thread, once per process.
+
+    Streamlit re-executes `main.py` on every rerun of every session, so later
+    calls return the server started by the first one. Each scrape is handled
+    on its own thread and only reads the registry under its locks.
+
+    Once the endpoint is scraped, every `core.tracing.span` also becomes a
+    `mobile_price_stage_seconds` observation, traced or not. After
+    `STAGE_IDLE_SECONDS` without a scrape the observer is removed again, so
+    an exporter nobody scrapes keeps spans outside a trace free.
+
+    Parameters
+    ----------
+    host : str
+    port : int
+        0 disables the exporter.
+    registry : MetricsRegistry, optional
+        Defaults to the process-wide registry.
+
+    Returns
+    -------
+    The running server (`.address`, `.stop()`), or None when disabled or the
+    port could not be bound.
+
+    """
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is not None:
+            # False: binding failed before, which was reported once
+            return _server or None
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = registry or _registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                _scraped()
+                body = registry.expose().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"❌ Metrics endpoint not started on {host}:{port}: {e}")
+            _server = False
+            return None
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        _server = _MetricsServer(server, thread)
+        return _server
@@ -0,0 +1,181 @@
+import threading
+
+import numpy as np
+
+from core.tracing import span
+
+FEATURE_ORDER = [
+    'battery_power', 'blue', 'clock_speed', 'dual_sim', 'fc',
+    'four_g', 'int_memory', 'm_dep', 'mobile_wt', 'n_cores',
+    'pc', 'px_height', 'px_width', 'ram', 'sc_h', 'sc_w',
+    'talk_time', 'three_g', 'touch_screen', 'wifi'
+]
+
+PRICE_MAP = {
+    0: "Low (<₹10k)",
+    1: "Medium (₹10k-₹30k)",
+    2: "High (₹30k-₹60k)",
+    3: "Very High (>₹60k)"
+}
+
+def predict_price_range(model, scaler, input_data):
+    """
+    Predicts the price range category of a mobile phone based on its specifications.
+
+    This function takes user input specifications, scales them, and uses a trained
+    machine learning model to predict the price range and associated probabilities.
+    The model is evaluated once: the predicted class is the argmax of its probabilities.
+
+    Parameters
+    ----------
+    model : object
+    scaler : object or None
+        Pass None when the model consumes raw specifications, e.g. a
+        `CompiledForest` with the scaler folded into its thresholds.
+    input_data : dict
+
+    Returns
+    -------
+    price_label : str
+    probabilities : list of float
+
+    Raises
+    ------
+    ValueError
+        If any required feature is missing in `input_data`.
+    RuntimeError
+        If prediction fails for other reasons (e.g., incompatible input shape).
+
+    """
+    try:
+
+        with span("scale"):
+            values = [input_data[feature] for feature in FEATURE_ORDER]
+            scaled_values = scaler.transform([values]) if scaler is not None else [values]
+
+        with span("model.predict_proba", model=type(model).__name__):
+            probabilities = model.predict_proba(scaled_values)[0]
+        prediction = model.classes_[probabilities.argmax()]
+        price_label = PRICE_MAP.get(prediction, "Unknown")
+
+        return price_label, probabilities
+
+    except KeyError as ke:
+        raise ValueError(f"Missing input feature: {ke}")
+    except Exception as e:
+        raise RuntimeError(f"Prediction failed: {e}")
+
+def predict_price_ranges(model, scaler, data):
+    """
+    Predicts the price range category for many mobile phones in one vectorized pass.
+
+    The whole batch is scaled with a single `scaler.transform` call and scored
+    with a single `model.predict_proba` call; the predicted class of each row is
+    the argmax of its probabilities, so the model is only evaluated once.
+
+    Parameters
+    ----------
+    model : object
+    scaler : object or None
+    data : pandas.DataFrame or array-like of shape (n_samples, 20)
+        A DataFrame must contain every column of `FEATURE_ORDER` (extra columns
+        such as `price_range` are ignored). A 2-D array must already be laid out
+        in `FEATURE_ORDER`.
+
+    Returns
+    -------
+    price_labels : numpy.ndarray of str, shape (n_samples,)
+    probabilities : numpy.ndarray of float, shape (n_samples, n_classes)
+
+    Raises
+    ------
+    ValueError
+        If a required column is missing or the array has the wrong shape.
+    RuntimeError
+        If prediction fails for other reasons.
+
+    """
+    if hasattr(data, "columns"):
+        missing = [feature for feature in FEATURE_ORDER if feature not in data.columns]
+        if missing:
+            raise ValueError(f"Missing input feature(s): {', '.join(missing)}")
+        values = data[FEATURE_ORDER]
+    else:
+        values = np.asarray(data, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(FEATURE_ORDER):
+            raise ValueError(
+                f"Expected an array of shape (n_samples, {len(FEATURE_ORDER)}), got {values.shape}"
+            )
+
+    try:
+        with span("scale", rows=len(values)):
+            scaled_values = scaler.transform(values) if scaler is not None else np.asarray(values, dtype=float)
+        with span("model.predict_proba", model=type(model).__name__):
+            probabilities = model.predict_proba(scaled_values)
+        predictions = np.asarray(model.classes_)[probabilities.argmax(axis=1)]
+        price_labels = np.array([PRICE_MAP.get(p, "Unknown") for p in predictions])
+
+        return price_labels, probabilities
+
+    except Exception as e:
+        raise RuntimeError(f"Batch prediction failed: {e}")
+
+class CascadeModel:
+    """
+    Two-stage model: a small model on a few top features answers confident rows,
+    everything else falls through to the full model.
+
+    Both stages must score raw rows laid out in `FEATURE_ORDER` (e.g. two
+    `CompiledForest` objects), so the cascade is used with `scaler=None`.
+    Exposes `classes_` and `predict_proba` like a scikit-learn classifier.
+
+    Parameters
+    ----------
+    stage1 : object
+        Cheap model; its answer is kept when its top probability is at least `threshold`.
+    stage2 : object
+        Full model for the remaining rows.
+    threshold : float
+        Confidence required to stop at stage 1 (1.0 only keeps pure leaves).
+
+    """
+
+    def __init__(self, stage1, stage2, threshold=0.95):
+        self.stage1 = stage1
+        self.stage2 = stage2
+        self.threshold = float(threshold)
+        self.classes_ = np.asarray(stage2.classes_)
+        self._lock = threading.Lock()
+        self._counts = {"stage1": 0, "stage2": 0}
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=float)
+        with span("cascade.stage1"):
+            probabilities = np.asarray(self.stage1.predict_proba(X), dtype=float)
+        fallthrough = probabilities.max(axis=1) < self.threshold
+        if fallthrough.any():
+            with span("cascade.stage2", rows=int(fallthrough.sum())):
+                probabilities[fallthrough] = self.stage2.predict_proba(X[fallthrough])
+
+        with self._lock:
+            self._counts["stage2"] += int(fallthrough.sum())
+            self._counts["stage1"] += int(len(X) - fallthrough.sum())
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def hit_rates(self):
+        """
+        Returns the rows answered by each stage and the share answered by stage 1.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        total = counts["stage1"] + counts["stage2"]
+        counts["stage1_rate"] = counts["stage1"] / total if total else None
+        counts["stage2_rate"] = counts["stage2"] / total if total else None
+        return counts
+
+    def reset_counts(self):
+        with self._lock:
+            self._counts = {"stage1": 0, "stage2": 0}
@@ -0,0 +1,131 @@
+import threading
+import time
+
+from core.session_store import SCAN_WORKERS, get_session_store
+
+# Seconds a folder without both JSON files is retried before it is taken for a non-session
+PENDING_SECONDS = 10.0
+
+class SessionIndex:
+    """
+    A process-wide, incrementally refreshed view of a session store.
+
+    Every Streamlit rerun used to parse every session again. The index keeps
+    what it has read and, on each `snapshot()`, first asks the store for its
+    cheap change token (`store.version()`: the folder's mtime, or the
+    database's change counter). Only when the token moved does it list the
+    session ids and read the new ones; removed ids are dropped.
+
+    Sessions are write-once, so a session that was read is never read again.
+    Folders that did not hold both JSON files yet are retried on every
+    snapshot for `PENDING_SECONDS`, and sessions that failed to parse are
+    retried whenever the token moves. Their errors are reported again on every
+    snapshot, as a full scan would.
+
+    The returned list and dict are shared by every session thread and
+    replaced, never modified, when the store changes; callers must not modify
+    them either.
+
+    Parameters
+    ----------
+    store : FolderSessionStore or SQLiteSessionStore
+    workers : int
+        Threads reading session folders on a cold scan.
+
+    """
+
+    def __init__(self, store, workers=SCAN_WORKERS):
+        self.store = store
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded = False
+        self._sessions = []
+        self._by_id = {}
+        self._pending = {}
+        self._failed = {}
+
+    def snapshot(self, errors=None):
+        """
+        Brings the index up to date and returns it.
+
+        Parameters
+        ----------
+        errors : list, optional
+            Receives `(session_id, exception)` pairs for sessions that could
+            not be read; without it the failures are printed.
+
+        Returns
+        -------
+        sessions : list of dict
+            Newest first, like `load_prediction_sessions()`.
+        by_id : dict
+            The same session dicts keyed on their id.
+
+        """
+        with self._lock:
+            version = self.store.version()
+            if not self._loaded or version is None or version != self._version or self._pending:
+                self._refresh(version)
+            sessions, by_id, failed = self._sessions, self._by_id, list(self._failed.items())
+
+        for session_id, e in failed:
+            if errors is None:
+                print(f"⚠️ Error loading session '{session_id}': {e}")
+            else:
+                errors.append((session_id, e))
+        return sessions, by_id
+
+    def _refresh(self, version):
+        ids = self.store.session_ids()
+        if self._version != version:
+            # Retry sessions that failed to parse, in case they were rewritten
+            self._failed.clear()
+        new = [session_id for session_id in ids if session_id not in self._by_id and session_id not in self._failed]
+        current = set(ids)
+        removed = [session_id for session_id in self._by_id if session_id not in current]
+
+        failures = []
+        loaded = self.store.load(errors=failures, ids=new, workers=self.workers) if new else []
+        self._failed.update(failures)
+        now = time.monotonic()
+        read = {session["timestamp"] for session in loaded}
+        self._pending = {
+            session_id: self._pending.get(session_id, now) for session_id in new
+            if session_id not in read and session_id not in self._failed
+            and now - self._pending.get(session_id, now) < PENDING_SECONDS
+        }
+        self._failed = {session_id: e for session_id, e in self._failed.items() if session_id in current}
+
+        if loaded or removed or not self._loaded:
+            by_id = {session_id: session for session_id, session in self._by_id.items() if session_id in current}
+            by_id.update((session["timestamp"], session) for session in loaded)
+            self._by_id = by_id
+            # `ids` comes newest first in the store's own order (time, then numeric suffix)
+            self._sessions = [by_id[session_id] for session_id in ids if session_id in by_id]
+        self._version = version
+        self._loaded = True
+
+    def invalidate(self):
+        """
+        Forgets everything; the next snapshot reads the whole store again.
+        """
+        with self._lock:
+            self._version = None
+            self._loaded = False
+            self._sessions, self._by_id = [], {}
+            self._pending.clear()
+            self._failed.clear()
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_session_index():
+    """
+    Returns the index of the process-wide session store.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SessionIndex(get_session_store())
+        return _index
@@ -0,0 +1,463 @@
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Where sessions are stored; tests and load runs point it at a temporary folder
+PREDICTION_FOLDER = os.environ.get("MOBILE_PRICE_PREDICTIONS_DIR", "Predictions")
+# "sqlite" (default) or "folder", the original one-folder-per-session layout
+SESSION_STORE = os.environ.get("MOBILE_PRICE_SESSION_STORE", "sqlite")
+SESSION_DB = os.environ.get("MOBILE_PRICE_SESSION_DB", os.path.join(PREDICTION_FOLDER, "sessions.db"))
+
+SESSION_ID_FORMAT = "%Y-%m-%d_%H-%M-%S"
+# Input features stored in their own indexed columns, for filtering without parsing JSON
+KEY_SPECS = ("ram", "battery_power", "px_height", "px_width", "int_memory")
+BATCH_SIZE = 500
+# Threads reading session folders on a cold scan
+SCAN_WORKERS = int(os.environ.get("MOBILE_PRICE_SCAN_WORKERS", "8"))
+# A folder modified this recently may still change within the same mtime tick
+RACY_MTIME_NS = 2 * 10**9
+
+def new_session_id(now=None):
+    return (now or datetime.now()).strftime(SESSION_ID_FORMAT)
+
+def session_created_at(session_id, fallback=None):
+    """
+    The creation time encoded in a session id (`2025-01-01_12-00-00[_n]`), as ISO text.
+    """
+    try:
+        return datetime.strptime(session_id[:19], SESSION_ID_FORMAT).isoformat()
+    except ValueError:
+        return fallback or datetime.now().isoformat()
+
+def session_sort_key(session_id):
+    """
+    Orders session ids by time, then by numeric suffix (`..._9` before
+    `..._10`); sort with `reverse=True` for newest first.
+    """
+    timestamp, suffix = session_id[:19], session_id[20:]
+    return timestamp, int(suffix) if suffix.isdigit() else -1, session_id
+
+class _SessionIds:
+    """
+    Hands out `timestamp`, `timestamp_1`, `timestamp_2`, ... for saves within
+    the same second, continuing from the last suffix this process used
+    instead of probing from 0 again. Callers still retry on a collision,
+    which only happens when another process saves in the same second.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timestamp = None
+        self._suffix = -1
+
+    def next(self):
+        timestamp = new_session_id()
+        with self._lock:
+            if timestamp != self._timestamp:
+                self._timestamp, self._suffix = timestamp, -1
+            self._suffix += 1
+            suffix = self._suffix
+        return f"{timestamp}_{suffix}" if suffix else timestamp
+
+def _collect(errors, session_id, e, message):
+    if errors is None:
+        print(f"{message} '{session_id}': {e}")
+    else:
+        errors.append((session_id, e))
+
+class FolderSessionStore:
+    """
+    One folder per session, `<folder>/<session id>/input.json` and
+    `prediction.json`: the original layout, kept for compatibility.
+
+    Every load lists the folder and opens two files per session.
+    """
+
+    backend = "folder"
+
+    def __init__(self, folder=PREDICTION_FOLDER):
+        self.folder = folder
+        self._ids = _SessionIds()
+
+    def save(self, input_data, prediction_data):
+        """
+        Writes one session and returns its folder.
+        """
+        Path(self.folder).mkdir(parents=True, exist_ok=True)
+        # Saves within the same second get a suffix
+        while True:
+            folder_path = Path(self.folder) / self._ids.next()
+            try:
+                folder_path.mkdir()
+                break
+            except FileExistsError:
+                continue
+
+        with (folder_path / "input.json").open("w") as f:
+            json.dump(input_data, f, indent=4)
+        with (folder_path / "prediction.json").open("w") as f:
+            json.dump(prediction_data, f, indent=4)
+        return str(folder_path)
+
+    def version(self):
+        """
+        A token that changes whenever a session folder is added or removed: the
+        folder's mtime. None while the mtime is too recent to be trusted.
+        """
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return -1
+        return None if time.time_ns() - mtime < RACY_MTIME_NS else mtime
+
+    def session_ids(self):
+        if not os.path.exists(self.folder):
+            return []
+        return sorted((entry.name for entry in os.scandir(self.folder) if entry.is_dir()),
+                      key=session_sort_key, reverse=True)
+
+    def _read(self, session_id):
+        folder_path = os.path.join(self.folder, session_id)
+        try:
+            with open(os.path.join(folder_path, "input.json"), "r", encoding="utf-8") as f:
+                input_data = json.load(f)
+            with open(os.path.join(folder_path, "prediction.json"), "r", encoding="utf-8") as f:
+                prediction_data = json.load(f)
+        except FileNotFoundError:
+            # Not a session, or one still being written
+            return None
+        return {
+            "timestamp": session_id,
+            "input": input_data,
+            "prediction": prediction_data
+        }
+
+    def load(self, errors=None, limit=None, ids=None, workers=1):
+        """
+        Reads the sessions `ids` (default: all, newest first); folders without
+        both JSON files are skipped. With `workers` > 1 the folders are read by
+        a thread pool, which mostly pays off on a cold disk cache.
+        """
+        ids = self.session_ids() if ids is None else list(ids)
+
+        def read(session_id):
+            try:
+                return self._read(session_id), None
+            except Exception as e:
+                return None, e
+
+        if workers > 1 and limit is None and len(ids) > 1:
+            # One task per slice: a future per session costs more than reading it from a warm cache
+            size = -(-len(ids) // workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="session-scan") as pool:
+                chunks = pool.map(lambda start: [read(session_id) for session_id in ids[start:start + size]],
+                                  range(0, len(ids), size))
+                results = [result for chunk in chunks for result in chunk]
+        else:
+            results = (read(session_id) for session_id in ids)
+
+        sessions = []
+        for session_id, (session, error) in zip(ids, results):
+            if error is not None:
+                _collect(errors, session_id, error, "⚠️ Error loading session")
+            elif session is not None:
+                sessions.append(session)
+                if limit is not None and len(sessions) >= limit:
+                    break
+        return sessions
+
+    def delete(self, session_ids, errors=None):
+        deleted = 0
+        for session_id in session_ids:
+            try:
+                folder_path = os.path.join(self.folder, session_id)
+                if os.path.exists(folder_path):
+                    shutil.rmtree(folder_path)
+                    deleted += 1
+            except Exception as e:
+                _collect(errors, session_id, e, "❌ Failed to delete")
+        return deleted
+
+    def count(self):
+        return len(self.session_ids())
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    predicted_label INTEGER,
+    predicted_class TEXT,
+    {", ".join(f"{spec} REAL" for spec in KEY_SPECS)},
+    input_json TEXT NOT NULL,
+    prediction_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_predicted_label ON sessions (predicted_label);
+{"".join(f"CREATE INDEX IF NOT EXISTS idx_sessions_{spec} ON sessions ({spec});" for spec in KEY_SPECS)}
+-- Bumped by every insert and delete, so readers can tell the table changed without scanning it
+CREATE TABLE IF NOT EXISTS sessions_version (id INTEGER PRIMARY KEY CHECK (id = 0), version INTEGER NOT NULL);
+INSERT OR IGNORE INTO sessions_version VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS sessions_inserted AFTER INSERT ON sessions
+    BEGIN UPDATE sessions_version SET version = version + 1; END;
+CREATE TRIGGER IF NOT EXISTS sessions_deleted AFTER DELETE ON sessions
+    BEGIN UPDATE sessions_version SET version = version + 1; END;
+"""
+
+# Ids of the same second share their first 19 characters, so a longer id has a larger suffix
+_NEWEST_FIRST = " ORDER BY created_at DESC, length(session_id) DESC, session_id DESC"
+_COLUMNS = ("session_id", "created_at", "predicted_label", "predicted_class") + KEY_SPECS + ("input_json", "prediction_json")
+_INSERT = f"INSERT INTO sessions ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+def _row(session_id, created_at, input_data, prediction_data):
+    specs = []
+    for spec in KEY_SPECS:
+        try:
+            specs.append(float(input_data[spec]))
+        except (KeyError, TypeError, ValueError):
+            specs.append(None)
+    return (session_id, created_at, prediction_data.get("predicted_label"), prediction_data.get("predicted_class"),
+            *specs, json.dumps(input_data), json.dumps(prediction_data))
+
+class SQLiteSessionStore:
+    """
+    Sessions in one SQLite database in WAL mode.
+
+    A scan is a single indexed query instead of two file opens per session.
+    Alongside the JSON of each session, the timestamp, predicted class and
+    `KEY_SPECS` are stored in indexed columns. Session ids keep the folder
+    format, so sessions migrated from `Predictions/` keep theirs.
+
+    Connections come from a small pool and are shared by the Streamlit session
+    threads; WAL lets reads run while another thread or process writes, and
+    writers wait up to `timeout` seconds for each other.
+
+    Parameters
+    ----------
+    path : str
+    timeout : float
+
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path=SESSION_DB, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.SimpleQueue()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._ids = _SessionIds()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def save(self, input_data, prediction_data):
+        """
+        Inserts one session and returns its id.
+        """
+        created_at = datetime.now().isoformat(timespec="microseconds")
+        with self._connection() as conn:
+            while True:
+                session_id = self._ids.next()
+                try:
+                    with conn:
+                        conn.execute(_INSERT, _row(session_id, created_at, input_data, prediction_data))
+                    return session_id
+                except sqlite3.IntegrityError:
+                    continue
+
+    def save_many(self, sessions, batch_size=BATCH_SIZE):
+        """
+        Inserts `(session_id, input_data, prediction_data)` tuples in batches of
+        `batch_size` rows per transaction; ids that already exist are skipped.
+
+        Returns
+        -------
+        int
+            Sessions inserted.
+
+        """
+        inserted = 0
+        insert = _INSERT.replace("INSERT INTO", "INSERT OR IGNORE INTO")
+        with self._connection() as conn:
+            batch = []
+            for session_id, input_data, prediction_data in sessions:
+                batch.append(_row(session_id, session_created_at(session_id), input_data, prediction_data))
+                if len(batch) >= batch_size:
+                    with conn:
+                        inserted += conn.executemany(insert, batch).rowcount
+                    batch = []
+            if batch:
+                with conn:
+                    inserted += conn.executemany(insert, batch).rowcount
+        return inserted
+
+    def version(self):
+        """
+        A token that changes whenever sessions are added or removed: a counter
+        the table's triggers bump on every insert and delete.
+        """
+        with self._connection() as conn:
+            return conn.execute("SELECT version FROM sessions_version").fetchone()[0]
+
+    def session_ids(self):
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute("SELECT session_id FROM sessions" + _NEWEST_FIRST)]
+
+    def load(self, errors=None, limit=None, ids=None, workers=1):
+        """
+        Reads the sessions `ids` (default: all, newest first). `workers` is
+        accepted for symmetry with the folder store; one query reads them all.
+        """
+        columns = "SELECT session_id, input_json, prediction_json, created_at FROM sessions"
+        with self._connection() as conn:
+            if ids is not None:
+                ids = list(ids)
+                rows = []
+                for start in range(0, len(ids), BATCH_SIZE):
+                    chunk = ids[start:start + BATCH_SIZE]
+                    rows.extend(conn.execute(f"{columns} WHERE session_id IN ({', '.join('?' * len(chunk))})", chunk))
+                # Same order as _NEWEST_FIRST
+                rows.sort(key=lambda row: (row[3], len(row[0]), row[0]), reverse=True)
+                rows = rows[:limit] if limit is not None else rows
+            elif limit is None:
+                rows = conn.execute(columns + _NEWEST_FIRST).fetchall()
+            else:
+                rows = conn.execute(columns + _NEWEST_FIRST + " LIMIT ?", (int(limit),)).fetchall()
+
+        sessions = []
+        for session_id, input_json, prediction_json, _ in rows:
+            try:
+                sessions.append({
+                    "timestamp": session_id,
+                    "input": json.loads(input_json),
+                    "prediction": json.loads(prediction_json)
+                })
+            except Exception as e:
+                _collect(errors, session_id, e, "⚠️ Error loading session")
+        return sessions
+
+    def delete(self, session_ids, errors=None):
+        session_ids = list(session_ids)
+        try:
+            with self._connection() as conn, conn:
+                return conn.executemany("DELETE FROM sessions WHERE session_id = ?",
+                                        [(session_id,) for session_id in session_ids]).rowcount
+        except sqlite3.Error as e:
+            for session_id in session_ids:
+                _collect(errors, session_id, e, "❌ Failed to delete")
+            return 0
+
+    def count(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+def migrate_folder_sessions(folder=PREDICTION_FOLDER, store=None, batch_size=BATCH_SIZE, remove=False, errors=None):
+    """
+    Copies every `<folder>/<session id>/` session into a SQLite store, keeping its id.
+
+    Running it again only adds the sessions that are not in the database yet.
+
+    Parameters
+    ----------
+    folder : str
+    store : SQLiteSessionStore, optional
+        Defaults to one at `SESSION_DB`.
+    batch_size : int
+        Sessions inserted per transaction.
+    remove : bool
+        Delete each session folder once the database holds the same session.
+        A folder whose id is already taken by a different row is kept.
+    errors : list, optional
+        Receives `(session_id, exception)` pairs for sessions that could not be
+        read, and for folders kept because their id holds a different session.
+
+    Returns
+    -------
+    dict
+        `found`, `migrated` (new rows), `failed` and `skipped` (id taken by a
+        different session) counts.
+
+    """
+    source = FolderSessionStore(folder)
+    store = store or SQLiteSessionStore()
+    failures = []
+    sessions = source.load(errors=failures, workers=SCAN_WORKERS)
+    found = len(sessions) + len(failures)
+    migrated = store.save_many(((s["timestamp"], s["input"], s["prediction"]) for s in sessions), batch_size)
+    skipped = 0
+    if remove:
+        # INSERT OR IGNORE keeps an existing row, so only delete folders the database matches
+        stored = {s["timestamp"]: (s["input"], s["prediction"])
+                  for s in store.load(errors=failures, ids=[s["timestamp"] for s in sessions])}
+        copied = []
+        for s in sessions:
+            if stored.get(s["timestamp"]) == (s["input"], s["prediction"]):
+                copied.append(s["timestamp"])
+            else:
+                skipped += 1
+                failures.append((s["timestamp"], ValueError("a different session with this id is already "
+                                                            "in the database; its folder was kept")))
+        source.delete(copied, errors=failures)
+    for session_id, e in failures:
+        _collect(errors, session_id, e, "⚠️ Not migrated")
+    return {"found": found, "migrated": migrated, "failed": len(failures) - skipped, "skipped": skipped}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store():
+    """
+    Returns the process-wide store selected by `MOBILE_PRICE_SESSION_STORE`.
+
+    The first time the SQLite database is created next to existing
+    `Predictions/` folders, they are migrated into it.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            if SESSION_STORE == "folder":
+                _store = FolderSessionStore(PREDICTION_FOLDER)
+            elif SESSION_STORE == "sqlite":
+                created = not os.path.exists(SESSION_DB)
+                _store = SQLiteSessionStore(SESSION_DB)
+                if created and FolderSessionStore(PREDICTION_FOLDER).session_ids():
+                    result = migrate_folder_sessions(PREDICTION_FOLDER, _store)
+                    print(f"📦 Migrated {result['migrated']} session(s) from {PREDICTION_FOLDER}/ to {SESSION_DB}")
+            else:
+                raise ValueError(f"Unknown session store: {SESSION_STORE!r} (expected 'sqlite' or 'folder')")
+        return _store
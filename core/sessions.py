@@ -0,0 +1,159 @@
+from functools import lru_cache
+from typing import Dict, Any, Union, List, Optional, Tuple
+import numpy as np
+
+from core.metrics import SESSION_SCAN_SECONDS, SESSION_STORE_SESSIONS
+from core.session_index import get_session_index
+from core.session_store import PREDICTION_FOLDER, FolderSessionStore, get_session_store  # noqa: F401
+
+@lru_cache(maxsize=32)
+def _folder_store(folder):
+    return FolderSessionStore(folder)
+
+def _store(folder, store):
+    # An explicit folder keeps meaning the folder layout, as before the stores existed
+    if store is not None:
+        return store
+    return _folder_store(folder) if folder is not None else get_session_store()
+
+def save_prediction_session(
+    input_data: Dict[str, Union[int, float, None]],
+    predicted_label: Union[int, np.integer],
+    probabilities: Union[np.ndarray, List[float]],
+    label_names: List[str],
+    folder: Optional[str] = None,
+    store=None
+) -> str:
+    """
+    Saves one prediction in the session store (`folder` selects the folder
+    layout at that path) and returns the session's folder or database id,
+    or "" if saving failed.
+    """
+    try:
+        # --- Converts all input values to serializable Python types ---
+        safe_input_data = {
+            k: (
+                0 if v is None or (isinstance(v, float) and np.isnan(v)) else
+                float(v) if isinstance(v, (np.floating, float)) else
+                int(v) if isinstance(v, (np.integer, int)) else
+                v
+            )
+            for k, v in input_data.items()
+        }
+
+        if isinstance(probabilities, np.ndarray):
+            probabilities = probabilities.tolist()
+
+        # --- prediction data ---
+        prediction_data = {
+            "predicted_label": int(predicted_label),
+            "predicted_class": label_names[int(predicted_label)],
+            "probabilities": probabilities
+        }
+
+        return _store(folder, store).save(safe_input_data, prediction_data)
+
+    except Exception as e:
+        print(f"❌ Failed to save prediction session: {e}")
+        return ""
+
+def load_session_index(
+    errors: Optional[List[Tuple[str, Exception]]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Returns the sessions of the configured store, newest first, and the same
+    sessions keyed on their id.
+
+    Both come from the process-wide `SessionIndex`, which only reads the
+    sessions added since the last call. They are shared by every session
+    thread, so treat them as read-only.
+    """
+    try:
+        with SESSION_SCAN_SECONDS.time():
+            sessions, by_id = get_session_index().snapshot(errors=errors)
+    except Exception as e:
+        if errors is None:
+            print(f"❌ Failed to load prediction sessions: {e}")
+        else:
+            errors.append(("*", e))
+        return [], {}
+    SESSION_STORE_SESSIONS.set(len(sessions))
+    return sessions, by_id
+
+def load_prediction_sessions(
+    folder: Optional[str] = None,
+    errors: Optional[List[Tuple[str, Exception]]] = None,
+    store=None
+) -> List[Dict[str, Any]]:
+    """
+    Loads every saved prediction session, newest first.
+
+    Parameters
+    ----------
+    folder : str, optional
+        Read the folder layout at this path instead of the configured store.
+    errors : list, optional
+        Receives a `(session_id, exception)` pair for each session that could
+        not be read, so the caller decides how to report it. Without it the
+        failures are printed.
+    store : FolderSessionStore or SQLiteSessionStore, optional
+        Read this store instead of the configured one.
+
+    Returns
+    -------
+    list of dict
+        `{"timestamp": session_id, "input": {...}, "prediction": {...}}` for
+        each complete session. For the configured store this is the shared,
+        read-only list of `load_session_index()`; an explicit `folder` or
+        `store` is read in full.
+
+    """
+    if folder is None and store is None:
+        return load_session_index(errors)[0]
+    try:
+        with SESSION_SCAN_SECONDS.time():
+            sessions = _store(folder, store).load(errors=errors)
+    except Exception as e:
+        if errors is None:
+            print(f"❌ Failed to load prediction sessions: {e}")
+        else:
+            errors.append(("*", e))
+        return []
+    SESSION_STORE_SESSIONS.set(len(sessions))
+    return sessions
+
+def delete_sessions(
+    session_ids: List[str],
+    folder: Optional[str] = None,
+    errors: Optional[List[Tuple[str, Exception]]] = None,
+    store=None
+) -> int:
+    """
+    Deletes the given sessions and returns how many were removed.
+
+    Failures are collected in `errors` like in `load_prediction_sessions()`.
+    """
+    return _store(folder, store).delete(session_ids, errors=errors)
+
+def flatten_sessions(
+    sessions: List[Dict[str, Any]],
+    session_key: str = "session",
+    errors: Optional[List[Tuple[str, Exception]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merges the inputs and prediction of each session into one flat row,
+    with the session id under `session_key`.
+    """
+    rows = []
+    for session in sessions:
+        try:
+            row = session["input"].copy()
+            row.update(session["prediction"])
+            row[session_key] = session["timestamp"]
+            rows.append(row)
+        except Exception as e:
+            if errors is None:
+                print(f"⚠️ Error processing session {session.get('timestamp')}: {e}")
+            else:
+                errors.append((session.get("timestamp"), e))
+    return rows
@@ -0,0 +1,237 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# MOBILE_PRICE_TRACE=1 traces every request; otherwise only where a caller opts in
+TRACING = os.environ.get("MOBILE_PRICE_TRACE", "0") == "1"
+TRACE_PATH = os.environ.get("MOBILE_PRICE_TRACE_FILE", os.path.join("logs", "trace.jsonl"))
+TRACE_MAX_BYTES = int(os.environ.get("MOBILE_PRICE_TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.environ.get("MOBILE_PRICE_TRACE_BACKUPS", "3"))
+
+_current = contextvars.ContextVar("mobile_price_trace", default=None)
+_observer = None
+
+class _NoopSpan:
+    """
+    Returned by `span()` outside a trace: entering and leaving it does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NOOP = _NoopSpan()
+
+class _TimedSpan(_NoopSpan):
+    """
+    Returned by `span()` outside a trace while a span observer is set: only
+    the duration is measured, and handed to the observer.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observer = _observer
+        if observer is not None:
+            observer(self.name, time.perf_counter() - self.start)
+        return False
+
+class Span:
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        trace = self.trace
+        self.span_id = len(trace.spans)
+        self.parent_id = trace.stack[-1] if trace.stack else None
+        self.depth = len(trace.stack)
+        trace.spans.append(None)
+        trace.stack.append(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        trace = self.trace
+        trace.stack.pop()
+        record = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "depth": self.depth,
+            "name": self.name,
+            "start_ms": (self.start - trace.start) * 1000,
+            "duration_ms": (end - self.start) * 1000,
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        trace.spans[self.span_id] = record
+        # The root span is the request itself, not one of its stages
+        observer = _observer
+        if observer is not None and self.depth > 0:
+            observer(self.name, end - self.start)
+        return False
+
+    def set(self, **attrs):
+        """
+        Adds attributes (e.g. a cache hit flag) once they are known.
+        """
+        self.attrs.update(attrs)
+
+class Trace:
+    """
+    The spans recorded for one request, in the order they were opened.
+
+    Each span is a dict with `span_id`, `parent_id`, `depth`, `name`,
+    `start_ms` (from the start of the trace), `duration_ms` and optional
+    `attrs` / `error`.
+    """
+
+    def __init__(self, name):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.created_at = datetime.now().isoformat(timespec="milliseconds")
+        self.start = time.perf_counter()
+        self.spans = []
+        self.stack = []
+
+    def records(self):
+        return [dict(span, trace_id=self.trace_id, trace=self.name, created_at=self.created_at)
+                for span in self.spans if span is not None]
+
+class _RotatingWriter:
+    """
+    Appends JSON lines to `path`, rotating it to `path.1` ... `path.<backups>`
+    once it would grow past `max_bytes`.
+    """
+
+    def __init__(self, path, max_bytes, backups):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, records):
+        data = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_trace_writer():
+    """
+    Returns the process-wide writer of `TRACE_PATH`.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = _RotatingWriter(TRACE_PATH, TRACE_MAX_BYTES, TRACE_BACKUPS)
+        return _writer
+
+class _TraceContext:
+    def __init__(self, name, enabled, write):
+        self.name = name
+        self.enabled = TRACING if enabled is None else enabled
+        self.write = write
+        self.trace = None
+
+    def __enter__(self):
+        if not self.enabled:
+            return None
+        # A nested trace joins the outer one instead of starting another
+        if _current.get() is not None:
+            return _current.get()
+        self.trace = Trace(self.name)
+        self._token = _current.set(self.trace)
+        self._root = Span(self.trace, self.name, {})
+        self._root.__enter__()
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is None:
+            return False
+        self._root.__exit__(exc_type, exc, tb)
+        _current.reset(self._token)
+        if self.write:
+            try:
+                get_trace_writer().write(self.trace.records())
+            except OSError as e:
+                print(f"❌ Failed to write trace: {e}")
+        return False
+
+def start_trace(name, enabled=None, write=True):
+    """
+    Starts recording spans for one request.
+
+    Use as `with start_trace("predict_submit", enabled=...) as trace:`; `trace`
+    is None when tracing is off, so the block runs unchanged. On exit the spans
+    are appended to the rotating JSONL file `TRACE_PATH`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the root span.
+    enabled : bool, optional
+        Defaults to `TRACING` (the `MOBILE_PRICE_TRACE` environment variable).
+    write : bool
+        Set to False to keep the spans in memory only.
+
+    """
+    return _TraceContext(name, enabled, write)
+
+def span(name, **attrs):
+    """
+    Times a stage of the current trace; a shared no-op outside of one, so
+    instrumented code costs one context-variable lookup when tracing is off
+    and no span observer is set.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NOOP if _observer is None else _TimedSpan(name)
+    return Span(trace, name, attrs)
+
+def set_span_observer(observer):
+    """
+    Calls `observer(name, seconds)` whenever a span other than a trace's root
+    ends, inside a trace or not; None removes it. `core.metrics` uses this to
+    export per-stage latency.
+    """
+    global _observer
+    _observer = observer
+
+def tracing_active():
+    """
+    Whether the calling thread is inside a trace.
+    """
+    return _current.get() is not None
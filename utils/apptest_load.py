@@ -0,0 +1,191 @@
+import os
+import tempfile
+import time
+import traceback
+
+import numpy as np
+
+APP_SCRIPT = "main.py"
+
+def _button(at, label):
+    for button in at.button:
+        if button.label.startswith(label):
+            return button
+    raise LookupError(f"No button labelled {label!r}")
+
+def _compare_sessions(at):
+    if not at.multiselect:
+        raise LookupError("The comparison tab has no session picker")
+    picker = at.multiselect[0]
+    picker.set_value(list(picker.options[:2]))
+
+# One simulated user: each step changes a widget, then the whole script reruns
+STEPS = (
+    ("load", None),
+    ("randomize", lambda at: _button(at, "🎲 Randomize").click()),
+    ("predict", lambda at: _button(at, "🔮 Predict").click()),
+    ("compare", _compare_sessions),
+    ("shop_details", lambda at: _button(at, "📋 View Full Details").click()),
+    ("shop_close", lambda at: _button(at, "🔙 Close Details").click()),
+    ("shop_compare", lambda at: _button(at, "📊 Compare with My Phone").click()),
+)
+
+def _simulate_users(user_ids, iterations, timeout, start_at):
+    """
+    Runs in a worker process: drives `user_ids` through `STEPS`, interleaving
+    the users step by step, and returns one record per rerun.
+
+    AppTest swaps Streamlit's global runtime for every run, so one process can
+    only execute one script run at a time; concurrency comes from the processes.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    apps = {user: AppTest.from_file(APP_SCRIPT, default_timeout=timeout) for user in user_ids}
+    time.sleep(max(0.0, start_at - time.time()))
+
+    plan = [STEPS[0]] + list(STEPS[1:]) * iterations
+    records, failed = [], set()
+    for step, action in plan:
+        for user, at in apps.items():
+            if user in failed:
+                continue
+            error = None
+            start = time.perf_counter()
+            try:
+                if action is not None:
+                    action(at)
+                start = time.perf_counter()
+                at.run()
+                if at.exception:
+                    error = at.exception[0].message
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if step == "load":
+                    failed.add(user)
+            records.append({"user": user, "step": step, "ms": (time.perf_counter() - start) * 1000,
+                            "error": error, "finished_at": time.time()})
+    return records
+
+def _percentiles(values):
+    if not len(values):
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    return {"p50": float(np.percentile(values, 50)), "p95": float(np.percentile(values, 95)),
+            "p99": float(np.percentile(values, 99)), "max": float(np.max(values))}
+
+def _saved_sessions(predictions_dir):
+    from core.session_store import SESSION_STORE, FolderSessionStore, SQLiteSessionStore
+
+    if SESSION_STORE == "sqlite":
+        path = os.path.join(predictions_dir, "sessions.db")
+        return SQLiteSessionStore(path).count() if os.path.exists(path) else 0
+    return FolderSessionStore(predictions_dir).count()
+
+def run_load(users=50, processes=None, iterations=1, timeout=60.0, predictions_dir=None, warmup=3.0):
+    """
+    Simulates `users` concurrent sessions of `main.py` with `streamlit.testing.v1.AppTest`.
+
+    Every user loads the app, randomizes and submits a prediction, picks two
+    sessions in the comparison tab and opens, closes and compares a phone in
+    the shop. The users are spread over `processes` worker processes that all
+    start at the same moment; they share one session store in
+    `predictions_dir`, a temporary folder unless one is given.
+
+    Parameters
+    ----------
+    users : int
+    processes : int, optional
+        Defaults to one process per user, at most `2 * os.cpu_count()`.
+    iterations : int
+        Times each user repeats the steps after the first load.
+    timeout : float
+        Seconds a single script run may take before it counts as an error.
+    predictions_dir : str, optional
+    warmup : float
+        Seconds given to the workers to import the app before the common start.
+
+    Returns
+    -------
+    dict
+        Wall time, reruns/sec, per-step latency percentiles (ms) and errors,
+        plus how many sessions were saved for the predictions submitted.
+
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    processes = max(1, min(users, processes or 2 * (os.cpu_count() or 1)))
+    predictions_dir = predictions_dir or tempfile.mkdtemp(prefix="apptest_predictions_")
+    # Read by `core.sessions` and `core.metrics` when the workers import them;
+    # the workers would otherwise race for the metrics port
+    os.environ["MOBILE_PRICE_PREDICTIONS_DIR"] = predictions_dir
+    os.environ["MOBILE_PRICE_SESSION_DB"] = os.path.join(predictions_dir, "sessions.db")
+    os.environ["MOBILE_PRICE_METRICS_PORT"] = "0"
+
+    groups = [list(range(users))[i::processes] for i in range(processes)]
+    start_at = time.time() + warmup
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_simulate_users, group, iterations, timeout, start_at) for group in groups]
+        records = []
+        for future in futures:
+            try:
+                records.extend(future.result())
+            except Exception:
+                records.append({"user": None, "step": "worker", "ms": 0.0,
+                                "error": traceback.format_exc(limit=1), "finished_at": time.time()})
+
+    wall = max(record["finished_at"] for record in records) - start_at
+    steps = {}
+    for step, _ in STEPS:
+        step_records = [record for record in records if record["step"] == step]
+        latencies = [record["ms"] for record in step_records if record["error"] is None]
+        steps[step] = {"reruns": len(step_records), "errors": len(step_records) - len(latencies),
+                       **_percentiles(latencies)}
+
+    errors = [record for record in records if record["error"] is not None]
+    saved = _saved_sessions(predictions_dir)
+    return {
+        "users": users,
+        "processes": processes,
+        "iterations": iterations,
+        "predictions_dir": predictions_dir,
+        "seconds": wall,
+        "reruns": len(records),
+        "reruns_per_sec": len(records) / wall if wall > 0 else None,
+        "errors": len(errors),
+        "error_samples": sorted({record["error"] for record in errors})[:10],
+        "latency_ms": _percentiles([record["ms"] for record in records if record["error"] is None]),
+        "steps": steps,
+        "predictions_submitted": steps["predict"]["reruns"] - steps["predict"]["errors"],
+        "sessions_saved": saved,
+    }
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import shutil
+
+    parser = argparse.ArgumentParser(description="Drive many simulated sessions of main.py with Streamlit's AppTest.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: 2 per CPU)")
+    parser.add_argument("--iterations", type=int, default=1, help="times each user repeats the interactions")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per script run")
+    parser.add_argument("--predictions-dir", default=None, help="shared sessions folder (default: a temporary one)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary sessions folder")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    result = run_load(args.users, args.processes, args.iterations, args.timeout, args.predictions_dir)
+    if args.predictions_dir is None and not args.keep:
+        shutil.rmtree(result["predictions_dir"], ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(result, indent=4))
+    else:
+        print(f"{args.users} users in {result['processes']} processes: {result['reruns']:,} reruns in "
+              f"{result['seconds']:.1f} s ({result['reruns_per_sec']:.1f} reruns/s), {result['errors']} errors")
+        print(f"{'step':14} {'reruns':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for step, stats in result["steps"].items():
+            cells = [f"{stats[key]:9.0f}" if stats[key] is not None else f"{'-':>9}" for key in ("p50", "p95", "p99", "max")]
+            print(f"{step:14} {stats['reruns']:7} {stats['errors']:7} {' '.join(cells)}")
+        print(f"sessions saved: {result['sessions_saved']} for {result['predictions_submitted']} predictions")
+        for error in result["error_samples"]:
+            print(f"❌ {error}")
@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+from collections import deque
+
+import pandas as pd
+
+from core.predictor import predict_price_ranges
+
+def score_catalog(model, scaler, df):
+    """
+    Scores every row of a specification table and appends the prediction columns.
+
+    Parameters
+    ----------
+    model : object
+    scaler : object
+    df : pandas.DataFrame
+        A table shaped like `Clean_Mobile_Data.csv`, containing at least the
+        columns listed in `FEATURE_ORDER`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A copy of `df` with `predicted_label`, `predicted_class` and one
+        `prob_<class>` column per price range category.
+
+    """
+    price_labels, probabilities = predict_price_ranges(model, scaler, df)
+
+    scored = df.copy()
+    scored["predicted_label"] = probabilities.argmax(axis=1)
+    scored["predicted_class"] = price_labels
+    for i in range(probabilities.shape[1]):
+        scored[f"prob_{i}"] = probabilities[:, i].round(6)
+    return scored
+
+_worker_bundle = None
+
+def _init_worker(profile):
+    """
+    Loads the model once per worker process. With a compiled artifact every
+    worker maps the same file, so the node arrays are shared through the page cache.
+    """
+    global _worker_bundle
+    from utils.load_model import get_model_bundle
+    _worker_bundle = get_model_bundle(profile)
+
+def _score_chunk(chunk):
+    return score_catalog(_worker_bundle.engine, None, chunk)
+
+def score_csv(input_path, output_path, chunk_size=50000, workers=None, profile=None, progress=None):
+    """
+    Streams `input_path` in chunks through a process pool and writes the scored
+    rows to `output_path` in input order.
+
+    At most two chunks per worker are read ahead, so memory stays bounded by the
+    chunk size whatever the file size. The output is written next to
+    `output_path` and moved into place once every chunk has been scored.
+
+    Parameters
+    ----------
+    input_path : str
+        A CSV with at least the columns listed in `FEATURE_ORDER`.
+    output_path : str
+    chunk_size : int, optional
+        Rows per chunk.
+    workers : int, optional
+        Worker processes; defaults to `os.cpu_count()`. 0 scores in this process.
+    profile : str, optional
+        Model profile, see `utils.load_model.get_model_bundle`.
+    progress : callable, optional
+        Called as `progress(rows_done, elapsed_seconds)` after every chunk.
+
+    Returns
+    -------
+    dict
+        Rows scored, chunks, elapsed seconds, rows per second and the number
+        of rows per predicted price range.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the input file does not exist.
+    ValueError
+        If a chunk is missing required columns.
+    RuntimeError
+        If scoring fails for other reasons.
+
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    workers = os.cpu_count() if workers is None else workers
+
+    tmp_path = f"{output_path}.tmp"
+    rows = chunks = 0
+    class_counts = {}
+    start = time.perf_counter()
+
+    def write(scored):
+        nonlocal rows, chunks
+        scored.to_csv(out, index=False, header=chunks == 0)
+        rows += len(scored)
+        chunks += 1
+        for label, count in scored["predicted_class"].value_counts().items():
+            class_counts[label] = class_counts.get(label, 0) + int(count)
+        if progress is not None:
+            progress(rows, time.perf_counter() - start)
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            reader = pd.read_csv(input_path, chunksize=chunk_size)
+            if workers == 0:
+                _init_worker(profile)
+                for chunk in reader:
+                    write(_score_chunk(chunk))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(profile,)) as pool:
+                    pending = deque()
+                    for chunk in reader:
+                        pending.append(pool.submit(_score_chunk, chunk))
+                        if len(pending) >= 2 * workers:
+                            write(pending.popleft().result())
+                    while pending:
+                        write(pending.popleft().result())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    elapsed = time.perf_counter() - start
+    return {"rows": rows, "chunks": chunks, "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed else None, "class_counts": class_counts}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a specification CSV offline, chunk by chunk.")
+    parser.add_argument("input", help="CSV with the 20 specification columns")
+    parser.add_argument("output", help="scored CSV (input columns plus predictions)")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--profile", default=None, help="model profile, e.g. full / fast / student")
+    args = parser.parse_args()
+
+    def report(rows, elapsed):
+        print(f"\r{rows:,} rows  {rows / elapsed:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        summary = score_csv(args.input, args.output, args.chunk_size, args.workers, args.profile, report)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"\n❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✅ Scored {summary['rows']:,} rows in {summary['seconds']:.1f} s "
+          f"({summary['rows_per_sec']:,.0f} rows/s) -> {args.output}", file=sys.stderr)
@@ -0,0 +1,336 @@
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.predictor import FEATURE_ORDER, PRICE_MAP, predict_price_range, predict_price_ranges
+
+BENCHMARKS = ("predict", "batch", "load", "session_scan", "session_save", "sqlite_scan", "sqlite_save", "pdf")
+SESSION_COUNTS = (100, 10000, 100000)
+BASELINE_PATH = os.path.join("reports", "benchmarks_baseline.json")
+OUTPUT_PATH = os.path.join("reports", "benchmarks.json")
+
+# Changes smaller than this, in the metric's unit, are timer and scheduler noise and never a regression
+NOISE_FLOORS = {"us": 50.0, "ms": 2.0, "pages/s": 0.5}
+
+def _metric(value, unit, better, noise=None):
+    if noise is None:
+        noise = NOISE_FLOORS.get(unit, 0.0)
+    return {"value": float(value), "unit": unit, "better": better, "noise": float(noise)}
+
+def _latencies_us(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1e6
+
+def _best_of(fn, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _rows():
+    import pandas as pd
+    return pd.read_csv("Clean_Mobile_Data.csv")[FEATURE_ORDER]
+
+def bench_predict(bundle, repeats=2000):
+    """
+    Single-row `predict_price_range` latency, through the served engine and
+    through the pickled model + scaler.
+    """
+    from utils.load_model import load_trained_model, load_scaler
+
+    records = _rows().to_dict("records")
+    calls = [records[i % len(records)] for i in range(repeats)]
+    model, scaler = load_trained_model(), load_scaler()
+
+    results = {}
+    for name, model_, scaler_ in (("engine", bundle.engine, None), ("pickle", model, scaler)):
+        predict_price_range(model_, scaler_, calls[0])
+        n = repeats if name == "engine" else max(repeats // 10, 50)
+        us = _latencies_us(predict_price_range, [(model_, scaler_, row) for row in calls[:n]])
+        # The pickled model is only a reference and takes a tenth of the samples, so allow it more noise
+        results[f"predict_{name}_us_p50"] = _metric(np.percentile(us, 50), "us", "lower",
+                                                    noise=None if name == "engine" else 200)
+        results[f"predict_{name}_us_p99"] = _metric(np.percentile(us, 99), "us", "lower", noise=500)
+    return results
+
+def bench_batch(bundle, rows=100000):
+    """
+    `predict_price_ranges` throughput over `Clean_Mobile_Data.csv`, tiled to `rows` rows.
+    """
+    data = _rows().to_numpy(dtype=float)
+    X = data[np.arange(rows) % len(data)]
+    seconds = _best_of(lambda: predict_price_ranges(bundle.engine, None, X))
+    return {"batch_rows_per_sec": _metric(rows / seconds, "rows/s", "higher")}
+
+def bench_load():
+    """
+    Time to unpickle the model and the scaler, and to map the compiled artifact.
+    """
+    from utils.load_model import load_trained_model, load_scaler, load_compiled_artifact
+
+    results = {
+        "model_load_ms": _metric(_best_of(load_trained_model) * 1000, "ms", "lower"),
+        "scaler_load_ms": _metric(_best_of(load_scaler) * 1000, "ms", "lower"),
+    }
+    try:
+        results["artifact_load_ms"] = _metric(_best_of(load_compiled_artifact) * 1000, "ms", "lower")
+    except FileNotFoundError:
+        pass
+    return results
+
+def synthetic_sessions(start, stop, seed=0):
+    """
+    Yields `(session_id, input_data, prediction_data)` for sessions `start` to
+    `stop - 1`, one second apart from 2025-01-01 so every id is unique.
+    """
+    rng = np.random.default_rng(seed + start)
+    base = datetime(2025, 1, 1)
+    labels = list(PRICE_MAP.values())
+    for i in range(start, stop):
+        probabilities = rng.dirichlet(np.ones(len(labels)))
+        label = int(probabilities.argmax())
+        yield ((base + timedelta(seconds=i)).strftime("%Y-%m-%d_%H-%M-%S"),
+               {feature: int(rng.integers(0, 2000)) for feature in FEATURE_ORDER},
+               {"predicted_label": label, "predicted_class": labels[label], "probabilities": probabilities.tolist()})
+
+def write_synthetic_sessions(folder, start, stop, seed=0):
+    """
+    Writes `synthetic_sessions()` in the folder layout of `save_prediction_session`.
+    """
+    for session_id, input_data, prediction_data in synthetic_sessions(start, stop, seed):
+        path = os.path.join(folder, session_id)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "input.json"), "w", encoding="utf-8") as f:
+            json.dump(input_data, f, indent=4)
+        with open(os.path.join(path, "prediction.json"), "w", encoding="utf-8") as f:
+            json.dump(prediction_data, f, indent=4)
+
+def _session_store(backend, tmp):
+    from core.session_store import FolderSessionStore, SQLiteSessionStore
+
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.path.join(tmp, "sessions.db"))
+    return FolderSessionStore(tmp)
+
+def bench_session_scan(counts=SESSION_COUNTS, folder=None, backend="folder"):
+    """
+    `load_prediction_sessions` time over `counts` synthetic sessions in the
+    `backend` store; the store grows from one count to the next, so each
+    session is written once. Also times a cold `SessionIndex` snapshot
+    (parallel reads) and a rescan of an up-to-date one, as the app does on
+    every rerun.
+    """
+    from core.session_index import SessionIndex
+    from core.sessions import load_prediction_sessions
+
+    tmp = folder or tempfile.mkdtemp(prefix="bench_sessions_")
+    store = _session_store(backend, tmp)
+    prefix = "sqlite_" if backend == "sqlite" else ""
+    results, written = {}, 0
+    try:
+        for count in sorted(counts):
+            if backend == "sqlite":
+                store.save_many(synthetic_sessions(written, count))
+            else:
+                write_synthetic_sessions(tmp, written, count)
+            written = count
+            repeats = 3 if count <= 10000 else 1
+            seconds = _best_of(lambda: load_prediction_sessions(store=store), repeats)
+            results[f"{prefix}session_scan_{count}_ms"] = _metric(seconds * 1000, "ms", "lower")
+            seconds = _best_of(lambda: SessionIndex(store).snapshot(), repeats)
+            results[f"{prefix}session_index_cold_{count}_ms"] = _metric(seconds * 1000, "ms", "lower")
+            index = SessionIndex(store)
+            index.snapshot()
+            seconds = _best_of(index.snapshot, 20)
+            results[f"{prefix}session_rescan_{count}_ms"] = _metric(seconds * 1000, "ms", "lower")
+    finally:
+        if backend == "sqlite":
+            store.close()
+        if folder is None:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+def bench_session_save(repeats=200, backend="folder"):
+    """
+    `save_prediction_session` write latency into a temporary `backend` store.
+    """
+    from core.sessions import save_prediction_session
+
+    records = _rows().to_dict("records")
+    labels = list(PRICE_MAP.values())
+    probabilities = np.array([0.1, 0.2, 0.3, 0.4])
+    tmp = tempfile.mkdtemp(prefix="bench_save_")
+    store = _session_store(backend, tmp)
+    prefix = "sqlite_" if backend == "sqlite" else ""
+    try:
+        us = _latencies_us(lambda *args: save_prediction_session(*args, store=store),
+                           [(records[i % len(records)], 3, probabilities, labels) for i in range(repeats)])
+    finally:
+        if backend == "sqlite":
+            store.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        # Creating a folder and two files swings by hundreds of microseconds from run to run
+        f"{prefix}session_save_us_p50": _metric(np.percentile(us, 50), "us", "lower",
+                                                noise=500 if backend == "folder" else None),
+        f"{prefix}session_save_us_p99": _metric(np.percentile(us, 99), "us", "lower", noise=1000),
+    }
+
+def bench_pdf(pages=20):
+    """
+    `generate_combined_pdf` throughput, one page per session. The cost of a
+    one-page report is subtracted, so the document's fixed cost (and the
+    first FPDF / Matplotlib imports) does not depend on `pages`.
+    """
+    from core.reports import generate_combined_pdf
+    from core.sessions import load_prediction_sessions
+
+    pages = max(pages, 2)
+    tmp = tempfile.mkdtemp(prefix="bench_pdf_")
+    cwd = os.getcwd()
+    try:
+        write_synthetic_sessions(os.path.join(tmp, "sessions"), 0, pages)
+        sessions = load_prediction_sessions(os.path.join(tmp, "sessions"))
+        # The report is written under ./download, so run from the temporary folder
+        os.chdir(tmp)
+        generate_combined_pdf(sessions[:1], filename="warmup")
+        single = _best_of(lambda: generate_combined_pdf(sessions[:1], filename="single"))
+        start = time.perf_counter()
+        path = generate_combined_pdf(sessions, filename="benchmark")
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+    if not path:
+        raise RuntimeError("Combined PDF generation failed")
+    return {"pdf_pages_per_sec": _metric((pages - 1) / max(seconds - single, 1e-9), "pages/s", "higher")}
+
+def run_benchmarks(names=BENCHMARKS, profile=None, session_counts=SESSION_COUNTS, quick=False, progress=print):
+    """
+    Runs the selected benchmarks and returns every metric with its unit and
+    whether lower or higher is better, plus the environment they ran in.
+    """
+    from utils.load_model import get_model_bundle
+
+    bundle = get_model_bundle(profile)
+    steps = {
+        "predict": lambda: bench_predict(bundle, repeats=300 if quick else 2000),
+        "batch": lambda: bench_batch(bundle, rows=10000 if quick else 100000),
+        "load": bench_load,
+        "session_scan": lambda: bench_session_scan(session_counts),
+        "session_save": lambda: bench_session_save(repeats=50 if quick else 200),
+        "sqlite_scan": lambda: bench_session_scan(session_counts, backend="sqlite"),
+        "sqlite_save": lambda: bench_session_save(repeats=50 if quick else 200, backend="sqlite"),
+        "pdf": lambda: bench_pdf(pages=5 if quick else 20),
+    }
+
+    metrics = {}
+    for name in names:
+        start = time.perf_counter()
+        metrics.update(steps[name]())
+        progress(f"✅ {name} ({time.perf_counter() - start:.1f} s)")
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "model_name": bundle.name,
+        "model_version": bundle.version,
+        "quick": quick,
+        "metrics": metrics,
+    }
+
+def compare(current, baseline, tolerance=0.2):
+    """
+    Compares each metric present in both runs.
+
+    Parameters
+    ----------
+    current, baseline : dict
+        Results of `run_benchmarks()`.
+    tolerance : float
+        Relative change in the worse direction tolerated before a metric
+        counts as a regression (0.2 = 20%). The change must also exceed the
+        metric's `noise` floor in its own unit, so a 0.3 -> 0.4 ms load time
+        is not flagged.
+
+    Returns
+    -------
+    list of dict
+        `metric`, `baseline`, `current`, `change` (relative, signed) and `regression`.
+
+    """
+    rows = []
+    for name, metric in current["metrics"].items():
+        before = baseline.get("metrics", {}).get(name)
+        if before is None or not before["value"]:
+            continue
+        change = metric["value"] / before["value"] - 1
+        worse = change if metric["better"] == "lower" else -change
+        noisy = abs(metric["value"] - before["value"]) <= metric.get("noise", 0.0)
+        rows.append({"metric": name, "baseline": before["value"], "current": metric["value"],
+                     "unit": metric["unit"], "change": change, "regression": worse > tolerance and not noisy})
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import warnings
+
+    parser = argparse.ArgumentParser(description="Benchmark the prediction, loading, session and report hot paths.")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--profile", default=None, help="model profile, e.g. full / fast / student")
+    parser.add_argument("--session-counts", type=int, nargs="+", default=list(SESSION_COUNTS))
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and at most 1,000 sessions")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on any regression")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    counts = args.session_counts
+    if args.quick:
+        counts = [count for count in counts if count <= 1000] or [100]
+    results = run_benchmarks(args.benchmarks, args.profile, counts, args.quick)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"📄 Results written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.tolerance)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\nCompared with {args.baseline} ({baseline.get('created_at')}):")
+        for row in rows:
+            mark = "❌" if row["regression"] else "  "
+            print(f"{mark} {row['metric']:28} {row['baseline']:>12,.1f} -> {row['current']:>12,.1f} {row['unit']:8} "
+                  f"({row['change']:+.1%})")
+    else:
+        for name, metric in results["metrics"].items():
+            print(f"   {name:28} {metric['value']:>12,.1f} {metric['unit']}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"📌 Saved as baseline: {args.baseline}")
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from core.predictor import CascadeModel
+
+def top_feature_indices(model, k=5):
+    """
+    Returns the positions of the `k` most important features of a fitted model.
+    """
+    return [int(i) for i in np.argsort(model.feature_importances_)[::-1][:k]]
+
+def evaluate_threshold(stage1, stage2, threshold, X, y, holdout, reference_labels):
+    """
+    Returns accuracy, agreement with the full model, per-stage hit rates and the
+    mean single-row latency of a cascade at one confidence threshold.
+    """
+    cascade = CascadeModel(stage1, stage2, threshold)
+    labels = cascade.predict(X)
+    hits = cascade.hit_rates()
+
+    rows = X[holdout]
+    cascade.predict_proba(rows[:1])
+    start = time.perf_counter()
+    for row in rows:
+        cascade.predict_proba(row[np.newaxis, :])
+    single_row_us = (time.perf_counter() - start) / len(rows) * 1e6
+
+    return {
+        "threshold": threshold,
+        "stage1_rate": hits["stage1_rate"],
+        "stage2_rate": hits["stage2_rate"],
+        "holdout_accuracy": float((labels[holdout] == y[holdout]).mean()),
+        "agreement": float((labels == reference_labels).mean()),
+        "single_row_us_mean": single_row_us,
+    }
+
+def _write_markdown(path, top_features, full_row, rows, selected):
+    lines = [
+        "# Two-stage cascade",
+        "",
+        f"Stage 1 is a single decision tree on {', '.join(f'`{f}`' for f in top_features)}.",
+        "Rows whose stage-1 confidence is below the threshold fall through to the full model.",
+        "Hit rates and agreement are over every row of `Clean_Mobile_Data.csv`; accuracy and",
+        "latency over the notebook's 20% holdout split.",
+        "",
+        "| Threshold | Stage 1 hit rate | Stage 2 hit rate | Holdout accuracy | Agreement | Single row (µs) |",
+        "|---|---|---|---|---|---|",
+        f"| full model only | – | 100.00% | {full_row['holdout_accuracy']:.2%} | 100.00% | {full_row['single_row_us_mean']:.0f} |",
+    ]
+    for row in rows:
+        marker = " **(default)**" if row["threshold"] == selected else ""
+        lines.append(
+            f"| {row['threshold']}{marker} | {row['stage1_rate']:.2%} | {row['stage2_rate']:.2%} "
+            f"| {row['holdout_accuracy']:.2%} | {row['agreement']:.2%} | {row['single_row_us_mean']:.0f} |"
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+
+    from utils.forest_engine import compile_forest, save_compiled_forest
+    from utils.model_registry import sha256_file
+    from utils.load_model import load_trained_model, load_scaler, MODEL_PATH, SCALER_PATH, CASCADE_ARTIFACT_PATH
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Train the stage-1 model of the cascade and report hit rates.")
+    parser.add_argument("--top-k", type=int, default=5, help="number of top-importance features for stage 1")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--min-samples-leaf", type=int, default=10)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.9, 0.95, 0.98, 1.0])
+    parser.add_argument("--min-agreement", type=float, default=0.99,
+                        help="agreement with the full model required for the default threshold")
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--output", default=CASCADE_ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    df = pd.read_csv("Clean_Mobile_Data.csv")
+    X = df[FEATURE_ORDER].to_numpy(dtype=np.float64)
+    y = df["price_range"].to_numpy()
+    train, holdout = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+
+    model = load_trained_model()
+    full = compile_forest(model, load_scaler())
+    reference_labels = full.predict(X)
+
+    # Stage 1 imitates the full model, so a confident stage-1 answer is the answer the full model would give
+    top = top_feature_indices(model, args.top_k)
+    tree = DecisionTreeClassifier(max_depth=args.depth, min_samples_leaf=args.min_samples_leaf, random_state=42)
+    tree.fit(X[train][:, top], reference_labels[train])
+    stage1 = compile_forest(tree, feature_indices=top)
+
+    full_row = evaluate_threshold(full, full, 0.0, X, y, holdout, reference_labels)
+    rows = [evaluate_threshold(stage1, full, t, X, y, holdout, reference_labels) for t in args.thresholds]
+    for row in rows:
+        print(f"threshold {row['threshold']:<5} stage 1 {row['stage1_rate']:.2%}  "
+              f"holdout {row['holdout_accuracy']:.2%}  agreement {row['agreement']:.2%}  "
+              f"{row['single_row_us_mean']:.0f} µs/row")
+
+    eligible = [row for row in rows if row["agreement"] >= args.min_agreement] or [rows[-1]]
+    selected = max(eligible, key=lambda row: row["stage1_rate"])["threshold"]
+
+    top_features = [FEATURE_ORDER[i] for i in top]
+    os.makedirs(args.report_dir, exist_ok=True)
+    with open(os.path.join(args.report_dir, "cascade.json"), "w", encoding="utf-8") as f:
+        json.dump({"top_features": top_features, "default_threshold": selected,
+                   "full_model": full_row, "thresholds": rows}, f, indent=4)
+    _write_markdown(os.path.join(args.report_dir, "cascade.md"), top_features, full_row, rows, selected)
+
+    save_compiled_forest(stage1, args.output, feature_names=FEATURE_ORDER, top_features=top_features,
+                         threshold=selected, model_sha256=sha256_file(MODEL_PATH), scaler_sha256=sha256_file(SCALER_PATH))
+    print(f"Stage 1 on {top_features}, default threshold {selected} -> {args.output}")
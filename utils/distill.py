@@ -0,0 +1,165 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from utils.forest_engine import compile_forest, compile_linear
+
+def synthetic_samples(X, n_samples, seed=42):
+    """
+    Draws synthetic specification rows around the real ones.
+
+    Each synthetic row starts as a random real row and takes every column from
+    another random real row with probability 1/2, so the samples cover feature
+    combinations the catalog does not contain while every value stays one the
+    column actually takes (binary flags stay binary, counts stay integral).
+    """
+    rng = np.random.default_rng(seed)
+    n_rows, n_features = X.shape
+    samples = X[rng.integers(n_rows, size=n_samples)].copy()
+    donors = X[rng.integers(n_rows, size=(n_samples, n_features)), np.arange(n_features)]
+    swap = rng.random((n_samples, n_features)) < 0.5
+    samples[swap] = donors[swap]
+    return samples
+
+def fit_tree_student(X, soft_targets, max_depth=8, min_samples_leaf=5):
+    """
+    Fits one shallow regression tree to the teacher's class probabilities and
+    compiles it; its leaves hold averaged teacher probabilities.
+    """
+    from sklearn.tree import DecisionTreeRegressor
+
+    tree = DecisionTreeRegressor(max_depth=max_depth, min_samples_leaf=min_samples_leaf, random_state=42)
+    tree.fit(X, soft_targets)
+    return compile_forest(tree)
+
+def fit_linear_student(X, soft_targets, scaler, C=10.0):
+    """
+    Fits a multinomial logistic model to the teacher's class probabilities.
+
+    `LogisticRegression` only takes hard labels, so every row is repeated once
+    per class with that class as label and its teacher probability as sample
+    weight, which makes the weighted log-loss the cross-entropy to the soft targets.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    n_rows, n_classes = soft_targets.shape
+    X_scaled = scaler.transform(X) if scaler is not None else X
+    model = LogisticRegression(C=C, max_iter=2000)
+    model.fit(np.repeat(X_scaled, n_classes, axis=0), np.tile(np.arange(n_classes), n_rows),
+              sample_weight=soft_targets.ravel())
+    return compile_linear(model, scaler)
+
+def measure_student(engine, X, y, holdout, teacher_labels, teacher_proba, repeats=2000):
+    """
+    Returns holdout accuracy, agreement with the teacher, mean absolute
+    probability error and single-row latency percentiles of one model.
+    """
+    proba = engine.predict_proba(X)
+    labels = engine.classes_[proba.argmax(axis=1)]
+
+    engine.predict_proba(X[:1])
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)][np.newaxis, :]
+        start = time.perf_counter()
+        engine.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "holdout_accuracy": float((labels[holdout] == y[holdout]).mean()),
+        "agreement": float((labels == teacher_labels).mean()),
+        "mean_abs_proba_error": float(np.abs(proba - teacher_proba).mean()),
+        "single_row_us_p50": float(np.percentile(timings, 50) * 1e6),
+        "single_row_us_p99": float(np.percentile(timings, 99) * 1e6),
+        "nbytes": int(engine.nbytes),
+    }
+
+def _write_markdown(path, rows, selected, n_synthetic):
+    teacher_p50 = rows[0]["single_row_us_p50"]
+    lines = [
+        "# Distilled students",
+        "",
+        f"Students are fitted on the teacher's `predict_proba` over the notebook's training split plus {n_synthetic:,}",
+        "synthetic rows. Agreement and probability error are over every row of `Clean_Mobile_Data.csv`;",
+        "accuracy is on the 20% holdout split.",
+        "",
+        "| Model | Holdout accuracy | Agreement | Mean \\|Δp\\| | Single row p50 (µs) | p99 (µs) | Speed-up | Size (KiB) |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        marker = " **(student)**" if row["name"] == selected else ""
+        lines.append(
+            f"| {row['name']}{marker} | {row['holdout_accuracy']:.2%} | {row['agreement']:.2%} "
+            f"| {row['mean_abs_proba_error']:.3f} | {row['single_row_us_p50']:.1f} | {row['single_row_us_p99']:.1f} "
+            f"| {teacher_p50 / row['single_row_us_p50']:.1f}x | {row['nbytes'] / 1024:.1f} |"
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    from utils.forest_engine import save_compiled_forest
+    from utils.model_registry import sha256_file
+    from utils.load_model import load_trained_model, load_scaler, MODEL_PATH, SCALER_PATH, STUDENT_ARTIFACT_PATH
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Distil the model into a compact student and report the trade-off.")
+    parser.add_argument("--synthetic", type=int, default=20000, help="synthetic rows labelled by the teacher")
+    parser.add_argument("--tree-depths", type=int, nargs="+", default=[6, 8, 10])
+    parser.add_argument("--export", choices=["best", "tree", "linear"], default="best",
+                        help="student written to the artifact; 'best' picks the fastest one that meets --min-agreement")
+    parser.add_argument("--min-agreement", type=float, default=0.95,
+                        help="agreement with the teacher required for the exported student")
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--output", default=STUDENT_ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    df = pd.read_csv("Clean_Mobile_Data.csv")
+    X = df[FEATURE_ORDER].to_numpy(dtype=np.float64)
+    y = df["price_range"].to_numpy()
+    train, holdout = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+
+    model, scaler = load_trained_model(), load_scaler()
+    teacher = compile_forest(model, scaler)
+    teacher_proba = teacher.predict_proba(X)
+    teacher_labels = teacher.classes_[teacher_proba.argmax(axis=1)]
+
+    X_fit = np.vstack([X[train], synthetic_samples(X[train], args.synthetic)])
+    soft_targets = teacher.predict_proba(X_fit)
+
+    students = {f"tree depth {depth}": fit_tree_student(X_fit, soft_targets, max_depth=depth)
+                for depth in args.tree_depths}
+    students["multinomial logistic"] = fit_linear_student(X_fit, soft_targets, scaler)
+
+    rows = [{"name": "teacher (compiled)", "kind": "teacher",
+             **measure_student(teacher, X, y, holdout, teacher_labels, teacher_proba)}]
+    for name, engine in students.items():
+        rows.append({"name": name, "kind": "linear" if name.startswith("multinomial") else "tree",
+                     **measure_student(engine, X, y, holdout, teacher_labels, teacher_proba)})
+        print(f"{name:22} holdout {rows[-1]['holdout_accuracy']:.2%}  agreement {rows[-1]['agreement']:.2%}  "
+              f"p50 {rows[-1]['single_row_us_p50']:6.1f} µs")
+
+    candidates = [row for row in rows[1:] if args.export in ("best", row["kind"])]
+    eligible = [row for row in candidates if row["agreement"] >= args.min_agreement]
+    if eligible:
+        selected = min(eligible, key=lambda row: row["single_row_us_p50"])["name"]
+    else:
+        selected = max(candidates, key=lambda row: row["agreement"])["name"]
+
+    os.makedirs(args.report_dir, exist_ok=True)
+    with open(os.path.join(args.report_dir, "distillation.json"), "w", encoding="utf-8") as f:
+        json.dump({"student": selected, "synthetic_rows": args.synthetic, "min_agreement": args.min_agreement,
+                   "models": rows}, f, indent=4)
+    _write_markdown(os.path.join(args.report_dir, "distillation.md"), rows, selected, args.synthetic)
+
+    save_compiled_forest(students[selected], args.output, feature_names=FEATURE_ORDER, student=selected,
+                         model_sha256=sha256_file(MODEL_PATH), scaler_sha256=sha256_file(SCALER_PATH))
+    print(f"Student: {selected} -> {args.output}")
@@ -0,0 +1,675 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.tracing import span
+
+# Rows traversed together; each step's gathers then stay in the CPU cache
+APPLY_CHUNK_ROWS = 64
+# Batches this large go to the native model when one is attached (see `CompiledForest.attach_native`)
+NATIVE_BATCH_ROWS = int(os.environ.get("MOBILE_PRICE_NATIVE_BATCH_ROWS", "64"))
+
+class CompiledForest:
+    """
+    A fitted tree ensemble flattened into contiguous NumPy node arrays.
+
+    Every tree of the ensemble is stored in the same set of arrays and indexed
+    by a global node id. Leaves point to themselves, so a batch of rows walks
+    all trees at once with a fixed number of vectorized steps and no Python
+    recursion. When a scaler is folded in, the split thresholds are expressed
+    in raw specification units and the scaler is no longer needed at inference.
+
+    The object mimics the part of the scikit-learn classifier API used by
+    `core.predictor` (`classes_`, `predict_proba`, `predict`), so it can be
+    passed anywhere a model is expected, with `scaler=None`.
+
+    Attributes
+    ----------
+    feature : numpy.ndarray of intp, shape (n_nodes,)
+        Feature index tested by each node (0 for leaves).
+    threshold : numpy.ndarray of float64, shape (n_nodes,)
+        A row goes left when `x[feature] < threshold`.
+    children : numpy.ndarray of intp, shape (2 * n_nodes,)
+        Interleaved `(left, right)` global ids, so one gather picks the next
+        node: `children[2 * node + go_right]`. Leaves point to themselves.
+    default_left : numpy.ndarray of bool, shape (n_nodes,)
+        Direction taken when the tested feature is NaN.
+    value : numpy.ndarray of float64, shape (n_nodes, n_outputs)
+        Output of each node if it were a leaf: a margin for boosted ensembles,
+        a class-probability vector for averaged forests.
+    roots : numpy.ndarray of intp, shape (n_trees,)
+        Global id of each tree's root node.
+    tree_class : numpy.ndarray of intp, shape (n_trees,)
+        Class whose margin each boosted tree contributes to (-1 for forests).
+    kind : {"boosted", "averaged"}
+        How tree outputs are combined into probabilities.
+    classes_ : numpy.ndarray
+    base_margin : float
+    max_depth : int
+
+    The arrays are used as given when they already have the right dtype, so a
+    forest can be backed by read-only memory-mapped arrays (see
+    `utils.load_model.load_compiled_artifact`).
+
+    NumPy traversal beats the native library on single rows and small batches,
+    but not on large ones, where XGBoost runs a compiled loop. A forest
+    compiled exactly from a model can have that model attached with
+    `attach_native()`; batches of `NATIVE_BATCH_ROWS` rows or more are then
+    scored by it.
+
+    """
+
+    FORMAT = "compiled-forest/1"
+    ARRAYS = ("feature", "threshold", "children", "default_left", "value", "roots", "tree_class")
+
+    def __init__(self, feature, threshold, children, default_left, value,
+                 roots, tree_class, kind, classes, base_margin=0.0, max_depth=None):
+        if kind not in ("boosted", "averaged"):
+            raise ValueError(f"Unknown ensemble kind: {kind}")
+
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.children = np.ascontiguousarray(children, dtype=np.intp)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.tree_class = np.ascontiguousarray(tree_class, dtype=np.intp)
+        self.kind = kind
+        self.classes_ = np.asarray(classes)
+        self.base_margin = float(base_margin)
+        self.max_depth = int(max_depth) if max_depth is not None else self._measure_depth()
+        self._n_features = int(self.feature.max()) + 1 if len(self.feature) else 0
+        self._native_loader = None
+        self._native = None
+        self._native_source = None
+        self.native_rows = NATIVE_BATCH_ROWS
+        self._native_lock = threading.Lock()
+
+        if kind == "boosted":
+            # (n_trees, n_classes) one-hot matrix: summing leaf margins per class is one matmul
+            self._class_matrix = np.zeros((len(self.roots), len(self.classes_)))
+            self._class_matrix[np.arange(len(self.roots)), self.tree_class] = 1.0
+
+    @property
+    def left(self):
+        return self.children[0::2]
+
+    @property
+    def right(self):
+        return self.children[1::2]
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    def metadata(self):
+        """
+        Returns the non-array state needed to rebuild the forest from its arrays.
+        """
+        return {
+            "kind": self.kind,
+            "classes": self.classes_.tolist(),
+            "base_margin": self.base_margin,
+            "max_depth": self.max_depth,
+        }
+
+    @classmethod
+    def from_artifact(cls, arrays, meta):
+        return cls(**arrays, kind=meta["kind"], classes=meta["classes"],
+                   base_margin=meta["base_margin"], max_depth=meta["max_depth"])
+
+    def _measure_depth(self):
+        depth = 0
+        nodes = self.roots
+        while True:
+            internal = nodes[self.left[nodes] != nodes]
+            if internal.size == 0:
+                return depth
+            nodes = np.concatenate([self.left[internal], self.right[internal]])
+            depth += 1
+
+    def apply(self, X):
+        """
+        Returns the leaf reached in every tree, shape (n_samples, n_trees).
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        n_samples, n_features = X.shape
+        if n_features < self._n_features:
+            raise ValueError(f"Expected at least {self._n_features} features, got {n_features}")
+
+        # Every index below is in range by construction, so the gathers skip bounds checks
+        leaves = np.empty((n_samples, self.n_trees), dtype=np.intp)
+        chunk = min(n_samples, APPLY_CHUNK_ROWS)
+        index = np.empty((chunk, self.n_trees), dtype=np.intp)
+        x = np.empty((chunk, self.n_trees))
+        threshold = np.empty((chunk, self.n_trees))
+        go_right = np.empty((chunk, self.n_trees), dtype=bool)
+        for start in range(0, n_samples, chunk):
+            rows = X[start:start + chunk]
+            m = len(rows)
+            if m < chunk:
+                index, x, threshold, go_right = index[:m], x[:m], threshold[:m], go_right[:m]
+            flat = rows.ravel()
+            row_offset = (np.arange(m, dtype=np.intp) * n_features)[:, np.newaxis]
+            has_missing = np.isnan(flat).any()
+            nodes = np.broadcast_to(self.roots, (m, self.n_trees)).copy()
+            for _ in range(self.max_depth):
+                self.feature.take(nodes, out=index, mode="clip")
+                index += row_offset
+                flat.take(index, out=x, mode="clip")
+                self.threshold.take(nodes, out=threshold, mode="clip")
+                np.greater_equal(x, threshold, out=go_right)
+                if has_missing:
+                    missing = np.isnan(x)
+                    go_right[missing] = ~self.default_left[nodes[missing]]
+                nodes *= 2
+                nodes += go_right
+                self.children.take(nodes, out=nodes, mode="clip")
+            leaves[start:start + m] = nodes
+        return leaves
+
+    def attach_native(self, loader, source=None, min_rows=NATIVE_BATCH_ROWS):
+        """
+        Scores batches of `min_rows` rows or more with the model this forest was
+        compiled from.
+
+        Parameters
+        ----------
+        loader : callable
+            Returns `(model, scaler)`; called once, on the first large batch,
+            so the native library is only imported when it is needed.
+        source : hashable, optional
+            Identifies what `loader` loads; attaching the same source again
+            keeps the model already loaded.
+        min_rows : int
+            0 detaches the native model.
+
+        """
+        with self._native_lock:
+            if source is not None and source == self._native_source and min_rows == self.native_rows:
+                return
+            self._native_loader = loader if min_rows else None
+            self._native = None
+            self._native_source = source
+            self.native_rows = min_rows
+
+    def _native_model(self, n_rows):
+        if self._native_loader is None or n_rows < self.native_rows:
+            return None
+        with self._native_lock:
+            if self._native is None and self._native_loader is not None:
+                try:
+                    model, scaler = self._native_loader()
+                    # Scaled by hand: the scaler warns about missing feature names on every array
+                    self._native = (model, *_scaling_params(scaler, self._n_features))
+                except Exception as e:
+                    print(f"⚠️ Native model unavailable, batches stay on the compiled forest: {e}")
+                    self._native_loader = None
+            return self._native
+
+    def predict_proba(self, X):
+        """
+        Returns class probabilities for raw rows, shape (n_samples, n_classes).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        native = self._native_model(len(X) if X.ndim > 1 else 1)
+        if native is not None:
+            model, mean, scale = native
+            with span("forest.native", rows=len(X)):
+                return model.predict_proba((X - mean) / scale)
+        return self.traverse_proba(X)
+
+    def traverse_proba(self, X):
+        """
+        `predict_proba` through the compiled node arrays only.
+        """
+        with span("forest.traverse", trees=self.n_trees, depth=self.max_depth):
+            leaves = self.apply(X)
+
+        with span("forest.aggregate"):
+            if self.kind == "boosted":
+                margins = self.value[leaves, 0] @ self._class_matrix + self.base_margin
+                margins -= margins.max(axis=1, keepdims=True)
+                exp = np.exp(margins)
+                return exp / exp.sum(axis=1, keepdims=True)
+
+            return self.value[leaves].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+class CompiledLinear:
+    """
+    A multinomial linear model (softmax over `X @ coef.T + intercept`) with the
+    scaler folded into its weights, exposing the same API as `CompiledForest`.
+
+    Attributes
+    ----------
+    coef : numpy.ndarray of float64, shape (n_classes, n_features)
+        Weights on raw specification units.
+    intercept : numpy.ndarray of float64, shape (n_classes,)
+    classes_ : numpy.ndarray
+
+    """
+
+    FORMAT = "compiled-linear/1"
+    ARRAYS = ("coef", "intercept")
+
+    def __init__(self, coef, intercept, classes):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+
+    @property
+    def nbytes(self):
+        return self.coef.nbytes + self.intercept.nbytes
+
+    def metadata(self):
+        return {"classes": self.classes_.tolist()}
+
+    @classmethod
+    def from_artifact(cls, arrays, meta):
+        return cls(**arrays, classes=meta["classes"])
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        margins = X @ self.coef.T + self.intercept
+        margins -= margins.max(axis=1, keepdims=True)
+        exp = np.exp(margins)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+def _scaling_params(scaler, n_features):
+    if scaler is None:
+        return np.zeros(n_features), np.ones(n_features)
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+    return mean, scale
+
+def _fold_thresholds(threshold, mean, scale, inclusive, single_precision=True):
+    """
+    Converts thresholds on scaled float32 features into exact raw-unit thresholds.
+
+    The trees were trained on `float32((x - mean) / scale)`, compared with
+    `< threshold` (XGBoost) or `<= threshold` (scikit-learn); LightGBM compares
+    the float64 value (`single_precision=False`) with `<= threshold`. The tests are
+    monotone in the raw value `x`, so there is a smallest float64 `r` from which
+    rows start going right. `r` is located by bisection, which makes the folded
+    test `x < r` agree with the original pipeline on every representable input.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    cast = np.float32 if single_precision else np.float64
+    if inclusive:
+        def goes_left(x):
+            return cast((x - mean) / scale) <= threshold
+    else:
+        threshold32 = threshold.astype(np.float32)
+        def goes_left(x):
+            return np.float32((x - mean) / scale) < threshold32
+
+    estimate = threshold * scale + mean
+    step = np.maximum(np.abs(estimate), 1.0) * 1e-6
+    lo, hi = estimate - step, estimate + step
+    for _ in range(64):
+        bad_lo = ~goes_left(lo)
+        bad_hi = goes_left(hi)
+        if not (bad_lo.any() or bad_hi.any()):
+            break
+        step *= 2
+        lo = np.where(bad_lo, estimate - step, lo)
+        hi = np.where(bad_hi, estimate + step, hi)
+
+    for _ in range(200):
+        mid = lo + (hi - lo) / 2
+        settled = (mid == lo) | (mid == hi)
+        if settled.all():
+            break
+        left = goes_left(mid)
+        lo = np.where(left & ~settled, mid, lo)
+        hi = np.where(~left & ~settled, mid, hi)
+    return hi
+
+def _compile_xgboost(model, mean, scale):
+    booster = model.get_booster()
+    raw = json.loads(booster.save_raw("json"))
+    learner = raw["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in ("multi:softprob", "multi:softmax"):
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+    trees = learner["gradient_booster"]["model"]["trees"]
+    tree_info = learner["gradient_booster"]["model"]["tree_info"]
+    base_margin = float(learner["learner_model_param"]["base_score"])
+
+    features, thresholds, children, defaults, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        leaf = left == -1
+        own = np.arange(len(left))
+
+        feature = np.where(leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64))
+        split = np.asarray(tree["split_conditions"], dtype=np.float64)
+        threshold = np.full(len(left), np.inf)
+        threshold[~leaf] = _fold_thresholds(
+            split[~leaf], mean[feature[~leaf]], scale[feature[~leaf]], inclusive=False
+        )
+
+        roots.append(offset)
+        features.append(feature)
+        thresholds.append(threshold)
+        children.append(np.stack([np.where(leaf, own, left), np.where(leaf, own, right)], axis=1) + offset)
+        defaults.append(np.asarray(tree["default_left"], dtype=bool))
+        values.append(np.asarray(tree["base_weights"], dtype=np.float64)[:, np.newaxis])
+        offset += len(left)
+
+    return CompiledForest(
+        np.concatenate(features), np.concatenate(thresholds),
+        np.concatenate(children).ravel(), np.concatenate(defaults),
+        np.concatenate(values), roots, tree_info,
+        kind="boosted", classes=model.classes_, base_margin=base_margin,
+    )
+
+def _flatten_lightgbm_tree(root):
+    """
+    Returns the nodes of a `dump_model()` tree in pre-order, each paired with the
+    positions of its children (None for leaves).
+    """
+    nodes, links = [], []
+    stack = [(root, None, 0)]
+    while stack:
+        node, parent, side = stack.pop()
+        if parent is not None:
+            links[parent][side] = len(nodes)
+        nodes.append(node)
+        links.append([None, None] if "split_index" in node else None)
+        if "split_index" in node:
+            position = len(nodes) - 1
+            stack.append((node["right_child"], position, 1))
+            stack.append((node["left_child"], position, 0))
+    return nodes, links
+
+def _compile_lightgbm(model, mean, scale):
+    dump = model.booster_.dump_model()
+    if not dump["objective"].startswith("multiclass"):
+        raise ValueError(f"Unsupported LightGBM objective: {dump['objective']}")
+    n_classes = int(dump["num_tree_per_iteration"])
+
+    features, thresholds, children, defaults, values, roots = [], [], [], [], [], []
+    offset = 0
+    for info in dump["tree_info"]:
+        nodes, links = _flatten_lightgbm_tree(info["tree_structure"])
+        own = np.arange(len(nodes))
+        split = [node for node in nodes if "split_index" in node]
+        if any(node["decision_type"] != "<=" for node in split):
+            raise ValueError("Categorical LightGBM splits are not supported")
+
+        leaf = np.array([link is None for link in links])
+        feature = np.array([node.get("split_feature", 0) for node in nodes], dtype=np.int64)
+        threshold = np.full(len(nodes), np.inf)
+        cut = np.array([node["threshold"] for node in split], dtype=np.float64)
+        threshold[~leaf] = _fold_thresholds(
+            cut, mean[feature[~leaf]], scale[feature[~leaf]], inclusive=True, single_precision=False
+        )
+        # Without a missing-value branch LightGBM scores NaN as 0, which goes left when 0 <= threshold
+        default_left = np.array([
+            node["default_left"] if node["missing_type"] == "NaN" else 0.0 <= node["threshold"]
+            for node in split
+        ], dtype=bool)
+
+        roots.append(offset)
+        features.append(feature)
+        thresholds.append(threshold)
+        children.append(np.array([link if link is not None else [i, i] for i, link in zip(own, links)],
+                                 dtype=np.int64).reshape(-1, 2) + offset)
+        node_defaults = np.zeros(len(nodes), dtype=bool)
+        node_defaults[~leaf] = default_left
+        defaults.append(node_defaults)
+        values.append(np.array([node.get("leaf_value", node.get("internal_value", 0.0)) for node in nodes],
+                               dtype=np.float64)[:, np.newaxis])
+        offset += len(nodes)
+
+    return CompiledForest(
+        np.concatenate(features), np.concatenate(thresholds),
+        np.concatenate(children).ravel(), np.concatenate(defaults),
+        np.concatenate(values), roots, np.arange(len(roots)) % n_classes,
+        kind="boosted", classes=model.classes_,
+    )
+
+def _compile_sklearn_forest(model, mean, scale):
+    features, thresholds, children, defaults, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in getattr(model, "estimators_", [model]):
+        tree = estimator.tree_
+        leaf = tree.children_left == -1
+        own = np.arange(tree.node_count)
+
+        feature = np.where(leaf, 0, tree.feature)
+        threshold = np.full(tree.node_count, np.inf)
+        threshold[~leaf] = _fold_thresholds(
+            tree.threshold[~leaf], mean[feature[~leaf]], scale[feature[~leaf]], inclusive=True
+        )
+        # A multi-output regressor fitted on class probabilities stores them as (n_nodes, n_outputs, 1)
+        value = (tree.value[:, :, 0] if tree.n_outputs > 1 else tree.value[:, 0, :]).astype(np.float64)
+        value /= value.sum(axis=1, keepdims=True)
+
+        roots.append(offset)
+        features.append(feature)
+        thresholds.append(threshold)
+        children.append(np.stack([np.where(leaf, own, tree.children_left),
+                                  np.where(leaf, own, tree.children_right)], axis=1) + offset)
+        defaults.append(np.zeros(tree.node_count, dtype=bool))
+        values.append(value)
+        offset += tree.node_count
+
+    return CompiledForest(
+        np.concatenate(features), np.concatenate(thresholds),
+        np.concatenate(children).ravel(), np.concatenate(defaults),
+        np.concatenate(values), roots, np.full(len(roots), -1),
+        kind="averaged", classes=getattr(model, "classes_", np.arange(model.n_outputs_)),
+    )
+
+def compile_forest(model, scaler=None, feature_indices=None):
+    """
+    Compiles a fitted tree ensemble (and optionally its scaler) into a `CompiledForest`.
+
+    Parameters
+    ----------
+    model : object
+        A fitted `xgboost.XGBClassifier` or `lightgbm.LGBMClassifier`
+        (multi-class, numeric splits), a scikit-learn forest
+        such as `RandomForestClassifier` / `ExtraTreesClassifier`, or a single
+        `DecisionTreeClassifier`. A multi-output tree regressor fitted on class
+        probabilities is compiled as a classifier over `range(n_outputs)`.
+    scaler : object, optional
+        A fitted `StandardScaler`. When given it is folded into every split
+        threshold, so the compiled model scores raw specifications directly.
+    feature_indices : sequence of int, optional
+        For a model trained on a subset of the columns: the position of each of
+        its features in the full row, so the compiled model scores full rows.
+
+    Returns
+    -------
+    CompiledForest
+
+    Raises
+    ------
+    ValueError
+        If the model type or objective is not supported.
+
+    """
+    mean, scale = _scaling_params(scaler, int(model.n_features_in_))
+
+    if hasattr(model, "get_booster"):
+        engine = _compile_xgboost(model, mean, scale)
+    elif hasattr(model, "booster_"):
+        engine = _compile_lightgbm(model, mean, scale)
+    elif hasattr(model, "tree_") or (hasattr(model, "estimators_") and hasattr(model.estimators_[0], "tree_")):
+        engine = _compile_sklearn_forest(model, mean, scale)
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    if feature_indices is not None:
+        engine.feature = np.asarray(feature_indices, dtype=np.intp)[engine.feature]
+    return engine
+
+def compile_linear(model, scaler=None):
+    """
+    Compiles a fitted multinomial `LogisticRegression` (and optionally its
+    scaler) into a `CompiledLinear` that scores raw specifications.
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    if coef.shape[0] != len(model.classes_):
+        raise ValueError("Only multinomial linear models with one row of weights per class are supported")
+    mean, scale = _scaling_params(scaler, coef.shape[1])
+    coef = coef / scale
+    return CompiledLinear(coef, model.intercept_ - coef @ mean, model.classes_)
+
+ARTIFACT_FORMAT = CompiledForest.FORMAT
+ENGINE_FORMATS = {engine.FORMAT: engine for engine in (CompiledForest, CompiledLinear)}
+
+def save_compiled_forest(engine, path, **metadata):
+    """
+    Writes `engine` as a pickle-free `.npz` artifact.
+
+    The archive is uncompressed, so every array can later be memory-mapped in
+    place. Non-array state is stored as a JSON `meta` member, together with any
+    extra `metadata` keyword (e.g. the checksums of the source files). The file
+    is written next to `path` and moved into place with `os.replace`, so
+    processes that already mapped the previous version keep a valid copy.
+
+    Parameters
+    ----------
+    engine : CompiledForest or CompiledLinear
+    path : str
+    **metadata
+        Extra JSON-serialisable provenance fields.
+
+    """
+    meta = {"format": engine.FORMAT, **engine.metadata(), **metadata}
+    arrays = {name: getattr(engine, name) for name in engine.ARRAYS}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8), **arrays)
+    os.replace(tmp_path, path)
+
+def verify_compiled_forest(engine, model, scaler, X, atol=1e-5):
+    """
+    Checks that `engine`'s node arrays reproduce
+    `model.predict_proba(scaler.transform(X))`; an attached native model is
+    bypassed.
+
+    Returns
+    -------
+    dict
+        Row count, number of label mismatches and the largest absolute
+        probability difference.
+
+    """
+    X = np.asarray(X, dtype=np.float64)
+    expected = model.predict_proba(scaler.transform(X) if scaler is not None else X)
+    actual = engine.traverse_proba(X)
+
+    label_mismatches = int((expected.argmax(axis=1) != actual.argmax(axis=1)).sum())
+    max_abs_diff = float(np.abs(expected - actual).max())
+    return {
+        "rows": len(X),
+        "label_mismatches": label_mismatches,
+        "max_abs_diff": max_abs_diff,
+        "equivalent": label_mismatches == 0 and max_abs_diff <= atol,
+    }
+
+def _time_per_call(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import warnings
+
+    import pandas as pd
+
+    from utils.model_registry import sha256_file
+    from utils.load_model import load_trained_model, load_scaler, MODEL_PATH, SCALER_PATH, ARTIFACT_PATH
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Compile the model, verify it against the original and time both.")
+    parser.add_argument("--export", nargs="?", const=ARTIFACT_PATH, metavar="PATH",
+                        help=f"write the verified engine as a memory-mappable artifact (default: {ARTIFACT_PATH})")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    model, scaler = load_trained_model(), load_scaler()
+    X = pd.read_csv("Clean_Mobile_Data.csv")[FEATURE_ORDER].to_numpy(dtype=np.float64)
+
+    start = time.perf_counter()
+    engine = compile_forest(model, scaler)
+    print(f"Compiled {engine.n_trees} trees / {engine.n_nodes} nodes "
+          f"(depth {engine.max_depth}) in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    report = verify_compiled_forest(engine, model, scaler, X)
+    print(f"Equivalence on {report['rows']} rows: {report['label_mismatches']} label mismatches, "
+          f"max |Δp| = {report['max_abs_diff']:.2e}")
+
+    # Rows sitting exactly on (and one ulp below) every folded threshold
+    internal = engine.left != np.arange(engine.n_nodes)
+    edges = np.repeat(X[:1], internal.sum() * 2, axis=0)
+    cut = engine.threshold[internal]
+    edges[np.arange(len(cut)), engine.feature[internal]] = cut
+    edges[len(cut) + np.arange(len(cut)), engine.feature[internal]] = np.nextafter(cut, -np.inf)
+    edge_report = verify_compiled_forest(engine, model, scaler, edges)
+    print(f"Equivalence on {edge_report['rows']} threshold-boundary rows: "
+          f"{edge_report['label_mismatches']} label mismatches, max |Δp| = {edge_report['max_abs_diff']:.2e}")
+
+    row = X[:1]
+    sk_single = _time_per_call(
+        lambda: (model.predict(scaler.transform(row)), model.predict_proba(scaler.transform(row))), 200)
+    engine_single = _time_per_call(lambda: engine.predict_proba(row), 200)
+    sk_batch = _time_per_call(lambda: model.predict_proba(scaler.transform(X)), 5)
+    engine_batch = _time_per_call(lambda: engine.traverse_proba(X), 5)
+    # What the app serves: the same engine with the native model taking the large batches
+    engine.attach_native(lambda: (model, scaler))
+    served_batch = _time_per_call(lambda: engine.predict_proba(X), 5)
+    engine.attach_native(None, min_rows=0)
+
+    print(f"Single row : sklearn {sk_single * 1e6:8.1f} µs | compiled {engine_single * 1e6:8.1f} µs "
+          f"({sk_single / engine_single:.1f}x)")
+    print(f"{len(X)} rows : sklearn {sk_batch * 1e3:8.2f} ms | compiled {engine_batch * 1e3:8.2f} ms "
+          f"({sk_batch / engine_batch:.1f}x) | served {served_batch * 1e3:8.2f} ms ({sk_batch / served_batch:.1f}x)")
+
+    # Timings on a busy machine are noisy; only a clear loss counts as a regression
+    fast_enough = engine_single <= sk_single and served_batch <= sk_batch * 1.25
+    if not fast_enough:
+        print("❌ The served engine is slower than the native model")
+
+    if not (report["equivalent"] and edge_report["equivalent"] and fast_enough):
+        sys.exit(1)
+
+    if args.export:
+        save_compiled_forest(engine, args.export, feature_names=FEATURE_ORDER,
+                             model_sha256=sha256_file(MODEL_PATH), scaler_sha256=sha256_file(SCALER_PATH))
+        print(f"Exported {engine.nbytes / 1024:.0f} KiB of node arrays to {args.export}")
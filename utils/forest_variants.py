@@ -0,0 +1,206 @@
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from utils.forest_engine import CompiledForest, save_compiled_forest
+
+def _rebuild(engine, children, value, roots, tree_class):
+    """
+    Returns a new forest holding only the nodes reachable from `roots`, renumbered
+    contiguously tree by tree so the arrays (and the artifact) shrink with the model.
+    """
+    order = []
+    for root in roots:
+        stack = [int(root)]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            left, right = children[2 * node], children[2 * node + 1]
+            if left != node:
+                stack.extend((int(right), int(left)))
+    order = np.asarray(order, dtype=np.intp)
+    new_id = np.full(engine.n_nodes, -1, dtype=np.intp)
+    new_id[order] = np.arange(len(order))
+
+    pairs = children.reshape(-1, 2)[order]
+    return CompiledForest(
+        engine.feature[order], engine.threshold[order], new_id[pairs].ravel(),
+        engine.default_left[order], value[order], new_id[roots], tree_class,
+        kind=engine.kind, classes=engine.classes_, base_margin=engine.base_margin,
+    )
+
+def truncate_trees(engine, n_rounds):
+    """
+    Keeps the first `n_rounds` boosting rounds (all class trees of each round) of a
+    boosted ensemble, or the first `n_rounds` trees of an averaged forest.
+    """
+    per_round = len(engine.classes_) if engine.kind == "boosted" else 1
+    keep = min(n_rounds * per_round, engine.n_trees)
+    return _rebuild(engine, engine.children.copy(), engine.value,
+                    engine.roots[:keep], engine.tree_class[:keep])
+
+def cap_depth(engine, max_depth):
+    """
+    Turns every node at depth `max_depth` into a leaf that outputs the node's own
+    value (the boosting weight or class distribution it would have as a leaf).
+    """
+    children = engine.children.copy()
+    nodes = engine.roots
+    for _ in range(max_depth):
+        internal = nodes[children[2 * nodes] != nodes]
+        nodes = np.concatenate([children[2 * internal], children[2 * internal + 1]])
+    children[2 * nodes] = nodes
+    children[2 * nodes + 1] = nodes
+    return _rebuild(engine, children, engine.value, engine.roots, engine.tree_class)
+
+def merge_redundant_leaves(engine, tolerance=0.0):
+    """
+    Collapses splits whose two children are leaves with outputs within `tolerance`,
+    repeating until no such split is left. With `tolerance=0` predictions are unchanged.
+    """
+    children = engine.children.copy()
+    value = engine.value.copy()
+    own = np.arange(engine.n_nodes)
+    while True:
+        left, right = children[0::2], children[1::2]
+        is_leaf = left == own
+        candidates = own[~is_leaf & is_leaf[left] & is_leaf[right]]
+        gap = np.abs(value[left[candidates]] - value[right[candidates]]).max(axis=1)
+        merge = candidates[gap <= tolerance]
+        if merge.size == 0:
+            break
+        value[merge] = (value[left[merge]] + value[right[merge]]) / 2
+        children[2 * merge] = merge
+        children[2 * merge + 1] = merge
+    return _rebuild(engine, children, value, engine.roots, engine.tree_class)
+
+def make_variant(engine, n_rounds=None, max_depth=None, merge_tolerance=None):
+    variant = engine
+    if n_rounds is not None:
+        variant = truncate_trees(variant, n_rounds)
+    if max_depth is not None and max_depth < variant.max_depth:
+        variant = cap_depth(variant, max_depth)
+    if merge_tolerance is not None:
+        variant = merge_redundant_leaves(variant, merge_tolerance)
+    return variant
+
+def _artifact_size(engine):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "variant.npz")
+        save_compiled_forest(engine, path)
+        return os.path.getsize(path)
+
+def measure_variant(engine, X, y, holdout, reference_labels, single_repeats=2000):
+    """
+    Returns accuracy, agreement with the full model, single-row latency, batch
+    throughput and artifact size for one variant.
+    """
+    labels = engine.predict(X)
+
+    row = X[:1]
+    engine.predict_proba(row)
+    timings = []
+    for i in range(single_repeats):
+        start = time.perf_counter()
+        engine.predict_proba(X[i % len(X)][np.newaxis, :])
+        timings.append(time.perf_counter() - start)
+
+    batch_seconds = np.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        engine.predict_proba(X)
+        batch_seconds = min(batch_seconds, time.perf_counter() - start)
+
+    return {
+        "trees": engine.n_trees,
+        "nodes": engine.n_nodes,
+        "depth": engine.max_depth,
+        "accuracy": float((labels == y).mean()),
+        "holdout_accuracy": float((labels[holdout] == y[holdout]).mean()),
+        "agreement": float((labels == reference_labels).mean()),
+        "single_row_us_p50": float(np.percentile(timings, 50) * 1e6),
+        "single_row_us_p99": float(np.percentile(timings, 99) * 1e6),
+        "batch_rows_per_sec": float(len(X) / batch_seconds),
+        "artifact_bytes": _artifact_size(engine),
+    }
+
+def _write_markdown(path, rows, selected):
+    lines = [
+        "# Reduced-forest variants",
+        "",
+        "Accuracy is measured on every row of `Clean_Mobile_Data.csv`; holdout accuracy on the",
+        "notebook's 20% test split (`random_state=42`). Agreement is with the full model.",
+        "",
+        "| Variant | Trees | Nodes | Depth | Accuracy | Holdout | Agreement | Single row p50 (µs) | p99 (µs) | Batch (rows/s) | Artifact (KiB) |",
+        "|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        marker = " **(fast)**" if row["name"] == selected else ""
+        lines.append(
+            f"| {row['name']}{marker} | {row['trees']} | {row['nodes']} | {row['depth']} "
+            f"| {row['accuracy']:.2%} | {row['holdout_accuracy']:.2%} | {row['agreement']:.2%} "
+            f"| {row['single_row_us_p50']:.0f} | {row['single_row_us_p99']:.0f} "
+            f"| {row['batch_rows_per_sec']:,.0f} | {row['artifact_bytes'] / 1024:.0f} |"
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    from utils.model_registry import sha256_file
+    from utils.load_model import load_trained_model, load_scaler, MODEL_PATH, SCALER_PATH, FAST_ARTIFACT_PATH
+    from utils.forest_engine import compile_forest
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Build reduced-forest variants and report their trade-offs.")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[100, 75, 50, 30, 20, 10])
+    parser.add_argument("--depths", type=int, nargs="+", default=[6, 4, 3])
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01,
+                        help="largest holdout accuracy loss allowed for the fast profile")
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--fast-output", default=FAST_ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    df = pd.read_csv("Clean_Mobile_Data.csv")
+    X = df[FEATURE_ORDER].to_numpy(dtype=np.float64)
+    y = df["price_range"].to_numpy()
+    _, holdout = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+
+    full = compile_forest(load_trained_model(), load_scaler())
+    reference_labels = full.predict(X)
+
+    rows, variants = [], {}
+    for n_rounds in args.rounds:
+        for depth in args.depths:
+            name = f"rounds={n_rounds},depth={depth}"
+            variant = make_variant(full, n_rounds=n_rounds, max_depth=depth, merge_tolerance=0.0)
+            variants[name] = variant
+            rows.append({"name": name, "n_rounds": n_rounds, "max_depth": depth,
+                         **measure_variant(variant, X, y, holdout, reference_labels)})
+            print(f"{name:22} holdout {rows[-1]['holdout_accuracy']:.2%}  "
+                  f"p50 {rows[-1]['single_row_us_p50']:6.0f} µs  {rows[-1]['nodes']:6} nodes")
+
+    baseline = float((reference_labels[holdout] == y[holdout]).mean())
+    eligible = [row for row in rows if row["holdout_accuracy"] >= baseline - args.max_accuracy_drop]
+    # Single-row latency is dominated by the fixed per-call overhead of the vectorized walk,
+    # so the fast profile is chosen on batch throughput, which tracks the work per row
+    selected = max(eligible, key=lambda row: row["batch_rows_per_sec"])["name"]
+
+    os.makedirs(args.report_dir, exist_ok=True)
+    with open(os.path.join(args.report_dir, "forest_variants.json"), "w", encoding="utf-8") as f:
+        json.dump({"fast_profile": selected, "max_accuracy_drop": args.max_accuracy_drop, "variants": rows}, f, indent=4)
+    _write_markdown(os.path.join(args.report_dir, "forest_variants.md"), rows, selected)
+
+    save_compiled_forest(variants[selected], args.fast_output, feature_names=FEATURE_ORDER,
+                         model_sha256=sha256_file(MODEL_PATH), scaler_sha256=sha256_file(SCALER_PATH),
+                         variant=selected)
+    print(f"Fast profile: {selected} -> {args.fast_output}")
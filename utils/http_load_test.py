@@ -0,0 +1,97 @@
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+async def _request(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(url, bodies, deadline, latencies, errors):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        while time.perf_counter() < deadline:
+            body = random.choice(bodies)
+            start = time.perf_counter()
+            status = await _request(reader, writer, parts.netloc, parts.path, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load_test(url, bodies, concurrency=16, duration=10.0):
+    """
+    Sends requests from `concurrency` keep-alive connections for `duration`
+    seconds and returns throughput and latency percentiles.
+    """
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(url, bodies, deadline, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "latency_ms_p50": float(np.percentile(latencies_ms, 50)) if len(latencies) else None,
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)) if len(latencies) else None,
+        "latency_ms_p99": float(np.percentile(latencies_ms, 99)) if len(latencies) else None,
+    }
+
+if __name__ == "__main__":
+    import argparse
+
+    import pandas as pd
+
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Load-test a running `python -m utils.http_server`.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765/predict")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="rows per request; 0 sends single specs (use with /predict_batch otherwise)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    rows = pd.read_csv("Clean_Mobile_Data.csv")[FEATURE_ORDER].to_dict("records")
+    if args.batch_size:
+        bodies = [json.dumps(random.sample(rows, args.batch_size)).encode("utf-8") for _ in range(100)]
+    else:
+        bodies = [json.dumps(row).encode("utf-8") for row in rows]
+
+    result = asyncio.run(run_load_test(args.url, bodies, args.concurrency, args.duration))
+    if args.json:
+        print(json.dumps(result, indent=4))
+    else:
+        rows_per_request = args.batch_size or 1
+        print(f"{result['requests']:,} requests in {result['seconds']:.1f} s from {args.concurrency} connections: "
+              f"{result['requests_per_sec']:,.0f} req/s ({result['requests_per_sec'] * rows_per_request:,.0f} rows/s), "
+              f"{result['errors']} errors")
+        if result["requests"]:
+            print(f"latency p50 {result['latency_ms_p50']:.2f} ms | p95 {result['latency_ms_p95']:.2f} ms "
+                  f"| p99 {result['latency_ms_p99']:.2f} ms")
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from core.predictor import predict_price_ranges, FEATURE_ORDER
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH_ROWS = 10000
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _rows_to_matrix(rows):
+    """
+    Converts spec dicts into a 2-D array in `FEATURE_ORDER`, the same feature
+    contract as `predict_price_range`.
+    """
+    missing = sorted({feature for row in rows for feature in FEATURE_ORDER if feature not in row})
+    if missing:
+        raise ValueError(f"Missing input feature(s): {', '.join(missing)}")
+    try:
+        return np.array([[float(row[feature]) for feature in FEATURE_ORDER] for row in rows])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Input features must be numbers: {e}")
+
+def _prediction(label, probabilities):
+    return {
+        "price_label": label,
+        "predicted_class": int(np.argmax(probabilities)),
+        "probabilities": [round(float(p), 6) for p in probabilities],
+    }
+
+class InferenceServer:
+    """
+    A minimal asyncio HTTP/1.1 server for the price model (standard library only).
+
+    Endpoints
+    ---------
+    GET /health
+        Status, model name/version, profile and uptime.
+    GET /stats
+        Prediction cache counters and micro-batching histograms.
+    POST /predict
+        Body: one spec dict with the 20 `FEATURE_ORDER` features.
+    POST /predict_batch
+        Body: a list of spec dicts, or `{"rows": [...]}`.
+
+    The event loop only parses requests and writes responses; loading the
+    bundle and scoring run on a thread pool, so one slow request never blocks
+    the others. Connections are kept alive between requests.
+
+    Parameters
+    ----------
+    profile : str, optional
+        Model profile, see `utils.load_model.get_model_bundle`.
+    workers : int
+        Threads scoring requests.
+
+    """
+
+    def __init__(self, profile=None, workers=4):
+        self.profile = profile
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self.started_at = time.time()
+        self.requests = 0
+
+    def _bundle(self):
+        from utils.load_model import get_model_bundle
+        return get_model_bundle(self.profile)
+
+    def health(self):
+        bundle = self._bundle()
+        return {
+            "status": "ok",
+            "model_name": bundle.name,
+            "model_version": bundle.version,
+            "profile": self.profile or os.environ.get("MOBILE_PRICE_PROFILE", "full"),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+        }
+
+    def stats(self):
+        from utils.load_model import cascade_hit_rates
+        from utils.micro_batch import MICRO_BATCHING, get_micro_batcher
+        from utils.prediction_cache import get_prediction_cache
+
+        return {
+            "prediction_cache": get_prediction_cache().stats(),
+            "micro_batching": get_micro_batcher().stats() if MICRO_BATCHING else None,
+            "cascade": cascade_hit_rates(),
+        }
+
+    def predict(self, payload):
+        from utils.prediction_cache import predict_price_range_cached
+
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON object of specifications")
+        bundle = self._bundle()
+        label, probabilities = predict_price_range_cached(bundle, payload)
+        return {**_prediction(label, probabilities), "model_version": bundle.version}
+
+    def predict_batch(self, payload):
+        rows = payload.get("rows") if isinstance(payload, dict) else payload
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON list of specification objects")
+        if len(rows) > MAX_BATCH_ROWS:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {MAX_BATCH_ROWS} rows per request")
+        bundle = self._bundle()
+        predictions = []
+        if rows:
+            labels, probabilities = predict_price_ranges(bundle.engine, None, _rows_to_matrix(rows))
+            predictions = [_prediction(label, p) for label, p in zip(labels, probabilities)]
+        return {"predictions": predictions, "model_version": bundle.version}
+
+    async def dispatch(self, method, path, body):
+        routes = {
+            ("GET", "/health"): lambda _: self.health(),
+            ("GET", "/stats"): lambda _: self.stats(),
+            ("POST", "/predict"): self.predict,
+            ("POST", "/predict_batch"): self.predict_batch,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            known = {route_path for _, route_path in routes}
+            status = HTTPStatus.METHOD_NOT_ALLOWED if path in known else HTTPStatus.NOT_FOUND
+            return status, {"error": status.phrase}
+
+        try:
+            payload = json.loads(body) if body else None
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+
+        loop = asyncio.get_running_loop()
+        try:
+            return HTTPStatus.OK, await loop.run_in_executor(self.executor, handler, payload)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            print(f"❌ {method} {path} failed: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    status, payload = await self.dispatch(method.upper(), target.split("?")[0], body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        # Load and warm the model before accepting connections
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._bundle)
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🚀 Serving on http://{host}:{port} (/health, /predict, /predict_batch)")
+        async with server:
+            await server.serve_forever()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the price model over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4, help="scoring threads")
+    parser.add_argument("--profile", default=None, help="model profile, e.g. full / fast / student")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(InferenceServer(args.profile, args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,174 @@
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_ENTRYPOINT = os.path.join(ROOT, "main.py")
+
+# Only needed by a tab or an export, so nothing may load them at start-up
+HEAVY_MODULES = ("pandas", "pyarrow", "matplotlib", "altair", "fpdf", "sklearn", "xgboost", "lightgbm")
+
+# Cumulative import time allowed per target, in milliseconds
+BUDGETS_MS = {"app": 600, "predictor": 250}
+
+# Modules each target must not import
+FORBIDDEN = {"app": HEAVY_MODULES, "predictor": ("streamlit",) + HEAVY_MODULES}
+
+def app_imports(path=APP_ENTRYPOINT):
+    """
+    Returns the modules `main.py` imports at top level, i.e. what a Streamlit
+    cold start imports before the first widget is drawn.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+TARGETS = {
+    "app": app_imports,
+    "predictor": lambda: ["core.predictor", "utils.load_model", "utils.prediction_cache"],
+}
+
+def _importtime(code):
+    """
+    Runs `code` in a fresh interpreter under `-X importtime`.
+
+    Returns
+    -------
+    imports : dict
+        Cumulative microseconds of every top-level import, by module name.
+    stdout : str
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import failed: {result.stderr.strip().splitlines()[-1]}")
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        # Nested imports are indented under the module that triggered them
+        if name.startswith(" ") and not name.startswith("  "):
+            imports[name.strip()] = int(fields[1])
+    return imports, result.stdout
+
+def measure_imports(modules, runs=5, watch=HEAVY_MODULES):
+    """
+    Measures the cold-start import cost of `modules` in fresh interpreters.
+
+    Imports the interpreter itself performs at start-up (`-c pass`) are not
+    counted, so the figure is what the modules add on top of bare Python.
+
+    Parameters
+    ----------
+    modules : list of str
+    runs : int
+        Fresh interpreters to start; the median is reported.
+    watch : tuple of str
+        Top-level packages to report if they get loaded.
+
+    Returns
+    -------
+    dict
+        `import_ms` (median), `runs_ms`, the five slowest top-level imports
+        and the `watch` packages that got loaded.
+
+    Raises
+    ------
+    RuntimeError
+        If one of the modules fails to import.
+
+    """
+    baseline, _ = _importtime("pass")
+    code = (
+        f"import importlib, json, sys\n"
+        f"for name in {list(modules)!r}: importlib.import_module(name)\n"
+        f"print(json.dumps(sorted(sys.modules)))"
+    )
+
+    totals, slowest, loaded = [], {}, []
+    for _ in range(runs):
+        imports, stdout = _importtime(code)
+        imports = {name: us for name, us in imports.items() if name not in baseline}
+        totals.append(sum(imports.values()) / 1000)
+        for name, us in imports.items():
+            slowest.setdefault(name, []).append(us / 1000)
+        loaded = json.loads(stdout.strip().splitlines()[-1])
+
+    watched = sorted({name.split(".")[0] for name in loaded} & set(watch))
+    top = sorted(((statistics.median(ms), name) for name, ms in slowest.items()), reverse=True)[:5]
+    return {
+        "modules": list(modules),
+        "import_ms": statistics.median(totals),
+        "runs_ms": totals,
+        "slowest": [{"module": name, "import_ms": ms} for ms, name in top],
+        "loaded": watched,
+    }
+
+def check_budgets(budgets=None, runs=5):
+    """
+    Measures every target in `TARGETS` against its budget and forbidden modules.
+
+    Returns
+    -------
+    results : dict
+        Per target, the `measure_imports()` result (`loaded` lists the
+        forbidden modules it pulled in) plus `budget_ms` and `ok`.
+    ok : bool
+
+    """
+    budgets = {**BUDGETS_MS, **(budgets or {})}
+    results = {}
+    for target, modules in TARGETS.items():
+        result = measure_imports(modules(), runs, watch=FORBIDDEN[target])
+        result["budget_ms"] = budgets[target]
+        result["ok"] = result["import_ms"] <= result["budget_ms"] and not result["loaded"]
+        results[target] = result
+    return results, all(result["ok"] for result in results.values())
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fail if the app or the predictor start more slowly than their import budget.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--budget", action="append", default=[], metavar="TARGET=MS",
+                        help=f"override a budget, e.g. app=800 (defaults: {BUDGETS_MS})")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    try:
+        overrides = {target: float(ms) for target, ms in (item.split("=", 1) for item in args.budget)}
+    except ValueError:
+        parser.error("--budget expects TARGET=MS")
+    unknown = set(overrides) - set(TARGETS)
+    if unknown:
+        parser.error(f"Unknown target(s): {', '.join(sorted(unknown))}")
+
+    results, ok = check_budgets(overrides, args.runs)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        for target, result in results.items():
+            mark = "✅" if result["ok"] else "❌"
+            print(f"{mark} {target}: {result['import_ms']:.0f} ms (budget {result['budget_ms']:.0f} ms)")
+            for entry in result["slowest"]:
+                print(f"     {entry['import_ms']:8.1f} ms  {entry['module']}")
+            if result["loaded"]:
+                print(f"   ❌ imports {', '.join(result['loaded'])} at start-up")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+from utils.forest_engine import compile_forest, save_compiled_forest
+
+MODEL_NAMES = ("random_forest", "xgboost", "lightgbm")
+
+def make_model(name):
+    """
+    Returns an unfitted classifier configured like the notebook's comparison.
+    """
+    if name == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42)
+    if name == "xgboost":
+        from xgboost import XGBClassifier
+        return XGBClassifier(eval_metric="mlogloss", random_state=42)
+    if name == "lightgbm":
+        from lightgbm import LGBMClassifier
+        return LGBMClassifier(random_state=42, verbose=-1)
+    raise ValueError(f"Unknown model: {name}")
+
+def _best_of(fn, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _single_row_us(predict_proba, X, repeats):
+    predict_proba(X[:1])
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)][np.newaxis, :]
+        start = time.perf_counter()
+        predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.percentile(timings, 50) * 1e6), float(np.percentile(timings, 99) * 1e6)
+
+def measure_model(model, scaler, X, y, holdout, batch_rows=10000, single_repeats=1000):
+    """
+    Benchmarks one fitted model as the app would serve it.
+
+    Returns holdout accuracy; single-row p50/p99 latency and batch throughput of
+    both the native `scaler.transform` + `predict_proba` pipeline and the
+    compiled engine; the time to load the pickle and compile it, or to map the
+    compiled artifact; and the size of both files.
+    """
+    from utils.load_model import load_compiled_artifact
+
+    engine = compile_forest(model, scaler)
+    labels = engine.predict(X[holdout])
+    batch = X[np.arange(batch_rows) % len(X)]
+
+    def native(rows):
+        return model.predict_proba(scaler.transform(rows))
+
+    native_p50, native_p99 = _single_row_us(native, X, single_repeats)
+    compiled_p50, compiled_p99 = _single_row_us(engine.predict_proba, X, single_repeats)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, "model.pkl")
+        artifact_path = os.path.join(tmp, "model.npz")
+        joblib.dump(model, pickle_path)
+        save_compiled_forest(engine, artifact_path)
+        pickle_load = _best_of(lambda: compile_forest(joblib.load(pickle_path), scaler))
+        artifact_load = _best_of(lambda: load_compiled_artifact(artifact_path))
+        pickle_bytes = os.path.getsize(pickle_path)
+        artifact_bytes = os.path.getsize(artifact_path)
+
+    return {
+        "holdout_accuracy": float((labels == y[holdout]).mean()),
+        "native_single_row_us_p50": native_p50,
+        "native_single_row_us_p99": native_p99,
+        "compiled_single_row_us_p50": compiled_p50,
+        "compiled_single_row_us_p99": compiled_p99,
+        "native_batch_rows_per_sec": float(batch_rows / _best_of(lambda: native(batch))),
+        "compiled_batch_rows_per_sec": float(batch_rows / _best_of(lambda: engine.predict_proba(batch))),
+        "pickle_load_ms": pickle_load * 1e3,
+        "artifact_load_ms": artifact_load * 1e3,
+        "pickle_bytes": pickle_bytes,
+        "artifact_bytes": artifact_bytes,
+    }
+
+def pareto_front(rows):
+    """
+    Returns the names of the models no other model beats on both holdout
+    accuracy and compiled single-row p50 latency.
+    """
+    front = []
+    for row in rows:
+        dominated = any(
+            other["holdout_accuracy"] >= row["holdout_accuracy"]
+            and other["compiled_single_row_us_p50"] <= row["compiled_single_row_us_p50"]
+            and (other["holdout_accuracy"] > row["holdout_accuracy"]
+                 or other["compiled_single_row_us_p50"] < row["compiled_single_row_us_p50"])
+            for other in rows
+        )
+        if not dominated:
+            front.append(row["name"])
+    return front
+
+def _write_markdown(path, rows, front, batch_rows):
+    lines = [
+        "# Model leaderboard",
+        "",
+        "Every model is fitted on the notebook's 80% training split (`random_state=42`) and scored on",
+        f"the 20% holdout. Latency is per single-row call; batch throughput over {batch_rows:,} rows.",
+        "Native is `scaler.transform` + `predict_proba`, compiled is the engine the app serves.",
+        "Models on the accuracy / compiled-latency Pareto front are marked.",
+        "",
+        "| Model | Holdout accuracy | Native p50 / p99 (µs) | Compiled p50 / p99 (µs) "
+        "| Native batch (rows/s) | Compiled batch (rows/s) | Pickle load + compile (ms) "
+        "| Artifact load (ms) | Pickle (KiB) | Artifact (KiB) |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in sorted(rows, key=lambda row: -row["holdout_accuracy"]):
+        marker = " **(pareto)**" if row["name"] in front else ""
+        lines.append(
+            f"| {row['name']}{marker} | {row['holdout_accuracy']:.2%} "
+            f"| {row['native_single_row_us_p50']:.0f} / {row['native_single_row_us_p99']:.0f} "
+            f"| {row['compiled_single_row_us_p50']:.0f} / {row['compiled_single_row_us_p99']:.0f} "
+            f"| {row['native_batch_rows_per_sec']:,.0f} | {row['compiled_batch_rows_per_sec']:,.0f} "
+            f"| {row['pickle_load_ms']:.1f} | {row['artifact_load_ms']:.1f} "
+            f"| {row['pickle_bytes'] / 1024:.0f} | {row['artifact_bytes'] / 1024:.0f} |"
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+if __name__ == "__main__":
+    import argparse
+    import warnings
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    from utils.model_registry import register_version, set_candidate_version, load_manifest
+    from core.predictor import FEATURE_ORDER
+
+    parser = argparse.ArgumentParser(description="Train and benchmark RandomForest, XGBoost and LightGBM.")
+    parser.add_argument("--models", nargs="+", choices=MODEL_NAMES, default=list(MODEL_NAMES))
+    parser.add_argument("--batch-rows", type=int, default=10000)
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--emit", choices=[*MODEL_NAMES, "best"],
+                        help="save a model in the format utils.load_model loads; 'best' is the most "
+                             "accurate model on the Pareto front")
+    parser.add_argument("--model-output", default="leaderboard_model.pkl")
+    parser.add_argument("--scaler-output", default="leaderboard_scaler.pkl")
+    parser.add_argument("--register", action="store_true", help="also add the emitted model to the model registry")
+    parser.add_argument("--candidate", action="store_true", help="and shadow-score it against the active version")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    df = pd.read_csv("Clean_Mobile_Data.csv")
+    X = df[FEATURE_ORDER].to_numpy(dtype=np.float64)
+    y = df["price_range"].to_numpy()
+    train, holdout = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+
+    # Same preprocessing as the notebook: the scaler is fitted on the full feature matrix
+    scaler = StandardScaler().fit(df[FEATURE_ORDER])
+    X_scaled = scaler.transform(df[FEATURE_ORDER])
+
+    rows, models = [], {}
+    for name in args.models:
+        start = time.perf_counter()
+        model = make_model(name).fit(X_scaled[train], y[train])
+        models[name] = model
+        rows.append({"name": name, "fit_seconds": time.perf_counter() - start,
+                     **measure_model(model, scaler, X, y, holdout, batch_rows=args.batch_rows)})
+        print(f"{name:14} holdout {rows[-1]['holdout_accuracy']:.2%}  "
+              f"compiled p50 {rows[-1]['compiled_single_row_us_p50']:6.0f} µs  "
+              f"native p50 {rows[-1]['native_single_row_us_p50']:6.0f} µs")
+
+    front = pareto_front(rows)
+    os.makedirs(args.report_dir, exist_ok=True)
+    with open(os.path.join(args.report_dir, "leaderboard.json"), "w", encoding="utf-8") as f:
+        json.dump({"pareto_front": front, "batch_rows": args.batch_rows, "models": rows}, f, indent=4)
+    _write_markdown(os.path.join(args.report_dir, "leaderboard.md"), rows, front, args.batch_rows)
+    print(f"Pareto front: {', '.join(front)}")
+
+    if args.emit:
+        if args.emit == "best":
+            name = max((row for row in rows if row["name"] in front), key=lambda row: row["holdout_accuracy"])["name"]
+        elif args.emit in models:
+            name = args.emit
+        else:
+            parser.error(f"--emit {args.emit} was not trained; add it to --models")
+
+        joblib.dump(models[name], args.model_output)
+        joblib.dump(scaler, args.scaler_output)
+        print(f"✅ Saved {name} to {args.model_output} and {args.scaler_output}")
+
+        if args.register:
+            version = register_version(args.model_output, args.scaler_output, notes=f"leaderboard: {name}")
+            if args.candidate and load_manifest()["active"] != version:
+                set_candidate_version(version)
+            print(f"✅ Registered {version}")
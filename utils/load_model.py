@@ -1,10 +1,42 @@
 import joblib
 import os
+import json
+import struct
+import zipfile
+import hashlib
+import threading
+import time
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Any
+
+from utils.forest_engine import compile_forest, ENGINE_FORMATS
+from core.predictor import predict_price_range, CascadeModel, FEATURE_ORDER
+from utils.model_registry import resolve_active_version, sha256_file
+from core.metrics import get_metrics_registry
 
 MODEL_PATH = 'final_mobile_price_model.pkl'
 SCALER_PATH = 'scaler.pkl'
+ARTIFACT_PATH = 'final_mobile_price_model.npz'
+FAST_ARTIFACT_PATH = 'final_mobile_price_model_fast.npz'
+CASCADE_ARTIFACT_PATH = 'final_mobile_price_model_cascade.npz'
+STUDENT_ARTIFACT_PATH = 'final_mobile_price_model_student.npz'
 
-def load_trained_model():
+# "full" serves the complete model, "fast" the reduced variant picked by `python -m utils.forest_variants`,
+# "cascade" the stage-1 tree of `python -m utils.cascade` in front of the full model
+# and "student" the compact model distilled by `python -m utils.distill`
+MODEL_PROFILE = os.environ.get("MOBILE_PRICE_PROFILE", "full")
+PROFILE_ARTIFACTS = {
+    "full": ARTIFACT_PATH,
+    "fast": FAST_ARTIFACT_PATH,
+    "cascade": CASCADE_ARTIFACT_PATH,
+    "student": STUDENT_ARTIFACT_PATH,
+}
+# Overrides the stage-1 confidence threshold stored in the cascade artifact
+CASCADE_THRESHOLD = os.environ.get("MOBILE_PRICE_CASCADE_THRESHOLD")
+
+def load_trained_model(path=None):
     """
     Load a pre-trained machine learning model from disk.
 
@@ -25,15 +57,16 @@ def load_trained_model():
         If there is an error during model loading (e.g., corrupted file, incompatible format).
 
     """
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError(f"Model file not found: {MODEL_PATH}")
+    path = path or MODEL_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model file not found: {path}")
     try:
-        model = joblib.load(MODEL_PATH)
+        model = joblib.load(path)
         return model
     except Exception as e:
         raise RuntimeError(f"Error loading model: {e}")
 
-def load_scaler():
+def load_scaler(path=None):
     """
     Load a pre-trained data scaler from disk.
 
@@ -54,10 +87,366 @@ def load_scaler():
         If there is an error during scaler loading (e.g., corrupted file, incompatible format).
 
     """
-    if not os.path.exists(SCALER_PATH):
-        raise FileNotFoundError(f"Scaler file not found: {SCALER_PATH}")
+    path = path or SCALER_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Scaler file not found: {path}")
     try:
-        scaler = joblib.load(SCALER_PATH)
+        scaler = joblib.load(path)
         return scaler
     except Exception as e:
         raise RuntimeError(f"Error loading scaler: {e}")
+
+def _memmap_npz_member(path, info):
+    """
+    Memory-maps one uncompressed `.npy` member of a `.npz` archive read-only.
+    """
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise ValueError(f"Refusing to load object array '{info.filename}'")
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+def read_artifact_metadata(path=None):
+    """
+    Returns the JSON metadata stored in a compiled model artifact.
+    """
+    path = path or ARTIFACT_PATH
+    with np.load(path, allow_pickle=False) as archive:
+        return json.loads(archive["meta"].tobytes().decode("utf-8"))
+
+def load_compiled_artifact(path=None):
+    """
+    Load a compiled model artifact from disk without unpickling anything.
+
+    The artifact is the uncompressed `.npz` written by
+    `utils.forest_engine.save_compiled_forest` (or `python -m utils.forest_engine --export`).
+    Every node array is memory-mapped read-only, so loading takes milliseconds
+    and all processes that load the same file share one page-cached copy.
+
+    Returns
+    -------
+    model : CompiledForest or CompiledLinear
+        The model with the scaler already folded in; use it with `scaler=None`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the artifact file does not exist.
+    RuntimeError
+        If the file is not a valid artifact.
+
+    """
+    path = path or ARTIFACT_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model artifact not found: {path}")
+    try:
+        meta = read_artifact_metadata(path)
+        engine = ENGINE_FORMATS.get(meta.get("format"))
+        if engine is None:
+            raise ValueError(f"unsupported artifact format {meta.get('format')!r}")
+
+        arrays = {}
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = info.filename[:-len(".npy")]
+                if name not in engine.ARRAYS:
+                    continue
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"member '{info.filename}' is compressed and cannot be memory-mapped")
+                arrays[name] = _memmap_npz_member(path, info)
+
+        return engine.from_artifact(arrays, meta)
+    except Exception as e:
+        raise RuntimeError(f"Error loading model artifact: {e}")
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    The artifacts needed to serve predictions, loaded once and shared by every session.
+
+    Attributes
+    ----------
+    model : object
+        The deserialized estimator.
+    scaler : object
+        The deserialized scaler.
+    engine : CompiledForest
+        `model` compiled with `scaler` folded in; pass it to the predictors with `scaler=None`.
+    version : str
+        Short content hash of the model and scaler files.
+    loaded_at : float
+        `time.time()` when the bundle was built.
+    name : str
+        Registry version name, or "default" for `MODEL_PATH` / `SCALER_PATH`.
+    """
+    model: Any
+    scaler: Any
+    engine: Any
+    version: str
+    loaded_at: float
+    name: str = "default"
+
+_registry_lock = threading.Lock()
+_bundle_locks = {}
+_bundles = {}
+_bundle_files = {}
+
+def _files_changed(known_files, paths):
+    """
+    Returns True when any file differs from the copy the current bundle was built from.
+
+    A file is only re-hashed when its mtime or size changed, so the common
+    path costs one `os.stat` per file. A touched file with identical content
+    keeps the bundle.
+    """
+    changed = False
+    for path in paths:
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        known = known_files.get(path)
+        if known and known["signature"] == signature:
+            continue
+        checksum = sha256_file(path)
+        if not known or known["checksum"] != checksum:
+            changed = True
+        known_files[path] = {"signature": signature, "checksum": checksum}
+    return changed
+
+def warm_up(bundle):
+    """
+    Runs one throwaway prediction through every artifact of `bundle` so the first
+    real request does not pay for lazy initialisation (allocator, BLAS, XGBoost
+    predictor caches, first touch of memory-mapped pages).
+    """
+    if bundle.scaler is not None:
+        sample = dict(zip(FEATURE_ORDER, bundle.scaler.mean_))
+    else:
+        sample = dict.fromkeys(FEATURE_ORDER, 0)
+    if bundle.model is not None:
+        predict_price_range(bundle.model, bundle.scaler, sample)
+    predict_price_range(bundle.engine, None, sample)
+
+def _load_cached(paths, name, build):
+    """
+    Returns the cached bundle built from `paths`, rebuilding it with `build(paths)`
+    when any of the files changed. `build` returns `(model, scaler, engine)`.
+    """
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model artifact not found: {path}")
+
+    with _registry_lock:
+        lock = _bundle_locks.setdefault(paths, threading.Lock())
+        known_files = _bundle_files.setdefault(paths, {})
+
+    with lock:
+        current = _bundles.get(paths)
+        if not _files_changed(known_files, paths) and current is not None:
+            return current
+
+        try:
+            model, scaler, engine = build(paths)
+        except Exception as e:
+            # Forget the signatures so the next call retries, e.g. after a half-written file
+            known_files.clear()
+            if current is not None:
+                print(f"❌ Model reload failed, keeping version {current.version}: {e}")
+                return current
+            raise RuntimeError(f"Error loading model bundle: {e}")
+
+        version = hashlib.sha256(
+            "".join(known_files[path]["checksum"] for path in paths).encode()
+        ).hexdigest()[:12]
+        bundle = ModelBundle(model=model, scaler=scaler, engine=engine,
+                             version=version, loaded_at=time.time(), name=name)
+        warm_up(bundle)
+        _bundles[paths] = bundle
+        return bundle
+
+def _build_from_pickles(paths):
+    model_path, scaler_path = paths
+    model = load_trained_model(model_path)
+    scaler = load_scaler(scaler_path)
+    engine = compile_forest(model, scaler)
+    engine.attach_native(lambda: (model, scaler), source=paths)
+    return model, scaler, engine
+
+def _build_from_artifact(paths):
+    return None, None, load_compiled_artifact(paths[0])
+
+def load_bundle(model_path, scaler_path, name="default"):
+    """
+    Returns the process-wide `ModelBundle` for a model/scaler pair, loading or
+    reloading it when needed.
+
+    Bundles live at module level, so they survive Streamlit reruns and are
+    shared by every browser session served by the process. Each call stats
+    both files; when either file's content changed the bundle is rebuilt,
+    recompiled and warmed up before being swapped in.
+
+    Parameters
+    ----------
+    model_path : str
+    scaler_path : str
+    name : str, optional
+        Label stored on the bundle, e.g. the registry version.
+
+    Returns
+    -------
+    ModelBundle
+
+    Raises
+    ------
+    FileNotFoundError
+        If the model or scaler file does not exist.
+    RuntimeError
+        If the files cannot be loaded or compiled.
+
+    """
+    return _load_cached((model_path, scaler_path), name, _build_from_pickles)
+
+def load_artifact_bundle(path=None, name="default"):
+    """
+    Returns the process-wide `ModelBundle` backed by a memory-mapped compiled
+    artifact. Only `engine` is set; `model` and `scaler` are None.
+    """
+    return _load_cached((path or ARTIFACT_PATH,), name, _build_from_artifact)
+
+_artifact_checks = {}
+
+def artifact_is_current(path=None, model_path=None, scaler_path=None):
+    """
+    Returns True when a compiled artifact was exported from the given model and
+    scaler files (`MODEL_PATH` / `SCALER_PATH` by default), checked by SHA-256
+    and cached per file signature.
+    """
+    path = path or ARTIFACT_PATH
+    model_path = model_path or MODEL_PATH
+    scaler_path = scaler_path or SCALER_PATH
+    paths = (path, model_path, scaler_path)
+    try:
+        signature = tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+    except FileNotFoundError:
+        return False
+
+    if _artifact_checks.get(paths, (None,))[0] != signature:
+        try:
+            meta = read_artifact_metadata(path)
+            current = (meta.get("model_sha256") == sha256_file(model_path)
+                       and meta.get("scaler_sha256") == sha256_file(scaler_path))
+        except Exception:
+            current = False
+        _artifact_checks[paths] = (signature, current)
+    return _artifact_checks[paths][1]
+
+def get_model_bundle(profile=None):
+    """
+    Returns the bundle that serves live predictions.
+
+    The source model is the active version of the model registry when one is
+    configured (see `utils.model_registry`), otherwise `MODEL_PATH` /
+    `SCALER_PATH`. The profile's memory-mapped artifact is served when it was
+    exported from that source; otherwise the source pickles are compiled
+    in-process.
+
+    Parameters
+    ----------
+    profile : str, optional
+        A key of `PROFILE_ARTIFACTS`; defaults to `MODEL_PROFILE`, which is read
+        from the `MOBILE_PRICE_PROFILE` environment variable.
+        A profile whose artifact is missing or stale falls back to the full model.
+
+    Returns
+    -------
+    ModelBundle
+
+    Raises
+    ------
+    ValueError
+        If the profile is unknown.
+
+    """
+    profile = profile or MODEL_PROFILE
+    if profile not in PROFILE_ARTIFACTS:
+        raise ValueError(f"Unknown model profile: {profile}")
+
+    active = resolve_active_version()
+    name, model_path, scaler_path = active or ("default", MODEL_PATH, SCALER_PATH)
+
+    if profile == "cascade":
+        if artifact_is_current(CASCADE_ARTIFACT_PATH, model_path, scaler_path):
+            return _cascade_bundle(load_artifact_bundle(CASCADE_ARTIFACT_PATH, name=f"{name}:stage1"),
+                                   get_model_bundle("full"))
+        profile = "full"
+
+    for candidate in dict.fromkeys((profile, "full")):
+        artifact = PROFILE_ARTIFACTS[candidate]
+        if artifact_is_current(artifact, model_path, scaler_path):
+            label = name if candidate == "full" else f"{name}:{candidate}"
+            bundle = load_artifact_bundle(artifact, name=label)
+            if candidate == "full":
+                # An exact compilation of the source pickles: large batches go to the native model
+                bundle.engine.attach_native(lambda: (load_trained_model(model_path), load_scaler(scaler_path)),
+                                            source=(model_path, scaler_path))
+            return bundle
+    return load_bundle(model_path, scaler_path, name=name)
+
+_cascade_lock = threading.Lock()
+_cascade_bundles = {}
+
+def _cascade_bundle(stage1, full):
+    """
+    Returns the cached bundle whose engine is a `CascadeModel` of `stage1` in
+    front of `full`; it is rebuilt (and its hit counters reset) only when either
+    stage changes.
+
+    The threshold stored in the artifact is only read when the bundle is
+    built: `stage1.version` is a hash of the artifact, so it already keys it.
+    """
+    key = (stage1.version, full.version, CASCADE_THRESHOLD)
+    with _cascade_lock:
+        if key not in _cascade_bundles:
+            _cascade_bundles.clear()
+            threshold = CASCADE_THRESHOLD or read_artifact_metadata(CASCADE_ARTIFACT_PATH).get("threshold", 0.95)
+            cascade = CascadeModel(stage1.engine, full.engine, threshold=float(threshold))
+            _cascade_bundles[key] = ModelBundle(
+                model=full.model, scaler=full.scaler, engine=cascade,
+                version=hashlib.sha256(f"{stage1.version}{full.version}{threshold}".encode()).hexdigest()[:12],
+                loaded_at=time.time(), name=f"{full.name}:cascade",
+            )
+        return _cascade_bundles[key]
+
+def cascade_hit_rates():
+    """
+    Returns `CascadeModel.hit_rates()` of the served cascade, or None when the
+    "cascade" profile has not been loaded.
+    """
+    with _cascade_lock:
+        bundles = list(_cascade_bundles.values())
+    return bundles[0].engine.hit_rates() if bundles else None
+
+def _register_cascade_metrics(registry):
+    def rows():
+        counts = cascade_hit_rates()
+        return {(stage,): counts[stage] for stage in ("stage1", "stage2")} if counts else {}
+
+    registry.callback("mobile_price_cascade_rows_total", "Rows answered by each cascade stage.",
+                      "counter", rows, labelnames=("stage",))
+    registry.callback("mobile_price_cascade_stage1_ratio", "Share of rows answered by the cascade's stage 1.",
+                      "gauge", lambda: (cascade_hit_rates() or {}).get("stage1_rate"))
+
+_register_cascade_metrics(get_metrics_registry())
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+# MOBILE_PRICE_MEMORY_MONITOR=1 records every rerun; otherwise it is started from the Diagnostics tab
+MEMORY_MONITOR = os.environ.get("MOBILE_PRICE_MEMORY_MONITOR", "0") == "1"
+HISTORY_SIZE = 500
+TOP_N = 15
+
+# A call site is reported as a suspected leak once it has grown on this many
+# checkpoints without shrinking in between, by at least LEAK_MIN_BYTES in total
+LEAK_STREAK = 10
+LEAK_MIN_BYTES = 1024 * 1024
+
+# Allocations of the monitor itself and of the (bounded) profile ring are not app memory
+_IGNORED_FILES = {tracemalloc.__file__, __file__, os.path.join(os.path.dirname(__file__), "rerun_profiler.py")}
+
+def rss_bytes():
+    """
+    Returns the resident set size of this process, or None where it cannot be read.
+
+    Reads `/proc/self/statm` on Linux; elsewhere falls back to the peak RSS
+    reported by `resource` (bytes on macOS, KiB on other Unixes).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def _site_sizes():
+    """
+    Returns `{"file:line": (bytes, blocks)}` for the memory currently traced.
+    """
+    sizes = {}
+    for stat in tracemalloc.take_snapshot().statistics("lineno"):
+        frame = stat.traceback[0]
+        if frame.filename in _IGNORED_FILES or frame.filename.startswith(("<frozen importlib", "<unknown>")):
+            continue
+        sizes[f"{frame.filename}:{frame.lineno}"] = (stat.size, stat.count)
+    return sizes
+
+def _diff(current, previous):
+    """
+    Returns `{site: (bytes diff, blocks diff)}` for every site that changed.
+    """
+    diff = {}
+    for site in current.keys() | previous.keys():
+        size, count = current.get(site, (0, 0))
+        old_size, old_count = previous.get(site, (0, 0))
+        if size != old_size:
+            diff[site] = (size - old_size, count - old_count)
+    return diff
+
+def _top_growth(diff):
+    rows = sorted(((site, d) for site, d in diff.items() if d[0] > 0), key=lambda item: -item[1][0])
+    return [{"site": site, "size_diff_bytes": size, "count_diff": count} for site, (size, count) in rows[:TOP_N]]
+
+class MemoryMonitor:
+    """
+    Tracks memory growth across reruns with `tracemalloc`.
+
+    `record()` groups the traced memory by allocating line at the end of a
+    rerun and compares it with the state when monitoring started (what grew
+    overall) and with the previous checkpoint (what grew during this rerun).
+    Call sites that grow on `LEAK_STREAK` checkpoints without ever shrinking are
+    flagged as suspected leaks and stay in `flagged`; a cache that is still
+    filling up looks the same, so these are hints to look at. Process RSS and
+    traced memory are kept for every checkpoint, so growth over time can be
+    plotted.
+
+    Tracing slows every allocation in the process down, so the monitor is
+    opt-in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline = None
+        self._previous = None
+        self._streaks = {}
+        self._growth = {}
+        self.flagged = {}
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.last = None
+
+    @property
+    def running(self):
+        return tracemalloc.is_tracing() and self._baseline is not None
+
+    def start(self):
+        """
+        Starts tracing allocations (no-op if already running).
+        """
+        with self._lock:
+            if self.running:
+                return
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._baseline = self._previous = _site_sizes()
+
+    def stop(self):
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = self._previous = None
+            self._streaks.clear()
+            self._growth.clear()
+            self.flagged.clear()
+            self.history.clear()
+            self.last = None
+
+    def record(self, label=None):
+        """
+        Takes a checkpoint, starting the monitor first if needed.
+
+        Returns
+        -------
+        dict
+            `rss_bytes`, `traced_bytes`, `peak_bytes`, the top growing call
+            sites since the start (`top_growth`) and since the previous
+            checkpoint (`rerun_growth`), and the current `suspected_leaks`.
+
+        """
+        if not self.running:
+            self.start()
+
+        with self._lock:
+            start = time.perf_counter()
+            sizes = _site_sizes()
+            since_start = _diff(sizes, self._baseline)
+            since_previous = _diff(sizes, self._previous)
+            self._previous = sizes
+
+            for site, (size_diff, _) in since_previous.items():
+                if size_diff > 0:
+                    self._streaks[site] = self._streaks.get(site, 0) + 1
+                    self._growth[site] = self._growth.get(site, 0) + size_diff
+                else:
+                    self._streaks.pop(site, None)
+                    self._growth.pop(site, None)
+
+            suspects = sorted(
+                ({"site": site, "streak": streak, "growth_bytes": self._growth[site]}
+                 for site, streak in self._streaks.items()
+                 if streak >= LEAK_STREAK and self._growth[site] >= LEAK_MIN_BYTES),
+                key=lambda s: -s["growth_bytes"],
+            )
+            for suspect in suspects:
+                if suspect["site"] not in self.flagged:
+                    print(f"⚠️ Possible memory leak: {suspect['site']} grew {suspect['growth_bytes'] / 1024:,.0f} KiB "
+                          f"over {suspect['streak']} reruns")
+                self.flagged[suspect["site"]] = suspect
+
+            traced, peak = tracemalloc.get_traced_memory()
+            checkpoint = {
+                "label": label,
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "rss_bytes": rss_bytes(),
+                "traced_bytes": traced,
+                "peak_bytes": peak,
+                "snapshot_ms": (time.perf_counter() - start) * 1000,
+                "top_growth": _top_growth(since_start),
+                "rerun_growth": _top_growth(since_previous),
+                "suspected_leaks": suspects,
+            }
+            self.history.append({key: checkpoint[key] for key in ("at", "rss_bytes", "traced_bytes")})
+            self.last = checkpoint
+            return checkpoint
+
+_monitor = MemoryMonitor()
+
+def get_memory_monitor():
+    """
+    Returns the process-wide monitor.
+    """
+    return _monitor
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import shutil
+    import sys
+    import tempfile
+    import warnings
+
+    parser = argparse.ArgumentParser(description="Submit predictions through main.py repeatedly and report memory growth.")
+    parser.add_argument("--reruns", type=int, default=30, help="predictions to submit")
+    parser.add_argument("--json", action="store_true", help="print the last checkpoint as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    predictions_dir = tempfile.mkdtemp(prefix="memory_predictions_")
+    os.environ["MOBILE_PRICE_PREDICTIONS_DIR"] = predictions_dir
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        at = AppTest.from_file("main.py", default_timeout=60).run()
+        # One prediction first, so lazy imports do not count as growth
+        next(b for b in at.button if b.label.startswith("🔮")).click().run()
+        monitor = get_memory_monitor()
+        monitor.start()
+        for i in range(args.reruns):
+            next(b for b in at.button if b.label.startswith("🎲")).click().run()
+            next(b for b in at.button if b.label.startswith("🔮")).click().run()
+            checkpoint = monitor.record(f"prediction {i + 1}")
+    finally:
+        shutil.rmtree(predictions_dir, ignore_errors=True)
+
+    first, last = monitor.history[0], monitor.history[-1]
+    if args.json:
+        print(json.dumps(checkpoint, indent=4))
+    else:
+        if first["rss_bytes"] and last["rss_bytes"]:
+            print(f"RSS {first['rss_bytes'] / 2**20:,.1f} -> {last['rss_bytes'] / 2**20:,.1f} MiB over {args.reruns} predictions")
+        print(f"traced {first['traced_bytes'] / 2**20:,.1f} -> {last['traced_bytes'] / 2**20:,.1f} MiB")
+        print("Top growing call sites:")
+        for stat in checkpoint["top_growth"][:10]:
+            print(f"  {stat['size_diff_bytes'] / 1024:10,.1f} KiB  {stat['count_diff']:+7} blocks  {stat['site']}")
+    if monitor.flagged:
+        print(f"❌ {len(monitor.flagged)} suspected leak(s)")
+        sys.exit(1)
+    print("✅ No call site kept growing")
@@ -0,0 +1,181 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.metrics import Histogram, get_metrics_registry
+from core.predictor import FEATURE_ORDER, PRICE_MAP
+
+# Set MOBILE_PRICE_MICRO_BATCH=0 to score every request on its caller's thread
+MICRO_BATCHING = os.environ.get("MOBILE_PRICE_MICRO_BATCH", "1") != "0"
+MAX_BATCH = int(os.environ.get("MOBILE_PRICE_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.environ.get("MOBILE_PRICE_BATCH_WAIT_MS", "2"))
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+class MicroBatcher:
+    """
+    Collects single-row predictions from many threads and scores them together.
+
+    Streamlit runs every browser session on its own thread. Instead of each
+    thread paying the per-call overhead of the model, `submit()` queues the row
+    and returns a `Future`; one dispatcher thread takes the first waiting
+    request, keeps collecting for at most `max_wait_ms` (or until `max_batch`
+    rows), scores each model's rows with one `predict_proba` call and resolves
+    every caller's future with its own `(price_label, probabilities)`.
+
+    Parameters
+    ----------
+    max_batch : int
+    max_wait_ms : float
+        Longest time the first request of a batch waits for company.
+    registry : MetricsRegistry, optional
+        Exports the batch-size and queue-wait histograms; without one they are
+        only reported by `stats()`.
+
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, registry=None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.SimpleQueue()
+        histogram = Histogram if registry is None else registry.histogram
+        self._batch_sizes = histogram("mobile_price_micro_batch_size", "Rows scored per micro-batch.",
+                                      buckets=BATCH_SIZE_BUCKETS)
+        self._queue_waits = histogram("mobile_price_micro_batch_queue_wait_seconds",
+                                      "Seconds a request waited in the micro-batch queue.", buckets=QUEUE_WAIT_BUCKETS)
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, bundle, input_data):
+        """
+        Queues one prediction for `bundle.engine`.
+
+        Raises
+        ------
+        ValueError
+            If any required feature is missing in `input_data`; the returned
+            future fails with RuntimeError if scoring fails.
+
+        """
+        try:
+            row = [float(input_data[feature]) for feature in FEATURE_ORDER]
+        except KeyError as ke:
+            raise ValueError(f"Missing input feature: {ke}")
+        future = Future()
+        self._queue.put((bundle.engine, row, future, time.perf_counter()))
+        return future
+
+    def predict(self, bundle, input_data, timeout=None):
+        """
+        Same contract as `predict_price_range(bundle.engine, None, input_data)`.
+        """
+        return self.submit(bundle, input_data).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = batch[0][3] + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            self._batch_sizes.observe(len(batch))
+            for _, _, _, enqueued in batch:
+                self._queue_waits.observe(started - enqueued)
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[0]), []).append(item)
+            for items in groups.values():
+                self._score(items)
+
+    def _score(self, items):
+        engine = items[0][0]
+        try:
+            probabilities = np.asarray(engine.predict_proba(np.array([row for _, row, _, _ in items])))
+            classes = engine.classes_[probabilities.argmax(axis=1)]
+        except Exception as e:
+            for _, _, future, _ in items:
+                future.set_exception(RuntimeError(f"Prediction failed: {e}"))
+            return
+        for (_, _, future, _), predicted, row_probabilities in zip(items, classes, probabilities):
+            future.set_result((PRICE_MAP.get(predicted, "Unknown"), row_probabilities))
+
+    def stats(self):
+        """
+        Returns the batch-size and queue-wait (seconds) histograms plus the settings.
+        """
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": self._batch_sizes.snapshot(),
+            "queue_wait_seconds": self._queue_waits.snapshot(),
+        }
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_micro_batcher():
+    """
+    Returns the process-wide `MicroBatcher`, starting its thread on first use.
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher(registry=get_metrics_registry())
+        return _batcher
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import warnings
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pandas as pd
+
+    from utils.load_model import get_model_bundle
+    from core.predictor import predict_price_range
+
+    parser = argparse.ArgumentParser(description="Compare per-call and micro-batched scoring under concurrent load.")
+    parser.add_argument("--threads", type=int, default=32, help="concurrent callers, like Streamlit sessions")
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--profile", default=None)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    bundle = get_model_bundle(args.profile)
+    rows = pd.read_csv("Clean_Mobile_Data.csv")[FEATURE_ORDER].to_dict("records")
+    inputs = [rows[i % len(rows)] for i in range(args.requests)]
+    batcher = MicroBatcher(args.max_batch, args.max_wait_ms)
+
+    def timed(score):
+        latencies = []
+        def call(input_data):
+            start = time.perf_counter()
+            score(input_data)
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(call, inputs))
+        elapsed = time.perf_counter() - start
+        return len(inputs) / elapsed, np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000
+
+    direct = timed(lambda input_data: predict_price_range(bundle.engine, None, input_data))
+    batched = timed(lambda input_data: batcher.predict(bundle, input_data))
+    for name, (rate, p50, p99) in (("per call", direct), ("micro-batched", batched)):
+        print(f"{name:14} {rate:8,.0f} req/s  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+    print(json.dumps(batcher.stats(), indent=4))
@@ -0,0 +1,22 @@
+from core.session_store import BATCH_SIZE, PREDICTION_FOLDER, SESSION_DB, SQLiteSessionStore, migrate_folder_sessions
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Copy the Predictions/<timestamp>/ session folders into the SQLite session store.")
+    parser.add_argument("--folder", default=PREDICTION_FOLDER, help="session folders to read")
+    parser.add_argument("--db", default=SESSION_DB, help="SQLite database to write")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="sessions inserted per transaction")
+    parser.add_argument("--remove-folders", action="store_true", help="delete each session folder once migrated")
+    args = parser.parse_args()
+
+    errors = []
+    store = SQLiteSessionStore(args.db)
+    result = migrate_folder_sessions(args.folder, store, args.batch_size, args.remove_folders, errors)
+    print(f"📦 {result['migrated']} of {result['found']} session(s) migrated into {args.db} "
+          f"({store.count()} in the database, {result['skipped']} kept because their id holds another session)")
+    for session_id, e in errors:
+        print(f"❌ {session_id}: {e}")
+    if errors:
+        sys.exit(1)
@@ -0,0 +1,272 @@
+import json
+import os
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+REGISTRY_DIR = "model_registry"
+MANIFEST_FILE = "manifest.json"
+STATS_FILE = "shadow_stats.json"
+
+_manifest_lock = threading.Lock()
+_manifest_cache = {"signature": None, "manifest": None}
+
+def _empty_manifest():
+    return {"active": None, "candidate": None, "versions": {}}
+
+def manifest_path():
+    return os.path.join(REGISTRY_DIR, MANIFEST_FILE)
+
+def stats_path():
+    return os.path.join(REGISTRY_DIR, STATS_FILE)
+
+def write_json_atomic(path, data):
+    """
+    Writes `data` as JSON through a temporary file and `os.replace`, so readers
+    never observe a half-written file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+@contextmanager
+def file_lock(path):
+    """
+    Holds an exclusive lock on `<path>.lock`, shared by every process on the
+    machine, for read-modify-write updates of `path`.
+    """
+    with open(f"{path}.lock", "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            # LK_LOCK retries for about 10 seconds, then raises OSError
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def load_manifest():
+    """
+    Loads the registry manifest, re-reading the file only when it changed.
+
+    Returns
+    -------
+    dict
+        `{"active": str | None, "candidate": str | None, "versions": {name: entry}}`.
+        An empty manifest is returned when the registry does not exist.
+
+    """
+    path = manifest_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return _empty_manifest()
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _manifest_lock:
+        if _manifest_cache["signature"] != signature:
+            with open(path, "r", encoding="utf-8") as f:
+                _manifest_cache["manifest"] = json.load(f)
+            _manifest_cache["signature"] = signature
+        return _manifest_cache["manifest"]
+
+def save_manifest(manifest):
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    write_json_atomic(manifest_path(), manifest)
+
+def _version_entry(manifest, version):
+    try:
+        return manifest["versions"][version]
+    except KeyError:
+        raise ValueError(f"Unknown model version: {version}")
+
+def version_paths(version, manifest=None):
+    """
+    Returns the `(model_path, scaler_path)` of a registered version.
+    """
+    entry = _version_entry(manifest or load_manifest(), version)
+    return (os.path.join(REGISTRY_DIR, entry["model"]),
+            os.path.join(REGISTRY_DIR, entry["scaler"]))
+
+def _resolve(role):
+    manifest = load_manifest()
+    version = manifest.get(role)
+    if not version:
+        return None
+    return (version, *version_paths(version, manifest))
+
+def resolve_active_version():
+    """
+    Returns `(version, model_path, scaler_path)` for the active version, or None
+    when no registry is configured.
+    """
+    return _resolve("active")
+
+def resolve_candidate_version():
+    """
+    Returns `(version, model_path, scaler_path)` for the shadow candidate, or None.
+    """
+    return _resolve("candidate")
+
+def sha256_file(path):
+    """
+    Returns the SHA-256 hex digest of a file, read in 1 MiB chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def register_version(model_path, scaler_path, version=None, notes=""):
+    """
+    Copies a model/scaler pair into the registry as a new immutable version.
+
+    The first registered version becomes the active one.
+
+    Parameters
+    ----------
+    model_path : str
+    scaler_path : str
+    version : str, optional
+        Defaults to `v<N>` with the next free number.
+    notes : str, optional
+
+    Returns
+    -------
+    str
+        The name of the registered version.
+
+    Raises
+    ------
+    FileNotFoundError
+        If either file does not exist.
+    ValueError
+        If the version name is already taken.
+
+    """
+    for path in (model_path, scaler_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+    manifest = json.loads(json.dumps(load_manifest()))
+    if version is None:
+        number = len(manifest["versions"]) + 1
+        while f"v{number}" in manifest["versions"]:
+            number += 1
+        version = f"v{number}"
+    if version in manifest["versions"]:
+        raise ValueError(f"Model version already registered: {version}")
+
+    version_dir = os.path.join(REGISTRY_DIR, version)
+    os.makedirs(version_dir, exist_ok=False)
+    shutil.copy2(model_path, os.path.join(version_dir, "model.pkl"))
+    shutil.copy2(scaler_path, os.path.join(version_dir, "scaler.pkl"))
+
+    manifest["versions"][version] = {
+        "model": f"{version}/model.pkl",
+        "scaler": f"{version}/scaler.pkl",
+        "model_sha256": sha256_file(model_path),
+        "scaler_sha256": sha256_file(scaler_path),
+        "source": os.path.abspath(model_path),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "notes": notes,
+    }
+    if manifest["active"] is None:
+        manifest["active"] = version
+    save_manifest(manifest)
+    return version
+
+def set_active_version(version):
+    manifest = json.loads(json.dumps(load_manifest()))
+    _version_entry(manifest, version)
+    manifest["active"] = version
+    if manifest.get("candidate") == version:
+        manifest["candidate"] = None
+    save_manifest(manifest)
+
+def set_candidate_version(version):
+    """
+    Selects the version that shadow-scores live traffic; pass None to stop shadowing.
+    """
+    manifest = json.loads(json.dumps(load_manifest()))
+    if version is not None:
+        _version_entry(manifest, version)
+        if version == manifest.get("active"):
+            raise ValueError(f"{version} is already the active version")
+    manifest["candidate"] = version
+    save_manifest(manifest)
+
+def promote_candidate():
+    """
+    Makes the current candidate the active version and returns its name.
+    """
+    candidate = load_manifest().get("candidate")
+    if not candidate:
+        raise ValueError("No candidate version to promote")
+    set_active_version(candidate)
+    return candidate
+
+def load_shadow_stats():
+    try:
+        with open(stats_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    register = commands.add_parser("register", help="Add a model/scaler pair as a new version")
+    register.add_argument("--model", default="final_mobile_price_model.pkl")
+    register.add_argument("--scaler", default="scaler.pkl")
+    register.add_argument("--version")
+    register.add_argument("--notes", default="")
+    register.add_argument("--candidate", action="store_true", help="Also start shadow-scoring it")
+
+    commands.add_parser("list", help="Show registered versions")
+    activate = commands.add_parser("activate", help="Serve a version for live predictions")
+    activate.add_argument("version")
+    candidate = commands.add_parser("candidate", help="Shadow-score a version ('none' to stop)")
+    candidate.add_argument("version")
+    commands.add_parser("promote", help="Activate the current candidate")
+    commands.add_parser("stats", help="Show shadow agreement and latency per version")
+
+    args = parser.parse_args()
+
+    if args.command == "register":
+        name = register_version(args.model, args.scaler, args.version, args.notes)
+        if args.candidate and load_manifest()["active"] != name:
+            set_candidate_version(name)
+        print(f"✅ Registered {name}")
+    elif args.command == "list":
+        manifest = load_manifest()
+        for name, entry in manifest["versions"].items():
+            role = "active" if name == manifest["active"] else "candidate" if name == manifest["candidate"] else ""
+            print(f"{name:10} {role:10} {entry['created_at']}  {entry['model_sha256'][:12]}  {entry['notes']}")
+    elif args.command == "activate":
+        set_active_version(args.version)
+        print(f"✅ {args.version} is now active")
+    elif args.command == "candidate":
+        set_candidate_version(None if args.version.lower() == "none" else args.version)
+        print(f"✅ Candidate set to {args.version}")
+    elif args.command == "promote":
+        print(f"✅ Promoted {promote_candidate()}")
+    elif args.command == "stats":
+        print(json.dumps(load_shadow_stats(), indent=4))
@@ -70,7 +70,7 @@ def get_parody_phones():
         },
         {
             "name": "OneMinus 1",
-            "image": "assets/Oneminus.jpg",
+            "image": "assets/Oneminus.JPG",
             "price": "Rs. 89000",
             "features": [
                 "Flagship",
@@ -104,7 +104,7 @@ def get_parody_phones():
         },
         {
             "name": "WeQ 1 5G",
-            "image": "assets/WeQ.jpg",
+            "image": "assets/WeQ.JPG",
             "price": "Rs. 60000",
             "features": [
                 "Octa Core Processor",
@@ -138,7 +138,7 @@ def get_parody_phones():
         },
         {
             "name": "Everything Mobile 1",
-            "image": "assets/Every.jpg",
+            "image": "assets/Every.JPG",
             "price": "Rs. 35000",
             "features": [
                 "Transparent Body",
@@ -172,7 +172,7 @@ def get_parody_phones():
         },
         {
             "name": "Samhung GigaStar A1",
-            "image": "assets/SamA1.jpg",
+            "image": "assets/SamA1.JPG",
             "price": "Rs. 18999",
             "features": [
                 "Budget AMOLED",
@@ -206,7 +206,7 @@ def get_parody_phones():
         },
         {
             "name": "RealMeh GT Slow",
-            "image": "assets/Realmeh.jpg",
+            "image": "assets/Realmeh.JPG",
             "price": "Rs. 21999",
             "features": [
                 "Faux Leather Back",
@@ -240,7 +240,7 @@ def get_parody_phones():
         },
         {
             "name": "Oppai Renoir 7i Lite",
-            "image": "assets/Oppai7i.jpg",
+            "image": "assets/Oppai7i.JPG",
             "price": "Rs. 24999",
             "features": [
                 "Glow-in-the-Dark Finish",
@@ -274,7 +274,7 @@ def get_parody_phones():
         },
         {
             "name": "LavaBlaze Turbo Max 3G",
-            "image": "assets/LavaBlaze.jpg",
+            "image": "assets/LavaBlaze.JPG",
             "price": "Rs. 6999",
             "features": [
                 "Budget-Friendly",
@@ -308,7 +308,7 @@ def get_parody_phones():
         },
         {
             "name": "Xomi NotNote 11E Pro Max+",
-            "image": "assets/XomiNotNote.jpg",
+            "image": "assets/XomiNotNote.JPG",
             "price": "Rs. 17999",
             "features": [
                 "Too Many Names",
@@ -342,7 +342,7 @@ def get_parody_phones():
         },
         {
             "name": "Infinix HotHell 12S",
-            "image": "assets/InfinixHotHell.jpg",
+            "image": "assets/InfinixHotHell.JPG",
             "price": "Rs. 10499",
             "features": [
                 "Gaming Ads Pre-installed",
@@ -376,7 +376,7 @@ def get_parody_phones():
         },
         {
             "name": "VioVo V95e Lite Neo",
-            "image": "assets/VioVo.jpg",
+            "image": "assets/VioVo.JPG",
             "price": "Rs. 26999",
             "features": [
                 "Selfie-Centric Design",
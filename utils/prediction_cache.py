@@ -0,0 +1,164 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.micro_batch import MICRO_BATCHING, get_micro_batcher
+from core.predictor import predict_price_range, FEATURE_ORDER
+from core.metrics import PREDICTIONS, get_metrics_registry
+from core.tracing import span, tracing_active
+
+# Entries kept by the process-wide cache; 0 disables caching
+CACHE_SIZE = int(os.environ.get("MOBILE_PRICE_CACHE_SIZE", "4096"))
+
+def canonical_key(input_data):
+    """
+    Returns the 20 features of `input_data` as a hashable tuple in `FEATURE_ORDER`.
+
+    Values are rounded to 6 decimals so that the same slider position always
+    maps to the same key, whether it arrives as an int, a float or a float
+    carrying step accumulation error (e.g. `0.1 * 3`).
+
+    Raises
+    ------
+    ValueError
+        If any required feature is missing in `input_data` or is not a number.
+
+    """
+    try:
+        return tuple(round(float(input_data[feature]), 6) for feature in FEATURE_ORDER)
+    except KeyError as e:
+        raise ValueError(f"Missing input feature: {e}")
+    except (TypeError, ValueError) as e:
+        # JSON null, lists and objects raise TypeError; non-numeric strings ValueError
+        raise ValueError(f"Input features must be numbers: {e}")
+
+class PredictionCache:
+    """
+    A bounded, thread-safe LRU cache of `predict_price_range` results.
+
+    Entries are keyed on the model version and the canonical feature tuple, so
+    a hit skips scaling and tree traversal entirely. The first lookup with a new
+    model version drops every entry of the previous one.
+
+    Parameters
+    ----------
+    maxsize : int
+        Entries kept before the least recently used one is evicted; 0 disables
+        caching.
+
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = int(maxsize)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._counts["invalidations"] += 1
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+            return entry
+
+    def put(self, version, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the hit/miss/eviction/invalidation counters, the hit rate and the current size.
+        """
+        with self._lock:
+            stats = dict(self._counts, size=len(self._entries), maxsize=self.maxsize, version=self._version)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+        return stats
+
+_cache = PredictionCache()
+
+def get_prediction_cache():
+    """
+    Returns the process-wide cache shared by every session.
+    """
+    return _cache
+
+def _register_cache_metrics(registry):
+    def counts(name):
+        return lambda: _cache.stats()[name]
+
+    for name in ("hits", "misses", "evictions", "invalidations"):
+        registry.callback(f"mobile_price_cache_{name}_total", f"Prediction cache {name}.", "counter", counts(name))
+    registry.callback("mobile_price_cache_entries", "Entries held by the prediction cache.", "gauge", counts("size"))
+    registry.callback("mobile_price_cache_hit_ratio", "Prediction cache hits per lookup since the process started.",
+                      "gauge", counts("hit_rate"))
+
+_register_cache_metrics(get_metrics_registry())
+
+def predict_price_range_cached(bundle, input_data, cache=None):
+    """
+    `predict_price_range` with the bundle's engine, memoized per model version.
+
+    Cache misses go through the shared `MicroBatcher`, so concurrent sessions
+    are scored together, unless `MOBILE_PRICE_MICRO_BATCH=0`. Inside a trace
+    they are scored on the calling thread, so the trace shows the model stages.
+
+    Parameters
+    ----------
+    bundle : ModelBundle
+        Its `engine` scores the input and its `version` scopes the cache.
+    input_data : dict
+    cache : PredictionCache, optional
+        Defaults to the process-wide cache.
+
+    Returns
+    -------
+    price_label : str
+    probabilities : numpy.ndarray
+        A fresh copy, so callers may modify it.
+
+    Raises
+    ------
+    ValueError
+        If any required feature is missing in `input_data`.
+    RuntimeError
+        If prediction fails for other reasons.
+
+    """
+    cache = cache or _cache
+    with span("cache.lookup") as lookup:
+        key = canonical_key(input_data)
+        entry = cache.get(bundle.version, key)
+        lookup.set(hit=entry is not None)
+    if entry is None:
+        if MICRO_BATCHING and not tracing_active():
+            price_label, probabilities = get_micro_batcher().predict(bundle, input_data)
+        else:
+            price_label, probabilities = predict_price_range(bundle.engine, None, input_data)
+        entry = (price_label, np.asarray(probabilities, dtype=float))
+        cache.put(bundle.version, key, entry)
+    PREDICTIONS.inc(price_range=entry[0])
+    return entry[0], entry[1].copy()
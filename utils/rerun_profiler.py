@@ -0,0 +1,127 @@
+import cProfile
+import itertools
+import marshal
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# MOBILE_PRICE_DIAGNOSTICS=1 profiles every rerun; `?diagnostics=1` does it for one session
+DIAGNOSTICS = os.environ.get("MOBILE_PRICE_DIAGNOSTICS", "0") == "1"
+RING_SIZE = int(os.environ.get("MOBILE_PRICE_PROFILE_RING", "20"))
+TOP_N = 25
+
+# Work done on every rerun that we want to keep an eye on: label -> (file, function) pairs
+SUSPECTS = {
+    "Theme CSS": [("utils/theme.py", "apply_theme"), ("utils/theme.py", "theme_toggle_button")],
+    "Intro audio": [("utils/intro.py", "add_intro_voice")],
+    "Session scan": [("core/sessions.py", "load_session_index")],
+    "Charts": [("components/vis.py", "plot_prediction_probabilities"),
+               ("components/vis.py", "chart_prediction_probabilities"),
+               ("components/comparison.py", "plot_probability_bar")],
+}
+
+def _short_path(filename):
+    path = filename.replace("\\", "/")
+    for marker in ("/site-packages/", "/lib/python"):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    root = os.getcwd().replace("\\", "/") + "/"
+    return path[len(root):] if path.startswith(root) else path
+
+def _suspect_seconds(stats):
+    totals = dict.fromkeys(SUSPECTS, 0.0)
+    for (filename, _, function), (_, _, _, cumtime, _) in stats.items():
+        path = filename.replace("\\", "/")
+        for label, targets in SUSPECTS.items():
+            if any(path.endswith(target_file) and function == target for target_file, target in targets):
+                totals[label] += cumtime
+    return totals
+
+class ProfileRing:
+    """
+    The profiles of the last `maxsize` reruns, shared by every session of the process.
+
+    Each entry is a dict with `id`, `session`, `label`, `started_at`,
+    `seconds`, the `TOP_N` cumulative `hotspots`, the seconds spent in each
+    of the `SUSPECTS` and the raw `pstats` dump (marshal format, loadable with
+    `pstats.Stats(path)` or tools such as snakeviz).
+    """
+
+    def __init__(self, maxsize=RING_SIZE):
+        self._entries = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def add(self, entry):
+        with self._lock:
+            entry["id"] = next(self._ids)
+            self._entries.append(entry)
+        return entry
+
+    def entries(self):
+        """
+        Returns the buffered entries, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_ring = ProfileRing()
+
+def get_profile_ring():
+    return _ring
+
+class RerunProfiler:
+    """
+    Profiles one script run with `cProfile`; only the calling thread is
+    profiled, which for Streamlit is exactly the session's rerun.
+    """
+
+    def __init__(self, label, session=None):
+        self.label = label
+        self.session = session
+        self.profiler = cProfile.Profile()
+        self.entry = None
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.profiler.enable()
+
+    def finish(self, ring=None):
+        """
+        Stops profiling and stores the summary in `ring` (default: the
+        process-wide one); returns the entry. Later calls return the same
+        entry without storing it again.
+        """
+        if self.entry is not None:
+            return self.entry
+        self.profiler.disable()
+        seconds = time.perf_counter() - self.start
+        stats = pstats.Stats(self.profiler)
+
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_N]
+        hotspots = [
+            {
+                "function": f"{_short_path(filename)}:{line}({function})",
+                "calls": calls,
+                "tottime_ms": tottime * 1000,
+                "cumtime_ms": cumtime * 1000,
+            }
+            for (filename, line, function), (_, calls, tottime, cumtime, _) in rows
+        ]
+        entry = {
+            "session": self.session,
+            "label": self.label,
+            "started_at": self.started_at,
+            "seconds": seconds,
+            "hotspots": hotspots,
+            "suspects_ms": {label: s * 1000 for label, s in _suspect_seconds(stats.stats).items()},
+            "pstats": marshal.dumps(stats.stats),
+        }
+        self.entry = (ring or _ring).add(entry)
+        return self.entry
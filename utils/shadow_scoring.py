@@ -0,0 +1,213 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.load_model import load_bundle
+from utils.model_registry import (
+    file_lock, manifest_path, resolve_candidate_version, load_shadow_stats, stats_path, write_json_atomic
+)
+from core.predictor import predict_price_range
+
+COUNTERS = (
+    "primary_requests", "primary_latency_ms_total",
+    "shadow_requests", "shadow_agreements", "shadow_latency_ms_total",
+    "shadow_errors", "dropped",
+)
+
+class ShadowScorer:
+    """
+    Scores live requests with the registry's candidate version on a background thread.
+
+    `submit()` only records the primary latency and enqueues the request, so the
+    primary prediction never waits for the candidate. The worker thread loads the
+    candidate bundle (cached like the primary one), scores the same input and
+    records whether it agrees with the primary label.
+
+    Per-version counters accumulate across restarts and across processes (the
+    app, `utils.http_server`, ...): each flush adds only the counts recorded
+    since the previous one to `model_registry/shadow_stats.json`, under a file
+    lock. Nothing is written without a registry or without new counts.
+
+    Parameters
+    ----------
+    max_queue : int
+        Requests waiting for shadow scoring; when full new requests are dropped
+        (and counted) rather than blocking the caller.
+    flush_interval : float
+        Seconds between writes of the stats file.
+    latency_window : int
+        Recent latencies kept per version for the percentiles.
+
+    """
+
+    def __init__(self, max_queue=1000, flush_interval=30.0, latency_window=1000):
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._flush_interval = flush_interval
+        self._latency_window = latency_window
+        self._latencies = {}
+        # Counts of every process as of the last flush, plus this process's counts since then
+        self._totals = _counters(load_shadow_stats())
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _version_stats(self, version):
+        return self._pending.setdefault(version, dict.fromkeys(COUNTERS, 0))
+
+    def _record_latency(self, version, role, latency_ms):
+        window = self._latencies.setdefault((version, role), deque(maxlen=self._latency_window))
+        window.append(latency_ms)
+
+    def submit(self, bundle, input_data, primary_label, primary_latency_ms):
+        """
+        Records the primary prediction and queues it for shadow scoring.
+
+        Parameters
+        ----------
+        bundle : ModelBundle
+            The bundle that produced the primary prediction.
+        input_data : dict
+        primary_label : str
+        primary_latency_ms : float
+
+        Returns
+        -------
+        bool
+            True if the request was queued for a candidate.
+
+        """
+        with self._lock:
+            stats = self._version_stats(bundle.name)
+            stats["primary_requests"] += 1
+            stats["primary_latency_ms_total"] += primary_latency_ms
+            self._record_latency(bundle.name, "primary", primary_latency_ms)
+
+        candidate = resolve_candidate_version()
+        if candidate is None or candidate[0] == bundle.name:
+            return False
+        try:
+            self._queue.put_nowait((dict(input_data), primary_label))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._version_stats(candidate[0])["dropped"] += 1
+            return False
+
+    def _run(self):
+        while True:
+            try:
+                input_data, primary_label = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                self._maybe_flush()
+                continue
+
+            candidate = resolve_candidate_version()
+            if candidate is not None:
+                self._score(candidate, input_data, primary_label)
+            self._queue.task_done()
+            self._maybe_flush()
+
+    def _score(self, candidate, input_data, primary_label):
+        version, model_path, scaler_path = candidate
+        try:
+            bundle = load_bundle(model_path, scaler_path, name=version)
+            start = time.perf_counter()
+            label, _ = predict_price_range(bundle.engine, None, input_data)
+            latency_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            print(f"❌ Shadow scoring with {version} failed: {e}")
+            with self._lock:
+                self._version_stats(version)["shadow_errors"] += 1
+            return
+
+        with self._lock:
+            stats = self._version_stats(version)
+            stats["shadow_requests"] += 1
+            stats["shadow_agreements"] += int(label == primary_label)
+            stats["shadow_latency_ms_total"] += latency_ms
+            self._record_latency(version, "shadow", latency_ms)
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def snapshot(self):
+        """
+        Returns the per-version counters plus agreement rate, mean and p50/p95 latency.
+        """
+        with self._lock:
+            report = _add_counters(_counters(self._totals), self._pending)
+            windows = {key: list(values) for key, values in self._latencies.items()}
+        return _report(report, windows)
+
+    def flush(self):
+        """
+        Adds the counts recorded since the last flush to the registry's stats
+        file and rewrites its rates and latencies.
+        """
+        self._last_flush = time.monotonic()
+        if not self._pending or not os.path.exists(manifest_path()):
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            windows = {key: list(values) for key, values in self._latencies.items()}
+        try:
+            with file_lock(stats_path()):
+                totals = _add_counters(_counters(load_shadow_stats()), pending)
+                write_json_atomic(stats_path(), _report(totals, windows))
+        except Exception as e:
+            print(f"❌ Failed to write shadow stats: {e}")
+            with self._lock:
+                # Keep the counts for the next flush
+                self._pending = _add_counters(pending, self._pending)
+            return
+        with self._lock:
+            self._totals = totals
+
+def _counters(stats):
+    return {version: {key: values.get(key, 0) for key in COUNTERS} for version, values in stats.items()}
+
+def _add_counters(totals, deltas):
+    for version, counts in deltas.items():
+        stats = totals.setdefault(version, dict.fromkeys(COUNTERS, 0))
+        for key, value in counts.items():
+            stats[key] += value
+    return totals
+
+def _report(report, windows):
+    """
+    Adds the agreement rate and the mean and p50/p95 latencies to per-version
+    counters; the percentiles only cover this process's recent requests.
+    """
+    for version, stats in report.items():
+        for role in ("primary", "shadow"):
+            count = stats[f"{role}_requests"]
+            stats[f"{role}_latency_ms_mean"] = stats[f"{role}_latency_ms_total"] / count if count else None
+            recent = windows.get((version, role))
+            if recent:
+                stats[f"{role}_latency_ms_p50"] = float(np.percentile(recent, 50))
+                stats[f"{role}_latency_ms_p95"] = float(np.percentile(recent, 95))
+        shadow = stats["shadow_requests"]
+        stats["agreement_rate"] = stats["shadow_agreements"] / shadow if shadow else None
+    return report
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+def get_shadow_scorer():
+    """
+    Returns the process-wide `ShadowScorer`, starting its thread on first use.
+    """
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = ShadowScorer()
+        return _scorer
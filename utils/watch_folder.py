@@ -0,0 +1,289 @@
+import os
+import signal
+import time
+import traceback
+from datetime import datetime
+
+from utils.batch_score import score_csv
+from utils.model_registry import write_json_atomic
+from core.predictor import FEATURE_ORDER
+
+FOLDERS = ("inbox", "processing", "outbox", "processed", "failed")
+
+class WatchFolderDaemon:
+    """
+    Scores specification CSVs dropped into `<root>/inbox`.
+
+    A file is claimed by renaming it into `processing/`; the rename is atomic,
+    so several daemons can watch the same inbox without scoring a file twice.
+    Each claimed file is streamed through the process-wide cached model bundle
+    (reloaded when the model changes) and produces `outbox/<name>_scored.csv`
+    and `outbox/<name>_summary.json`; the input then moves to `processed/`.
+    Names already taken in `processing/`, `outbox/`, `processed/` or
+    `failed/` get a timestamp prefix, so a file sent twice keeps both results.
+    A file that cannot be scored (unreadable, missing columns...) moves to
+    `failed/` next to a `<name>.error.txt`, and the daemon carries on.
+    Nothing is claimed while the model cannot be loaded, and a claimed file
+    that cannot be filed (full disk, permissions...) stays in `processing/`
+    and is scored again on the next poll.
+
+    Upstream systems should write files under another name (e.g. `.part`) and
+    rename them to `.csv` when complete; files modified within the last
+    `settle_seconds` are left for the next poll as an extra guard.
+
+    Parameters
+    ----------
+    root : str
+    poll_interval : float
+        Seconds between inbox scans when it is empty.
+    settle_seconds : float
+    profile : str, optional
+        Model profile, see `utils.load_model.get_model_bundle`.
+    chunk_size : int
+
+    """
+
+    def __init__(self, root, poll_interval=2.0, settle_seconds=1.0, profile=None, chunk_size=50000):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.profile = profile
+        self.chunk_size = chunk_size
+        self.stopping = False
+        # Claimed files left in processing/ because they could not be filed; retried next poll
+        self.retry = []
+        self.stats = {"files_scored": 0, "files_failed": 0, "rows_scored": 0, "scoring_seconds": 0.0,
+                      "last_file": None, "last_rows_per_sec": None, "started_at": datetime.now().isoformat(timespec="seconds")}
+        for folder in FOLDERS:
+            os.makedirs(self.path(folder), exist_ok=True)
+
+    def path(self, folder, name=None):
+        folder = os.path.join(self.root, folder)
+        return folder if name is None else os.path.join(folder, name)
+
+    def pending(self):
+        """
+        Returns the inbox CSVs ready to be claimed, oldest first.
+        """
+        now = time.time()
+        ready = []
+        for entry in os.scandir(self.path("inbox")):
+            if not entry.is_file() or not entry.name.lower().endswith(".csv"):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime >= self.settle_seconds:
+                ready.append((mtime, entry.name))
+        return [name for _, name in sorted(ready)]
+
+    def _unique_name(self, folder, name, patterns=("{}",)):
+        """
+        Returns `name`, or `name` prefixed with a timestamp (and a counter
+        within the same second) when any of `patterns` formatted with it
+        already exists in `folder`, so an earlier file is never overwritten.
+        """
+        candidate, counter = name, 1
+        while any(os.path.exists(self.path(folder, pattern.format(candidate))) for pattern in patterns):
+            prefix = f"{datetime.now():%Y%m%d_%H%M%S}" + (f"_{counter}" if counter > 1 else "")
+            candidate = f"{prefix}_{name}"
+            counter += 1
+        return candidate
+
+    def claim(self, name):
+        """
+        Moves `name` from the inbox to `processing/`, under a new name if an
+        earlier copy is still there; returns the new path, or None when another
+        daemon claimed it first.
+        """
+        target = self.path("processing", self._unique_name("processing", name))
+        try:
+            os.rename(self.path("inbox", name), target)
+        except (FileNotFoundError, FileExistsError):
+            # FileExistsError: Windows refuses to overwrite a copy claimed in the meantime; retried next poll
+            return None
+        return target
+
+    def _archive(self, path, folder):
+        name = self._unique_name(folder, os.path.basename(path), ("{}", "{}.error.txt"))
+        target = self.path(folder, name)
+        os.replace(path, target)
+        return target
+
+    def _keep_for_retry(self, path, message):
+        print(f"⚠️ {message}; {os.path.basename(path)} stays in {self.path('processing')} for the next poll")
+        self.retry.append(path)
+
+    def process(self, path, bundle=None):
+        """
+        Scores one claimed file and files it under `processed/` or `failed/`.
+
+        Parameters
+        ----------
+        path : str
+            The claimed file in `processing/`.
+        bundle : ModelBundle, optional
+            Loaded with the daemon's profile when omitted.
+
+        Returns
+        -------
+        bool or None
+            True if the file was scored, False if it moved to `failed/`, None
+            if it was left in `processing/` to be retried.
+
+        """
+        from utils.load_model import get_model_bundle
+
+        name = os.path.basename(path)
+        if bundle is None:
+            try:
+                bundle = get_model_bundle(self.profile)
+            except Exception as e:
+                self._keep_for_retry(path, f"Model unavailable: {e}")
+                return None
+
+        stem = self._unique_name("outbox", os.path.splitext(name)[0], ("{}_scored.csv", "{}_summary.json"))
+        scored_path = self.path("outbox", f"{stem}_scored.csv")
+        summary_path = self.path("outbox", f"{stem}_summary.json")
+        try:
+            summary = score_csv(path, scored_path, chunk_size=self.chunk_size, workers=0, profile=self.profile)
+            if summary["rows"] == 0:
+                raise ValueError("the file has no rows")
+        except OSError as e:
+            # Disk or permission trouble is not the file's fault
+            self._keep_for_retry(path, f"Could not score {name}: {e}")
+            return None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}\n\nExpected columns: {', '.join(FEATURE_ORDER)}\n\n{traceback.format_exc()}"
+            try:
+                archived = self._archive(path, "failed")
+            except OSError as archive_error:
+                self._keep_for_retry(path, f"Could not move {name} to failed/ ({archive_error}) after: {e}")
+                return None
+            try:
+                with open(f"{archived}.error.txt", "w", encoding="utf-8") as f:
+                    f.write(error)
+            except OSError as write_error:
+                print(f"⚠️ Could not write {archived}.error.txt: {write_error}")
+            self.stats["files_failed"] += 1
+            print(f"❌ {name} failed: {e}")
+            return False
+
+        summary.update({
+            "input": name,
+            "model_version": bundle.version,
+            "model_name": bundle.name,
+            "scored_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        try:
+            write_json_atomic(summary_path, summary)
+            self._archive(path, "processed")
+        except OSError as e:
+            # The retry scores the file again, so drop this attempt's outputs
+            for output in (scored_path, summary_path):
+                try:
+                    os.remove(output)
+                except OSError:
+                    pass
+            self._keep_for_retry(path, f"Could not file the results of {name}: {e}")
+            return None
+
+        self.stats["files_scored"] += 1
+        self.stats["rows_scored"] += summary["rows"]
+        self.stats["scoring_seconds"] += summary["seconds"]
+        self.stats["last_file"] = name
+        self.stats["last_rows_per_sec"] = summary["rows_per_sec"]
+        print(f"✅ {name}: {summary['rows']:,} rows in {summary['seconds']:.2f} s "
+              f"({summary['rows_per_sec']:,.0f} rows/s)")
+        return True
+
+    def status(self):
+        """
+        Returns the cumulative counters, overall throughput and current queue depth.
+        """
+        status = dict(self.stats)
+        status["queue_depth"] = len(self.pending())
+        status["in_progress"] = len(os.listdir(self.path("processing")))
+        seconds = status["scoring_seconds"]
+        status["rows_per_sec"] = status["rows_scored"] / seconds if seconds else None
+        status["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        return status
+
+    def write_status(self):
+        write_json_atomic(os.path.join(self.root, "status.json"), self.status())
+
+    def run_once(self):
+        """
+        Retries the claimed files that could not be filed earlier, then claims
+        and scores every file currently waiting; returns how many were filed.
+        Nothing is claimed while the model cannot be loaded.
+        """
+        from utils.load_model import get_model_bundle
+
+        try:
+            bundle = get_model_bundle(self.profile)
+        except Exception as e:
+            print(f"⚠️ Model unavailable, files wait in {self.path('inbox')}: {e}")
+            return 0
+
+        handled = 0
+        retry, self.retry = self.retry, []
+        for path in retry:
+            if self.stopping:
+                self.retry.append(path)
+                continue
+            if self.process(path, bundle) is not None:
+                handled += 1
+                self.write_status()
+        for name in self.pending():
+            if self.stopping:
+                break
+            claimed = self.claim(name)
+            if claimed is None:
+                continue
+            if self.process(claimed, bundle) is not None:
+                handled += 1
+                self.write_status()
+        return handled
+
+    def run_forever(self):
+        """
+        Polls the inbox until SIGINT/SIGTERM; the file being scored is finished first.
+        """
+        def stop(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        stuck = os.listdir(self.path("processing"))
+        if stuck:
+            print(f"⚠️ {len(stuck)} file(s) left in {self.path('processing')} by an earlier run; "
+                  f"move them back to the inbox to retry.")
+        print(f"👀 Watching {self.path('inbox')}")
+        self.write_status()
+        while not self.stopping:
+            if self.run_once() == 0:
+                self.write_status()
+                time.sleep(self.poll_interval)
+        self.write_status()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score CSVs dropped into a watched inbox folder.")
+    parser.add_argument("root", help="folder holding inbox/, processing/, outbox/, processed/ and failed/")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--settle-seconds", type=float, default=1.0)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--profile", default=None, help="model profile, e.g. full / fast / student")
+    parser.add_argument("--once", action="store_true", help="score what is in the inbox and exit")
+    args = parser.parse_args()
+
+    daemon = WatchFolderDaemon(args.root, args.poll_interval, args.settle_seconds, args.profile, args.chunk_size)
+    if args.once:
+        daemon.run_once()
+        daemon.write_status()
+    else:
+        daemon.run_forever()